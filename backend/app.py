@@ -1,21 +1,35 @@
-from flask import Flask, jsonify
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
-from scheduler import Scheduler
+from asignadores import MOTORES
+from cola_espera import POLITICAS as POLITICAS_ESPERA
+from compactacion import POLITICAS as POLITICAS_COMPACTACION
+from mapa_memoria import IndiceBloques
+from metricas import exportar_prometheus
+from zswap import POLITICAS as POLITICAS_ZSWAP
+from sesiones import RegistroSesiones, SESION_POR_DEFECTO
+import copy
 import logging
 import json
 import os
+import time
 
 app = Flask(__name__)
 CORS(app)
 
 logging.basicConfig(level=logging.INFO)
-scheduler = Scheduler()
+# SIMULADOR_METRICAS=1 instrumenta las simulaciones y llena /metrics
+INSTRUMENTAR = os.environ.get("SIMULADOR_METRICAS") == "1"
+registro = RegistroSesiones()
+registro.crear(SESION_POR_DEFECTO, instrumentar=INSTRUMENTAR)
 
 REQUIRED_FIELDS = {"pid": str, "size": int, "priority": int, "mode": str}
 
-VALID_MODES = {"contigua", "segmentacion", "paginacion"}
+VALID_MODES = {"contigua", "segmentacion", "paginacion", "buddy", "slab"}
 VALID_ASIGNACIONES = {"fija", "variable"}
 VALID_ESTRATEGIAS = {"first_fit", "best_fit", "next_fit", "worst_fit"}
+MAX_TICKS_POR_LOTE = 1000
+PRESUPUESTO_LOTE_S = 0.05  # a máxima velocidad, tiempo de simulación entre mensajes
+MAX_ANCHO_MAPA = 4096      # cubetas por pedido de /memory-map
 
 def validar_procesos_json():
     try:
@@ -40,6 +54,11 @@ def validar_procesos_json():
                 if estrategia not in VALID_ESTRATEGIAS:
                     raise ValueError(f"Estrategia inválida en el proceso #{i+1}: {estrategia}")
 
+            if "ratio_compresion" in proceso:
+                ratio = proceso["ratio_compresion"]
+                if isinstance(ratio, bool) or not isinstance(ratio, (int, float)) or ratio < 1:
+                    raise ValueError(f"ratio_compresion inválido en el proceso #{i+1}")
+
             if proceso["mode"] == "segmentacion":
                 if "segmentos" in proceso:
                     if not isinstance(proceso["segmentos"], list) or not all(isinstance(s, int) for s in proceso["segmentos"]):
@@ -54,57 +73,352 @@ def validar_datos():
     validar_procesos_json()
 
 
+def obtener_sesion():
+    """Sesión indicada con ?sesion=<id>; sin parámetro, la sesión por defecto"""
+    return registro.obtener(request.args.get("sesion", SESION_POR_DEFECTO))
+
+
+def sesion_no_encontrada():
+    return jsonify({"success": False, "error": "sesion_no_encontrada"}), 404
+
+
+def validar_config_sesion(config):
+    """Configuración aceptada al crear una sesión (las trazas solo pueden venir de data/)"""
+    permitidos = {"traza", "motor", "ram_size", "swap_size", "estrategia", "ancho_banda_swap", "latencia_swap",
+                  "compactacion", "particiones", "politica_espera", "envejecimiento",
+                  "zswap", "ratio_zswap", "politica_zswap"}
+    desconocidos = set(config) - permitidos
+    if desconocidos:
+        raise ValueError(f"Campos desconocidos: {sorted(desconocidos)}")
+
+    resultado = {}
+    if "traza" in config:
+        traza = config["traza"]
+        if not isinstance(traza, str) or os.path.basename(traza) != traza or not os.path.isfile(os.path.join("data", traza)):
+            raise ValueError(f"Traza inválida: {traza}")
+        resultado["ruta_procesos"] = os.path.join("data", traza)
+    if "motor" in config:
+        if config["motor"] not in MOTORES:
+            raise ValueError(f"Motor inválido: {config['motor']}")
+        resultado["motor"] = config["motor"]
+    for campo in ("ram_size", "swap_size", "ancho_banda_swap", "envejecimiento", "zswap"):
+        if campo in config:
+            if not isinstance(config[campo], int) or config[campo] <= 0:
+                raise ValueError(f"El campo '{campo}' debe ser un entero positivo")
+            resultado[campo] = config[campo]
+    if "latencia_swap" in config:
+        if not isinstance(config["latencia_swap"], int) or config["latencia_swap"] < 0:
+            raise ValueError("El campo 'latencia_swap' debe ser un entero no negativo")
+        resultado["latencia_swap"] = config["latencia_swap"]
+    if "compactacion" in config:
+        if config["compactacion"] not in POLITICAS_COMPACTACION:
+            raise ValueError(f"Política de compactación inválida: {config['compactacion']}")
+        resultado["compactacion"] = config["compactacion"]
+    if "particiones" in config:
+        # Cantidad de particiones iguales o lista de tamaños; que quepan lo comprueba el Scheduler
+        particiones = config["particiones"]
+        if isinstance(particiones, bool) or not (
+                isinstance(particiones, int) or
+                (isinstance(particiones, list) and all(isinstance(t, int) and not isinstance(t, bool) for t in particiones))):
+            raise ValueError("El campo 'particiones' debe ser un entero o una lista de enteros")
+        resultado["particiones"] = particiones
+    if "politica_espera" in config:
+        if config["politica_espera"] not in POLITICAS_ESPERA:
+            raise ValueError(f"Política de espera inválida: {config['politica_espera']}")
+        resultado["politica_espera"] = config["politica_espera"]
+    if "ratio_zswap" in config:
+        ratio = config["ratio_zswap"]
+        if isinstance(ratio, bool) or not isinstance(ratio, (int, float)) or ratio < 1:
+            raise ValueError("El campo 'ratio_zswap' debe ser un número mayor o igual a 1")
+        resultado["ratio_zswap"] = ratio
+    if "politica_zswap" in config:
+        if config["politica_zswap"] not in POLITICAS_ZSWAP:
+            raise ValueError(f"Política de zswap inválida: {config['politica_zswap']}")
+        resultado["politica_zswap"] = config["politica_zswap"]
+    if "estrategia" in config:
+        if config["estrategia"] not in VALID_ESTRATEGIAS:
+            raise ValueError(f"Estrategia inválida: {config['estrategia']}")
+        resultado["estrategia"] = config["estrategia"]
+    return resultado
+
+
+@app.route("/sesiones", methods=["POST"])
+def crear_sesion():
+    try:
+        config = validar_config_sesion(request.get_json(silent=True) or {})
+        sesion = registro.crear(instrumentar=INSTRUMENTAR, **config)
+        return jsonify({"success": True, "data": {"id": sesion.id}}), 201
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+
+
+@app.route("/metrics")
+def metrics():
+    """Métricas de todas las sesiones instrumentadas en formato de texto de Prometheus"""
+    fuentes = []
+    for sesion in registro.sesiones():
+        if sesion.scheduler.metricas is not None:
+            with sesion.lock:
+                fuentes.append(({"sesion": sesion.id}, copy.deepcopy(sesion.scheduler.metricas)))
+    texto = exportar_prometheus(fuentes)
+    return Response(texto, mimetype="text/plain; version=0.0.4")
+
+
+@app.route("/sesiones", methods=["GET"])
+def listar_sesiones():
+    return jsonify({"success": True, "data": registro.listar()})
+
+
+@app.route("/sesiones/<id_sesion>", methods=["DELETE"])
+def eliminar_sesion(id_sesion):
+    if id_sesion == SESION_POR_DEFECTO or not registro.eliminar(id_sesion):
+        return sesion_no_encontrada()
+    return jsonify({"success": True})
+
+
 @app.route('/iniciar', methods=['GET'])
 def iniciar_simulador():
-    scheduler.reset()
+    sesion = obtener_sesion()
+    if sesion is None:
+        return sesion_no_encontrada()
+    with sesion.lock:
+        sesion.scheduler.reset()
+        sesion.actualizar_memoria()
     return jsonify({"status": "iniciado"})
 
 
 @app.route("/tick")
 def tick():
+    sesion = obtener_sesion()
+    if sesion is None:
+        return sesion_no_encontrada()
     try:
-        resultado = scheduler.tick()
+        # Serializar dentro del lock: con el motor "lista" los bloques son la lista viva
+        with sesion.lock:
+            resultado = sesion.scheduler.tick()
+            sesion.actualizar_memoria()
+            # tick() no arma las vistas de bloques: se leen solo para esta respuesta
+            memoria = sesion.scheduler.memory_manager
 
-        if resultado.get("error") == "memory_full":
-            logging.warning(f"Memoria llena al asignar proceso {resultado['proceso']['pid']}.")
-            return jsonify({
-                "error": "memory_full",
-                "ram": resultado["ram"],
-                "swap": resultado["swap"],
-                "proceso": resultado["proceso"],
-                "finished": True
-            })
+            if resultado.get("error") == "memory_full":
+                logging.warning(f"Memoria llena al asignar proceso {resultado['proceso']['pid']}.")
+                return jsonify({
+                    "error": "memory_full",
+                    "ram": memoria.ram,
+                    "swap": memoria.swap,
+                    "proceso": resultado["proceso"],
+                    "finished": True
+                })
 
-        elif resultado.get("error") == "simulation_finished":
-            logging.info("Simulación finalizada.")
-            return jsonify({"finished": True})
+            elif resultado.get("error") == "simulation_finished":
+                logging.info("Simulación finalizada.")
+                return jsonify({"finished": True})
 
-        return jsonify({
-            "ram": resultado.get("ram"),
-            "swap": resultado.get("swap"),
-            "proceso": resultado.get("proceso"),
-            "finished": False
-        })
+            return jsonify({
+                "ram": memoria.ram,
+                "swap": memoria.swap,
+                "proceso": resultado.get("proceso"),
+                "finished": False
+            })
 
     except Exception as e:
         logging.error(f"Error inesperado durante el tick: {e}")
         return jsonify({"error": "internal_error", "message": str(e)}), 500
 
 
+@app.route("/ticks")
+def ticks():
+    """
+    Avanza n ticks y devuelve solo los cambios de bloques desde la secuencia
+    `desde` del cliente, junto con los eventos y el estado sin bloques.
+    """
+    n = min(max(request.args.get("n", default=1, type=int), 1), MAX_TICKS_POR_LOTE)
+    desde = request.args.get("desde", default=-1, type=int)
+    sesion = obtener_sesion()
+    if sesion is None:
+        return sesion_no_encontrada()
+    try:
+        with sesion.lock:
+            scheduler = sesion.scheduler
+            eventos = []
+            avanzados = 0
+            for _ in range(n):
+                resultado = scheduler.tick()
+                if resultado.get("error") == "simulation_finished":
+                    break
+                eventos.extend(resultado["eventos"])
+                avanzados += 1
+            sesion.actualizar_memoria()
+            # Serializar dentro del lock: el estado referencia estructuras vivas
+            return jsonify({"success": True, "data": {
+                "ticks": avanzados,
+                "eventos": eventos,
+                "deltas": scheduler.deltas.desde(desde),
+                "estado": scheduler.obtener_estado_completo(incluir_bloques=False)
+            }})
+    except Exception as e:
+        logging.error(f"Error inesperado durante /ticks: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@app.route("/ir")
+def ir_a_tick():
+    """
+    Lleva la simulación al tick `tick` (hacia atrás o adelante) desde el
+    checkpoint más cercano y devuelve los cambios desde `desde` y el estado.
+    """
+    tick = request.args.get("tick", type=int)
+    desde = request.args.get("desde", default=-1, type=int)
+    if tick is None or tick < 0:
+        return jsonify({"success": False, "error": "El parámetro 'tick' debe ser un entero no negativo"}), 400
+    sesion = obtener_sesion()
+    if sesion is None:
+        return sesion_no_encontrada()
+    try:
+        with sesion.lock:
+            scheduler = sesion.scheduler
+            alcanzado = scheduler.ir_a_tick(tick)
+            sesion.actualizar_memoria()
+            return jsonify({"success": True, "data": {
+                "tick": alcanzado,
+                "deltas": scheduler.deltas.desde(desde),
+                "estado": scheduler.obtener_estado_completo(incluir_bloques=False)
+            }})
+    except Exception as e:
+        logging.error(f"Error inesperado durante /ir: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+def _mensaje_sse(evento, datos):
+    return f"event: {evento}\ndata: {json.dumps(datos)}\n\n"
+
+
+def _transmitir(sesion, tasa, desde):
+    """
+    Genera mensajes SSE con los ticks ejecutados desde el mensaje anterior.
+    Los ticks se ejecutan según el reloj (tasa ticks/s, o lo más rápido
+    posible si tasa es 0) justo antes de cada envío: si el cliente lee
+    despacio, el envío bloquea y el siguiente mensaje agrupa todos los
+    ticks atrasados en un solo delta, sin cola en memoria. El lock de la
+    sesión se toma por lote, nunca mientras se espera al cliente.
+    """
+    scheduler = sesion.scheduler
+    secuencia = desde
+    inicio = time.monotonic()
+    hechos = 0
+    while True:
+        if tasa > 0:
+            atrasados = int((time.monotonic() - inicio) * tasa) - hechos
+            if atrasados <= 0 and not scheduler.finished:
+                time.sleep((hechos + 1) / tasa - (time.monotonic() - inicio))
+                continue
+            atrasados = min(atrasados, MAX_TICKS_POR_LOTE)
+        limite = time.monotonic() + PRESUPUESTO_LOTE_S
+
+        with sesion.lock:
+            eventos = []
+            avanzados = 0
+            while not scheduler.finished and (avanzados < atrasados if tasa > 0 else time.monotonic() < limite):
+                eventos.extend(scheduler.tick()["eventos"])
+                avanzados += 1
+            hechos += avanzados
+            sesion.actualizar_memoria()
+
+            deltas = scheduler.deltas.desde(secuencia)
+            secuencia = deltas["secuencia"]
+            mensaje = _mensaje_sse("tick", {
+                "ticks": avanzados,
+                "eventos": eventos,
+                "deltas": deltas,
+                "estado": scheduler.obtener_estado_completo(incluir_bloques=False)
+            })
+        yield mensaje
+        if scheduler.finished:
+            yield _mensaje_sse("fin", {"tick_actual": scheduler.current_tick})
+            return
+
+
+@app.route("/stream")
+def stream():
+    """Transmite el avance de la simulación por Server-Sent Events"""
+    tasa = max(request.args.get("tasa", default=0, type=float), 0)
+    desde = request.args.get("desde", default=-1, type=int)
+    sesion = obtener_sesion()
+    if sesion is None:
+        return sesion_no_encontrada()
+    return app.response_class(
+        _transmitir(sesion, tasa, desde),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def _indice_mapa(sesion, region):
+    """Índice de bloques de la región, reconstruido solo si la memoria cambió"""
+    mm = sesion.scheduler.memory_manager
+    guardado = sesion.mapas.get(region)
+    if guardado is None or guardado[0] is not mm or guardado[1] != mm.version:
+        guardado = (mm, mm.version, IndiceBloques(mm.ram if region == "ram" else mm.swap))
+        sesion.mapas[region] = guardado
+    return guardado[2]
+
+
+@app.route("/memory-map")
+def mapa_memoria():
+    """
+    Mapa de la RAM (o SWAP con region=swap) reducido a `width` cubetas del
+    rango de direcciones `range=a:b` (por defecto, toda la región).
+    """
+    ancho = request.args.get("width", default=512, type=int)
+    region = request.args.get("region", default="ram")
+    if not 1 <= ancho <= MAX_ANCHO_MAPA:
+        return jsonify({"success": False, "error": f"'width' debe estar entre 1 y {MAX_ANCHO_MAPA}"}), 400
+    if region not in ("ram", "swap"):
+        return jsonify({"success": False, "error": "'region' debe ser ram o swap"}), 400
+    sesion = obtener_sesion()
+    if sesion is None:
+        return sesion_no_encontrada()
+    with sesion.lock:
+        indice = _indice_mapa(sesion, region)
+        tick = sesion.scheduler.current_tick
+    desde, hasta = 0, indice.total
+    if "range" in request.args:
+        try:
+            desde, hasta = (int(x) for x in request.args["range"].split(":"))
+        except ValueError:
+            return jsonify({"success": False, "error": "'range' debe tener la forma a:b"}), 400
+        if not 0 <= desde < hasta <= indice.total:
+            return jsonify({"success": False, "error": f"'range' debe cumplir 0 <= a < b <= {indice.total}"}), 400
+    datos = indice.mapa(ancho, desde, hasta)
+    datos.update({"region": region, "total": indice.total, "tick": tick})
+    return jsonify({"success": True, "data": datos})
+
+
 @app.route("/reset")
 def reset():
-    scheduler.reset()
+    sesion = obtener_sesion()
+    if sesion is None:
+        return sesion_no_encontrada()
+    with sesion.lock:
+        sesion.scheduler.reset()
+        sesion.actualizar_memoria()
     logging.info("Simulación reiniciada.")
     return "OK"
 
 @app.route("/estado", methods=['GET'])
 def obtener_estado():
+    sesion = obtener_sesion()
+    if sesion is None:
+        return sesion_no_encontrada()
     try:
-        estado = scheduler.obtener_estado_completo()
-        return jsonify({
-            "success": True,
-            "data": estado
-        })
+        # bloques=0 omite las listas de bloques (la vista usa /memory-map)
+        incluir_bloques = request.args.get("bloques", default=1, type=int) != 0
+        # Serializar dentro del lock: con el motor "lista" los bloques son la lista viva
+        with sesion.lock:
+            return jsonify({
+                "success": True,
+                "data": sesion.scheduler.obtener_estado_completo(incluir_bloques)
+            })
     except Exception as e:
         logging.error(f"Error al obtener estado: {str(e)}")
         return jsonify({
@@ -113,4 +427,4 @@ def obtener_estado():
         }), 500
 
 if __name__ == "__main__":
-    app.run(debug=True)
\ No newline at end of file
+    app.run(debug=True, threaded=True)
\ No newline at end of file
@@ -0,0 +1,979 @@
+"""
+Motores de asignación para una región de memoria (RAM o SWAP).
+
+Todos los motores exponen la misma interfaz y producen exactamente la misma
+disposición de bloques, por lo que MemoryManager puede cambiar de motor sin
+alterar el resultado de una simulación:
+
+- MotorLista: lista de diccionarios recorrida en cada búsqueda (original).
+- MotorIndexado: bloques enlazados con sus vecinos e índices de huecos
+  libres por dirección y por tamaño; búsquedas y fusiones en O(log n).
+- MotorCompacto: arrays paralelos (offset, tamaño, pid internado, tipo)
+  con la misma semántica que MotorLista; las búsquedas usan reducciones
+  vectorizadas (NumPy si está instalado).
+
+Todos mantienen ocupado(), num_libres() y mayor_libre() al ocupar, liberar
+y fusionar, de modo que leerlos es O(1). MotorIndexado y MotorCompacto
+indexan además los bloques de cada pid por dirección (la dirección de un
+bloque ocupado no cambia aunque la lista se desplace), así que liberar o
+medir un proceso cuesta en proporción a sus propios bloques.
+
+Los "manejadores" que devuelve buscar() son índices en MotorLista y
+MotorCompacto, y direcciones (offsets) en MotorIndexado.
+
+compactar() desliza los bloques ocupados hacia el inicio. Se mueven por
+unidades: un bloque, o todas las páginas consecutivas de un mismo proceso
+(que MotorIndexado guarda como un solo tramo), así que los tres motores
+quedan con la misma disposición también tras una compactación parcial.
+"""
+from array import array
+from bisect import bisect_left, insort
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional
+    np = None
+
+TIPO_PAGINA = "pagina"  # tipo de los marcos reservados con ocupar_paginas
+
+
+class MotorLista:
+    """Lista de bloques {"pid", "size", "tipo"} en orden de dirección."""
+
+    def __init__(self, size):
+        self.size = size
+        self.reset()
+
+    def reset(self):
+        self.bloques = [{"pid": None, "size": self.size, "tipo": "libre"}]
+        self.next_fit_pointer = 0
+        self.examinados = 0  # bloques revisados por la última búsqueda
+        self._ocupado = 0
+        self._num_libres = 1
+        self._mayor_libre = self.size
+
+    def buscar(self, estrategia, size):
+        self.examinados = len(self.bloques)
+        bloques_libres = [(i, b) for i, b in enumerate(self.bloques)
+                          if b["pid"] is None and b["size"] >= size]
+
+        if not bloques_libres:
+            return None
+
+        if estrategia == "first_fit":
+            return bloques_libres[0][0]
+        elif estrategia == "best_fit":
+            return min(bloques_libres, key=lambda x: x[1]["size"])[0]
+        elif estrategia == "worst_fit":
+            return max(bloques_libres, key=lambda x: x[1]["size"])[0]
+        elif estrategia == "next_fit":
+            return self._next_fit(bloques_libres)
+        else:
+            return bloques_libres[0][0]
+
+    def _next_fit(self, bloques_libres):
+        # Buscar desde el puntero actual hacia adelante
+        for idx, bloque in bloques_libres:
+            if idx >= self.next_fit_pointer:
+                self.next_fit_pointer = idx
+                return idx
+
+        # Si no encuentra, reiniciar desde el principio
+        self.next_fit_pointer = bloques_libres[0][0]
+        return bloques_libres[0][0]
+
+    def tamano(self, idx):
+        return self.bloques[idx]["size"]
+
+    def ocupar(self, idx, pid, size, tipo):
+        bloque = self.bloques[idx]
+        if bloque["size"] == size:
+            bloque["pid"] = pid
+            bloque["tipo"] = tipo
+        else:
+            bloque_asignado = {"pid": pid, "size": size, "tipo": tipo}
+            bloque_libre = {"pid": None, "size": bloque["size"] - size, "tipo": "libre"}
+            self.bloques[idx] = bloque_asignado
+            self.bloques.insert(idx + 1, bloque_libre)
+
+        self.fusionar()
+        return idx
+
+    def ocupar_paginas(self, pid, paginas, page_size, tipo):
+        """
+        Reserva `paginas` páginas con first_fit en una sola pasada sobre la
+        lista. Devuelve las direcciones de los marcos, o None sin modificar
+        nada si no caben.
+        """
+        marcos = array("q")
+        disponibles = 0
+        for bloque in self.bloques:
+            if disponibles >= paginas:
+                break
+            if bloque["pid"] is None:
+                disponibles += bloque["size"] // page_size
+        if disponibles < paginas:
+            return None
+
+        nuevos = []
+        offset = 0
+        restantes = paginas
+        for bloque in self.bloques:
+            if restantes and bloque["pid"] is None and bloque["size"] >= page_size:
+                k = min(bloque["size"] // page_size, restantes)
+                marcos.extend(range(offset, offset + k * page_size, page_size))
+                nuevos.extend({"pid": pid, "size": page_size, "tipo": tipo} for _ in range(k))
+                if bloque["size"] > k * page_size:
+                    nuevos.append({"pid": None, "size": bloque["size"] - k * page_size, "tipo": "libre"})
+                restantes -= k
+            else:
+                nuevos.append(bloque)
+            offset += bloque["size"]
+        self.bloques[:] = nuevos
+        self._contar()
+        return marcos
+
+    def liberar(self, indices):
+        """Libera los bloques indicados y fusiona una sola vez"""
+        for idx in indices:
+            self.bloques[idx]["pid"] = None
+            self.bloques[idx]["tipo"] = "libre"
+        self.fusionar()
+
+    def liberar_pid(self, pid):
+        for bloque in self.bloques:
+            if bloque["pid"] == pid:
+                bloque["pid"] = None
+                bloque["tipo"] = "libre"
+        self.fusionar()
+
+    def liberar_pids(self, pids):
+        """Libera todos los bloques de varios procesos en una pasada y fusiona una vez"""
+        pids = set(pids)
+        for bloque in self.bloques:
+            if bloque["pid"] in pids:
+                bloque["pid"] = None
+                bloque["tipo"] = "libre"
+        self.fusionar()
+
+    def tamano_pid(self, pid):
+        return sum(b["size"] for b in self.bloques if b["pid"] == pid)
+
+    def bloques_pid(self, pid):
+        return [i for i, b in enumerate(self.bloques) if b["pid"] == pid]
+
+    def fusionar(self):
+        """Fusiona bloques libres adyacentes y de paso actualiza los contadores"""
+        i = 0
+        while i < len(self.bloques) - 1:
+            if self.bloques[i]["pid"] is None and self.bloques[i + 1]["pid"] is None:
+                self.bloques[i]["size"] += self.bloques[i + 1]["size"]
+                del self.bloques[i + 1]
+            else:
+                i += 1
+        self._contar()
+
+    def _contar(self):
+        # Toda modificación de la lista ya la recorre entera; las lecturas son O(1)
+        ocupado = libres = mayor = 0
+        for b in self.bloques:
+            if b["pid"] is None:
+                libres += 1
+                if b["size"] > mayor:
+                    mayor = b["size"]
+            else:
+                ocupado += b["size"]
+        self._ocupado, self._num_libres, self._mayor_libre = ocupado, libres, mayor
+
+    def ocupado(self):
+        return self._ocupado
+
+    def num_libres(self):
+        return self._num_libres
+
+    def mayor_libre(self):
+        return self._mayor_libre
+
+    def num_bloques(self):
+        return len(self.bloques)
+
+    def compactar(self, max_bloques=None):
+        """
+        Desliza los bloques ocupados hacia el inicio en una sola pasada. Con
+        max_bloques se detiene al llegar a esa cantidad de bloques movidos
+        (el hueco acumulado queda delante del resto). Devuelve los
+        movimientos (pid, origen, destino, size).
+        """
+        bloques = self.bloques
+        nuevos = []
+        movimientos = []
+        hueco = offset = movidos = 0
+        i = 0
+        while i < len(bloques):
+            bloque = bloques[i]
+            if bloque["pid"] is None:
+                hueco += bloque["size"]
+                offset += bloque["size"]
+                i += 1
+                continue
+            j = i + 1
+            if bloque["tipo"] == TIPO_PAGINA:
+                while j < len(bloques) and bloques[j]["pid"] == bloque["pid"] and bloques[j]["tipo"] == TIPO_PAGINA:
+                    j += 1
+            size = sum(b["size"] for b in bloques[i:j])
+            if hueco:
+                if max_bloques is not None and movidos >= max_bloques:
+                    break
+                movimientos.append((bloque["pid"], offset, offset - hueco, size))
+                movidos += j - i
+            nuevos.extend(bloques[i:j])
+            offset += size
+            i = j
+        if not movimientos:
+            return movimientos
+        nuevos.append({"pid": None, "size": hueco, "tipo": "libre"})
+        nuevos.extend(bloques[i:])
+        self.bloques[:] = nuevos
+        self._contar()
+        return movimientos
+
+
+class _ArbolMaximos:
+    """Árbol de segmentos disperso sobre direcciones: máximo por rango."""
+
+    def __init__(self, capacidad):
+        self.n = 1
+        while self.n < capacidad:
+            self.n *= 2
+        self.nodos = {}
+        self.visitados = 0  # nodos recorridos por primero (acumulado; se pone a 0 por fuera)
+
+    def asignar(self, pos, valor):
+        nodos = self.nodos
+        i = pos + self.n
+        if valor:
+            nodos[i] = valor
+        else:
+            nodos.pop(i, None)
+        i >>= 1
+        while i:
+            maximo = max(nodos.get(2 * i, 0), nodos.get(2 * i + 1, 0))
+            if nodos.get(i, 0) == maximo:
+                break
+            if maximo:
+                nodos[i] = maximo
+            else:
+                del nodos[i]
+            i >>= 1
+
+    def primero(self, minimo, desde=0):
+        """Menor posición >= desde cuyo valor es >= minimo, o None"""
+        nodos = self.nodos
+        self.visitados += 1
+        if nodos.get(1, 0) < minimo:
+            return None
+        pila = [(1, 0, self.n)]
+        while pila:
+            i, lo, hi = pila.pop()
+            self.visitados += 1
+            if hi <= desde or nodos.get(i, 0) < minimo:
+                continue
+            if hi - lo == 1:
+                return lo
+            mitad = (lo + hi) // 2
+            pila.append((2 * i + 1, mitad, hi))
+            pila.append((2 * i, lo, mitad))
+        return None
+
+
+class _ArbolConteo:
+    """Árbol de segmentos disperso sobre direcciones: cuántos bloques empiezan en cada rango."""
+
+    def __init__(self, capacidad):
+        self.n = 1
+        while self.n < capacidad:
+            self.n *= 2
+        self.nodos = {}
+
+    @property
+    def total(self):
+        return self.nodos.get(1, 0)
+
+    def sumar(self, pos, delta):
+        nodos = self.nodos
+        i = pos + self.n
+        while i:
+            valor = nodos.get(i, 0) + delta
+            if valor:
+                nodos[i] = valor
+            else:
+                del nodos[i]
+            i >>= 1
+
+    def rango(self, pos):
+        """Cantidad de bloques que empiezan antes de pos (su índice en la lista)"""
+        nodos = self.nodos
+        i = pos + self.n
+        cuenta = 0
+        while i > 1:
+            if i & 1:
+                cuenta += nodos.get(i - 1, 0)
+            i >>= 1
+        return cuenta
+
+    def kesimo(self, k):
+        """Dirección del bloque con índice k en la lista"""
+        nodos = self.nodos
+        i = 1
+        while i < self.n:
+            izquierda = nodos.get(2 * i, 0)
+            if k < izquierda:
+                i = 2 * i
+            else:
+                k -= izquierda
+                i = 2 * i + 1
+        return i - self.n
+
+
+class _Bloque:
+    __slots__ = ("offset", "size", "pid", "tipo", "paginas", "prev", "next")
+
+    def __init__(self, offset, size, pid=None, tipo="libre"):
+        self.offset = offset
+        self.size = size
+        self.pid = pid
+        self.tipo = tipo
+        self.paginas = 0  # >0: tramo de páginas consecutivas de un mismo proceso
+        self.prev = None
+        self.next = None
+
+
+class MotorIndexado:
+    """
+    Bloques doblemente enlazados en orden de dirección con índices de huecos:
+    - _libres: árbol de máximos por dirección (first_fit / next_fit)
+    - _tamanos + _por_tamano: tamaños ordenados con sus direcciones (best_fit / worst_fit)
+    - _conteo: posición de cada bloque en la lista, para conservar la
+      semántica del puntero de next_fit del motor original
+    - _por_pid: direcciones de los bloques de cada proceso
+
+    Las páginas consecutivas de un proceso se guardan como un único tramo que
+    cuenta como `paginas` bloques en _conteo y en la vista `bloques`.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.reset()
+
+    def reset(self):
+        self._cabeza = _Bloque(0, self.size)
+        self._bloques = {0: self._cabeza}
+        self._libres = _ArbolMaximos(self.size + 1)
+        self._conteo = _ArbolConteo(self.size + 1)
+        self._tamanos = []
+        self._por_tamano = {}
+        self._por_pid = {}
+        self._ocupado = 0
+        self._num_libres = 0
+        self.next_fit_pointer = 0
+        self.examinados = 0
+        self._conteo.sumar(0, 1)
+        self._indexar_libre(self._cabeza)
+
+    def __getstate__(self):
+        """Para checkpoints: solo la secuencia de bloques, los índices se reconstruyen"""
+        tramos = []
+        bloque = self._cabeza
+        while bloque is not None:
+            tramos.append((bloque.size, bloque.pid, bloque.tipo, bloque.paginas))
+            bloque = bloque.next
+        return {"size": self.size, "tramos": tramos, "next_fit_pointer": self.next_fit_pointer}
+
+    def __setstate__(self, estado):
+        self.size = estado["size"]
+        self._bloques = {}
+        self._libres = _ArbolMaximos(self.size + 1)
+        self._conteo = _ArbolConteo(self.size + 1)
+        self._tamanos = []
+        self._por_tamano = {}
+        self._por_pid = {}
+        self._ocupado = 0
+        self._num_libres = 0
+        self.examinados = 0
+        anterior = None
+        offset = 0
+        for size, pid, tipo, paginas in estado["tramos"]:
+            bloque = _Bloque(offset, size, pid, tipo)
+            bloque.paginas = paginas
+            bloque.prev = anterior
+            if anterior is None:
+                self._cabeza = bloque
+            else:
+                anterior.next = bloque
+            self._bloques[offset] = bloque
+            self._conteo.sumar(offset, paginas or 1)
+            if pid is None:
+                self._indexar_libre(bloque)
+            else:
+                self._ocupado += size
+                self._por_pid.setdefault(pid, set()).add(offset)
+            anterior = bloque
+            offset += size
+        self.next_fit_pointer = estado["next_fit_pointer"]
+
+    @property
+    def bloques(self):
+        vista = []
+        bloque = self._cabeza
+        while bloque is not None:
+            if bloque.paginas:
+                size = bloque.size // bloque.paginas
+                vista.extend({"pid": bloque.pid, "size": size, "tipo": bloque.tipo}
+                             for _ in range(bloque.paginas))
+            else:
+                vista.append({"pid": bloque.pid, "size": bloque.size, "tipo": bloque.tipo})
+            bloque = bloque.next
+        return vista
+
+    def _indexar_libre(self, bloque):
+        self._num_libres += 1
+        self._libres.asignar(bloque.offset, bloque.size)
+        direcciones = self._por_tamano.get(bloque.size)
+        if direcciones is None:
+            insort(self._tamanos, bloque.size)
+            self._por_tamano[bloque.size] = [bloque.offset]
+        else:
+            insort(direcciones, bloque.offset)
+
+    def _desindexar_libre(self, bloque):
+        self._num_libres -= 1
+        self._libres.asignar(bloque.offset, 0)
+        direcciones = self._por_tamano[bloque.size]
+        del direcciones[bisect_left(direcciones, bloque.offset)]
+        if not direcciones:
+            del self._por_tamano[bloque.size]
+            del self._tamanos[bisect_left(self._tamanos, bloque.size)]
+
+    def buscar(self, estrategia, size):
+        """examinados: pasos de bisección o nodos del árbol recorridos"""
+        self._libres.visitados = 0
+        resultado = self._buscar(estrategia, size)
+        if estrategia in ("best_fit", "worst_fit"):
+            self.examinados = len(self._tamanos).bit_length()
+        else:
+            self.examinados = self._libres.visitados
+        return resultado
+
+    def _buscar(self, estrategia, size):
+        if estrategia == "best_fit":
+            i = bisect_left(self._tamanos, size)
+            if i == len(self._tamanos):
+                return None
+            return self._por_tamano[self._tamanos[i]][0]
+        elif estrategia == "worst_fit":
+            if not self._tamanos or self._tamanos[-1] < size:
+                return None
+            return self._por_tamano[self._tamanos[-1]][0]
+        elif estrategia == "next_fit":
+            return self._next_fit(size)
+        else:
+            return self._libres.primero(size)
+
+    def _next_fit(self, size):
+        offset = None
+        if self.next_fit_pointer < self._conteo.total:
+            desde = self._conteo.kesimo(self.next_fit_pointer)
+            offset = self._libres.primero(size, desde)
+        if offset is None:
+            offset = self._libres.primero(size)
+            if offset is None:
+                return None
+        self.next_fit_pointer = self._conteo.rango(offset)
+        return offset
+
+    def tamano(self, offset):
+        return self._bloques[offset].size
+
+    def ocupar(self, offset, pid, size, tipo):
+        bloque = self._bloques[offset]
+        if bloque.pid is None:
+            self._desindexar_libre(bloque)
+        else:
+            self._ocupado -= bloque.size
+            self._quitar_propio(bloque)
+        self._por_pid.setdefault(pid, set()).add(offset)
+        bloque.pid = pid
+        bloque.tipo = tipo
+        if bloque.size != size:
+            resto = _Bloque(offset + size, bloque.size - size)
+            resto.prev, resto.next = bloque, bloque.next
+            if bloque.next is not None:
+                bloque.next.prev = resto
+            bloque.next = resto
+            bloque.size = size
+            self._bloques[resto.offset] = resto
+            self._conteo.sumar(resto.offset, 1)
+            self._fusionar_con_vecinos(resto)
+        self._ocupado += size
+        return offset
+
+    def ocupar_paginas(self, pid, paginas, page_size, tipo):
+        """
+        Reserva `paginas` páginas con first_fit tomando tramos enteros de cada
+        hueco. Devuelve las direcciones de los marcos, o None sin modificar
+        nada si no caben.
+        """
+        marcos = array("q")
+        plan = []
+        restantes = paginas
+        desde = 0
+        while restantes:
+            offset = self._libres.primero(page_size, desde)
+            if offset is None:
+                return None
+            k = min(self._bloques[offset].size // page_size, restantes)
+            plan.append((offset, k))
+            restantes -= k
+            desde = offset + 1
+
+        for offset, k in plan:
+            self.ocupar(offset, pid, k * page_size, tipo)
+            self._bloques[offset].paginas = k
+            self._conteo.sumar(offset, k - 1)
+            marcos.extend(range(offset, offset + k * page_size, page_size))
+        return marcos
+
+    def _fusionar_con_vecinos(self, bloque):
+        """Fusiona un bloque libre (aún sin indexar) con sus vecinos libres y lo indexa"""
+        siguiente = bloque.next
+        if siguiente is not None and siguiente.pid is None:
+            self._desindexar_libre(siguiente)
+            self._absorber(bloque, siguiente)
+        anterior = bloque.prev
+        if anterior is not None and anterior.pid is None:
+            self._desindexar_libre(anterior)
+            self._absorber(anterior, bloque)
+            bloque = anterior
+        self._indexar_libre(bloque)
+
+    def _absorber(self, bloque, siguiente):
+        bloque.size += siguiente.size
+        bloque.next = siguiente.next
+        if siguiente.next is not None:
+            siguiente.next.prev = bloque
+        del self._bloques[siguiente.offset]
+        self._conteo.sumar(siguiente.offset, -1)
+
+    def _quitar_propio(self, bloque):
+        propios = self._por_pid[bloque.pid]
+        propios.discard(bloque.offset)
+        if not propios:
+            del self._por_pid[bloque.pid]
+
+    def _liberar_bloque(self, bloque):
+        self._quitar_propio(bloque)
+        if bloque.paginas:
+            self._conteo.sumar(bloque.offset, 1 - bloque.paginas)
+            bloque.paginas = 0
+        self._ocupado -= bloque.size
+        bloque.pid = None
+        bloque.tipo = "libre"
+        self._fusionar_con_vecinos(bloque)
+
+    def liberar(self, offsets):
+        """Libera los bloques indicados fusionando solo con sus vecinos"""
+        for offset in offsets:
+            bloque = self._bloques[offset]
+            if bloque.pid is not None:
+                self._liberar_bloque(bloque)
+
+    def liberar_pid(self, pid):
+        self.liberar_pids((pid,))
+
+    def liberar_pids(self, pids):
+        """Libera todos los bloques de varios procesos tocando solo esos bloques"""
+        for pid in pids:
+            # Las fusiones solo absorben huecos: las direcciones ocupadas siguen valiendo
+            for offset in list(self._por_pid.get(pid, ())):
+                self._liberar_bloque(self._bloques[offset])
+
+    def tamano_pid(self, pid):
+        return sum(self._bloques[o].size for o in self._por_pid.get(pid, ()))
+
+    def bloques_pid(self, pid):
+        return sorted(self._por_pid.get(pid, ()))
+
+    def fusionar(self):
+        """Los huecos se fusionan al liberarse; se conserva por compatibilidad"""
+
+    def ocupado(self):
+        return self._ocupado
+
+    def num_libres(self):
+        return self._num_libres
+
+    def mayor_libre(self):
+        return self._tamanos[-1] if self._tamanos else 0
+
+    def num_bloques(self):
+        return len(self._bloques)
+
+    def compactar(self, max_bloques=None):
+        """
+        Igual que MotorLista.compactar; los tramos de páginas consecutivos de
+        un proceso se unen en uno. Reconstruye los índices una sola vez.
+        """
+        tramos = []
+        movimientos = []
+        hueco = offset = movidos = 0
+        bloque = self._cabeza
+        while bloque is not None:
+            if bloque.pid is None:
+                hueco += bloque.size
+                offset += bloque.size
+                bloque = bloque.next
+                continue
+            size, paginas = bloque.size, bloque.paginas
+            siguiente = bloque.next
+            if paginas:
+                while siguiente is not None and siguiente.pid == bloque.pid and siguiente.paginas:
+                    size += siguiente.size
+                    paginas += siguiente.paginas
+                    siguiente = siguiente.next
+            if hueco:
+                if max_bloques is not None and movidos >= max_bloques:
+                    break
+                movimientos.append((bloque.pid, offset, offset - hueco, size))
+                movidos += paginas or 1
+            tramos.append((size, bloque.pid, bloque.tipo, paginas))
+            offset += size
+            bloque = siguiente
+        if not movimientos:
+            return movimientos
+        tramos.append((hueco, None, "libre", 0))
+        while bloque is not None:
+            tramos.append((bloque.size, bloque.pid, bloque.tipo, bloque.paginas))
+            bloque = bloque.next
+        self.__setstate__({"size": self.size, "tramos": tramos, "next_fit_pointer": self.next_fit_pointer})
+        return movimientos
+
+
+class MotorCompacto:
+    """
+    Bloques en arrays paralelos en orden de dirección. Los pids se internan
+    como enteros (0 = libre) y los tipos como códigos de un byte; la vista
+    `bloques` de diccionarios solo se construye cuando se pide.
+    """
+
+    LIBRE = 0
+
+    def __init__(self, size):
+        self.size = size
+        self.reset()
+
+    def reset(self):
+        self._offsets = array("q", [0])
+        self._sizes = array("q", [self.size])
+        self._pids = array("i", [self.LIBRE])
+        self._tipos = array("b", [0])
+        self._nombres_tipo = ["libre"]
+        self._codigos_tipo = {"libre": 0}
+        self._nombres_pid = [None]
+        self._ids_pid = {}
+        self._ids_reciclados = []
+        self._propios = {}  # id de pid -> direcciones de sus bloques
+        self.next_fit_pointer = 0
+        self.examinados = 0
+        self._ocupado = 0
+        self._num_libres = 1
+        self._mayor_libre = self.size  # None: hay que recalcularlo
+
+    def _id_pid(self, pid):
+        id_pid = self._ids_pid.get(pid)
+        if id_pid is None:
+            if self._ids_reciclados:
+                id_pid = self._ids_reciclados.pop()
+                self._nombres_pid[id_pid] = pid
+            else:
+                id_pid = len(self._nombres_pid)
+                self._nombres_pid.append(pid)
+            self._ids_pid[pid] = id_pid
+        return id_pid
+
+    def _codigo_tipo(self, tipo):
+        codigo = self._codigos_tipo.get(tipo)
+        if codigo is None:
+            codigo = len(self._nombres_tipo)
+            self._nombres_tipo.append(tipo)
+            self._codigos_tipo[tipo] = codigo
+        return codigo
+
+    @property
+    def bloques(self):
+        nombres_pid = self._nombres_pid
+        nombres_tipo = self._nombres_tipo
+        return [{"pid": nombres_pid[p], "size": s, "tipo": nombres_tipo[t]}
+                for p, s, t in zip(self._pids, self._sizes, self._tipos)]
+
+    def _candidatos(self, size):
+        if np is not None:
+            pids = np.frombuffer(self._pids, dtype=np.int32)
+            sizes = np.frombuffer(self._sizes, dtype=np.int64)
+            return np.flatnonzero((pids == self.LIBRE) & (sizes >= size)).tolist()
+        return [i for i, (p, s) in enumerate(zip(self._pids, self._sizes))
+                if p == self.LIBRE and s >= size]
+
+    def buscar(self, estrategia, size):
+        self.examinados = len(self._pids)
+        candidatos = self._candidatos(size)
+
+        if not candidatos:
+            return None
+
+        if estrategia == "best_fit":
+            return min(candidatos, key=self._sizes.__getitem__)
+        elif estrategia == "worst_fit":
+            return max(candidatos, key=self._sizes.__getitem__)
+        elif estrategia == "next_fit":
+            i = bisect_left(candidatos, self.next_fit_pointer)
+            self.next_fit_pointer = candidatos[i] if i < len(candidatos) else candidatos[0]
+            return self.next_fit_pointer
+        else:
+            return candidatos[0]
+
+    def tamano(self, idx):
+        return self._sizes[idx]
+
+    def ocupar(self, idx, pid, size, tipo):
+        anterior = self._sizes[idx]
+        resto = anterior - size
+        if self._pids[idx] == self.LIBRE:
+            self._num_libres -= 1
+            if anterior == self._mayor_libre:
+                self._mayor_libre = None
+        else:
+            self._ocupado -= anterior
+            self._quitar_propio(idx)
+        self._ocupado += size
+        if resto:
+            self._sumar_libre(resto)
+        self._pids[idx] = self._id_pid(pid)
+        self._propios.setdefault(self._pids[idx], set()).add(self._offsets[idx])
+        self._tipos[idx] = self._codigo_tipo(tipo)
+        self._sizes[idx] = size
+        if resto:
+            self._offsets.insert(idx + 1, self._offsets[idx] + size)
+            self._sizes.insert(idx + 1, resto)
+            self._pids.insert(idx + 1, self.LIBRE)
+            self._tipos.insert(idx + 1, 0)
+        return idx
+
+    def ocupar_paginas(self, pid, paginas, page_size, tipo):
+        """Equivalente a MotorLista.ocupar_paginas reconstruyendo los arrays en una pasada"""
+        disponibles = 0
+        for p, s in zip(self._pids, self._sizes):
+            if disponibles >= paginas:
+                break
+            if p == self.LIBRE:
+                disponibles += s // page_size
+        if disponibles < paginas:
+            return None
+
+        id_pid = self._id_pid(pid)
+        codigo = self._codigo_tipo(tipo)
+        marcos = array("q")
+        offsets, sizes, pids, tipos = array("q"), array("q"), array("i"), array("b")
+        restantes = paginas
+        for o, s, p, t in zip(self._offsets, self._sizes, self._pids, self._tipos):
+            if restantes and p == self.LIBRE and s >= page_size:
+                k = min(s // page_size, restantes)
+                marcos.extend(range(o, o + k * page_size, page_size))
+                offsets.extend(marcos[-k:])
+                sizes.extend([page_size] * k)
+                pids.extend([id_pid] * k)
+                tipos.extend([codigo] * k)
+                if s > k * page_size:
+                    offsets.append(o + k * page_size)
+                    sizes.append(s - k * page_size)
+                    pids.append(self.LIBRE)
+                    tipos.append(0)
+                restantes -= k
+            else:
+                offsets.append(o)
+                sizes.append(s)
+                pids.append(p)
+                tipos.append(t)
+        self._offsets, self._sizes, self._pids, self._tipos = offsets, sizes, pids, tipos
+        self._propios.setdefault(id_pid, set()).update(marcos)
+        self._ocupado += paginas * page_size
+        self._num_libres = self._pids.count(self.LIBRE)
+        self._mayor_libre = None
+        return marcos
+
+    def liberar(self, indices):
+        """Libera los bloques indicados y fusiona solo alrededor de ellos"""
+        for idx in indices:
+            if self._pids[idx] != self.LIBRE:
+                self._ocupado -= self._sizes[idx]
+                self._sumar_libre(self._sizes[idx])
+                self._quitar_propio(idx)
+            self._pids[idx] = self.LIBRE
+            self._tipos[idx] = 0
+        self._fusionar_alrededor(indices)
+
+    def liberar_pid(self, pid):
+        self.liberar_pids((pid,))
+
+    def liberar_pids(self, pids):
+        """Libera todos los bloques de varios procesos con una sola pasada sobre los arrays"""
+        ids = []
+        for pid in pids:
+            id_pid = self._ids_pid.pop(pid, None)
+            if id_pid is not None:
+                self._nombres_pid[id_pid] = None
+                self._ids_reciclados.append(id_pid)
+                ids.append(id_pid)
+        indices = [i for id_pid in ids for i in self._indices_propios(id_pid)]
+        if indices:
+            self.liberar(indices)
+
+    def _indices_propios(self, id_pid):
+        # Direcciones -> índices actuales por bisección sobre _offsets
+        return [bisect_left(self._offsets, o) for o in self._propios.get(id_pid, ())]
+
+    def _quitar_propio(self, idx):
+        id_pid = self._pids[idx]
+        propios = self._propios.get(id_pid)
+        if propios is not None:
+            propios.discard(self._offsets[idx])
+            if not propios:
+                del self._propios[id_pid]
+
+    def _fusionar_alrededor(self, indices):
+        # De mayor a menor para que los índices pendientes sigan siendo válidos
+        for i in sorted(indices, reverse=True):
+            if i + 1 < len(self._pids) and self._pids[i + 1] == self.LIBRE:
+                self._absorber(i)
+            if i > 0 and self._pids[i - 1] == self.LIBRE:
+                self._absorber(i - 1)
+
+    def _sumar_libre(self, size):
+        self._num_libres += 1
+        if self._mayor_libre is not None and size > self._mayor_libre:
+            self._mayor_libre = size
+
+    def _absorber(self, i):
+        # Solo se llama con dos bloques libres: quedan uno menos y más grande
+        self._sizes[i] += self._sizes[i + 1]
+        self._num_libres -= 1
+        if self._mayor_libre is not None and self._sizes[i] > self._mayor_libre:
+            self._mayor_libre = self._sizes[i]
+        del self._offsets[i + 1]
+        del self._sizes[i + 1]
+        del self._pids[i + 1]
+        del self._tipos[i + 1]
+
+    def tamano_pid(self, pid):
+        id_pid = self._ids_pid.get(pid)
+        if id_pid is None:
+            return 0
+        return sum(self._sizes[i] for i in self._indices_propios(id_pid))
+
+    def bloques_pid(self, pid):
+        id_pid = self._ids_pid.get(pid)
+        if id_pid is None:
+            return []
+        return sorted(self._indices_propios(id_pid))
+
+    def fusionar(self):
+        """Fusiona bloques libres adyacentes"""
+        i = 0
+        while i < len(self._pids) - 1:
+            if self._pids[i] == self.LIBRE and self._pids[i + 1] == self.LIBRE:
+                self._absorber(i)
+            else:
+                i += 1
+
+    def ocupado(self):
+        return self._ocupado
+
+    def num_libres(self):
+        return self._num_libres
+
+    def mayor_libre(self):
+        """Se recalcula solo si se ocupó el hueco más grande desde la última lectura"""
+        if self._mayor_libre is None:
+            if np is not None:
+                pids = np.frombuffer(self._pids, dtype=np.int32)
+                sizes = np.frombuffer(self._sizes, dtype=np.int64)
+                libres = sizes[pids == self.LIBRE]
+                self._mayor_libre = int(libres.max()) if libres.size else 0
+            else:
+                self._mayor_libre = max((s for p, s in zip(self._pids, self._sizes) if p == self.LIBRE), default=0)
+        return self._mayor_libre
+
+    def num_bloques(self):
+        return len(self._pids)
+
+    def compactar(self, max_bloques=None):
+        """Igual que MotorLista.compactar, reconstruyendo los arrays en una pasada"""
+        pagina = self._codigos_tipo.get(TIPO_PAGINA)
+        n = len(self._pids)
+        offsets, sizes, pids, tipos = array("q"), array("q"), array("i"), array("b")
+        movimientos = []
+        hueco = movidos = 0
+        i = 0
+        while i < n:
+            p = self._pids[i]
+            if p == self.LIBRE:
+                hueco += self._sizes[i]
+                i += 1
+                continue
+            j = i + 1
+            if self._tipos[i] == pagina:
+                while j < n and self._pids[j] == p and self._tipos[j] == pagina:
+                    j += 1
+            if hueco:
+                if max_bloques is not None and movidos >= max_bloques:
+                    break
+                origen = self._offsets[i]
+                size = self._offsets[j - 1] + self._sizes[j - 1] - origen
+                movimientos.append((self._nombres_pid[p], origen, origen - hueco, size))
+                movidos += j - i
+                propios = self._propios[p]
+                for k in range(i, j):
+                    propios.discard(self._offsets[k])
+                    propios.add(self._offsets[k] - hueco)
+            for k in range(i, j):
+                offsets.append(self._offsets[k] - hueco)
+            sizes.extend(self._sizes[i:j])
+            pids.extend(self._pids[i:j])
+            tipos.extend(self._tipos[i:j])
+            i = j
+        if not movimientos:
+            return movimientos
+        offsets.append(self._offsets[i] - hueco if i < n else self.size - hueco)
+        sizes.append(hueco)
+        pids.append(self.LIBRE)
+        tipos.append(0)
+        offsets.extend(self._offsets[i:])
+        sizes.extend(self._sizes[i:])
+        pids.extend(self._pids[i:])
+        tipos.extend(self._tipos[i:])
+        self._offsets, self._sizes, self._pids, self._tipos = offsets, sizes, pids, tipos
+        self._num_libres = self._pids.count(self.LIBRE)
+        self._mayor_libre = None
+        return movimientos
+
+
+MOTORES = {
+    "lista": MotorLista,
+    "indexado": MotorIndexado,
+    "compacto": MotorCompacto,
+}
+
+
+def crear_motor(nombre, size):
+    if nombre not in MOTORES:
+        raise ValueError(f"Motor de asignación inválido: {nombre}")
+    return MOTORES[nombre](size)
@@ -0,0 +1,123 @@
+"""
+Barrido de parámetros: ejecuta muchas configuraciones independientes
+(traza x estrategia x RAM x SWAP) en un pool de procesos y reúne los
+resúmenes de calcular_eficiencia en una sola tabla.
+
+Uso:
+    python barrido.py --trazas data/procesos.json data/procesos2.json \
+        --estrategias first_fit best_fit worst_fit next_fit \
+        --ram 512 1024 2048 --swap 1024 2048 --salida barrido.csv
+"""
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from scheduler import Scheduler
+
+ESTRATEGIAS = ["first_fit", "best_fit", "worst_fit", "next_fit"]
+
+
+def configuraciones(trazas, estrategias, ram_sizes, swap_sizes, motor="lista"):
+    return [
+        {"traza": traza, "estrategia": estrategia, "ram_size": ram, "swap_size": swap, "motor": motor}
+        for traza, estrategia, ram, swap in itertools.product(trazas, estrategias, ram_sizes, swap_sizes)
+    ]
+
+
+def ejecutar_configuracion(config):
+    """Corre una simulación completa y devuelve su fila de resultados"""
+    scheduler = Scheduler(
+        motor=config["motor"],
+        ruta_procesos=config["traza"],
+        ram_size=config["ram_size"],
+        swap_size=config["swap_size"],
+        estrategia=config["estrategia"],
+        registrar_deltas=False,
+    )
+    resumen = scheduler.ejecutar_hasta_el_final(por_eventos=True)["resumen"]
+    return {**config, **fila_resumen(resumen)}
+
+
+def fila_resumen(resumen):
+    """Columnas de resultados de una simulación a partir de su resumen"""
+    return {
+        "ticks_totales": resumen["ticks_totales"],
+        "procesos_ejecutados": resumen["procesos_ejecutados"],
+        "procesos_fallidos": resumen["procesos_fallidos"],
+        **resumen["eficiencia_memoria"],
+    }
+
+
+def repartir(funcion, tareas, procesos=None, chunksize=None):
+    """
+    Aplica `funcion` a cada tarea en `procesos` workers (por defecto uno
+    por núcleo). Devuelve los resultados en el mismo orden que `tareas`.
+    """
+    procesos = procesos or os.cpu_count() or 1
+    if procesos == 1 or len(tareas) <= 1:
+        return [funcion(t) for t in tareas]
+    chunksize = chunksize or max(1, len(tareas) // (procesos * 4))
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        return list(pool.map(funcion, tareas, chunksize=chunksize))
+
+
+def ejecutar_barrido(configs, procesos=None):
+    """Reparte las configuraciones entre workers; filas en el orden de `configs`"""
+    return repartir(ejecutar_configuracion, configs, procesos)
+
+
+def a_columnas(filas):
+    """Convierte la lista de filas en un diccionario columna -> valores"""
+    columnas = list(filas[0]) if filas else []
+    return {columna: [fila[columna] for fila in filas] for columna in columnas}
+
+
+def escribir_csv(filas, f):
+    escritor = csv.DictWriter(f, fieldnames=list(filas[0]) if filas else [])
+    escritor.writeheader()
+    escritor.writerows(filas)
+
+
+def guardar(filas, ruta):
+    """Guarda la tabla como .csv, .json (columnar) o .parquet (requiere pyarrow)"""
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension == ".csv":
+        with open(ruta, "w", newline="") as f:
+            escribir_csv(filas, f)
+    elif extension == ".json":
+        with open(ruta, "w") as f:
+            json.dump(a_columnas(filas), f)
+    elif extension == ".parquet":
+        import pyarrow
+        import pyarrow.parquet
+        pyarrow.parquet.write_table(pyarrow.table(a_columnas(filas)), ruta)
+    else:
+        raise ValueError(f"Formato de salida no soportado: {ruta}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Barrido de estrategias y tamaños de memoria")
+    parser.add_argument("--trazas", nargs="+", default=["data/procesos.json"])
+    parser.add_argument("--estrategias", nargs="+", default=ESTRATEGIAS, choices=ESTRATEGIAS)
+    parser.add_argument("--ram", nargs="+", type=int, default=[1024])
+    parser.add_argument("--swap", nargs="+", type=int, default=[2048])
+    parser.add_argument("--motor", default="lista")
+    parser.add_argument("--procesos", type=int, default=None, help="workers (por defecto, uno por núcleo)")
+    parser.add_argument("--salida", default=None, help="archivo .csv, .json o .parquet")
+    args = parser.parse_args(argv)
+
+    configs = configuraciones(args.trazas, args.estrategias, args.ram, args.swap, args.motor)
+    filas = ejecutar_barrido(configs, args.procesos)
+
+    if args.salida:
+        guardar(filas, args.salida)
+    else:
+        escribir_csv(filas, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
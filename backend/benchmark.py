@@ -0,0 +1,336 @@
+"""
+Benchmarks del simulador con cargas sintéticas.
+
+Cada caso (escenario x motor x tamaño de RAM x número de procesos) corre
+una simulación completa midiendo la latencia de las operaciones calientes
+del MemoryManager y del Scheduler, el throughput de asignaciones y el pico
+de memoria (en una segunda pasada con tracemalloc, que no se cronometra),
+además de la fragmentación media: externa de la RAM e interna de las
+particiones fijas, el buddy y los slabs (los escenarios "fija", "buddy" y
+"slab" repiten la carga de "contigua" y "pequenos" para compararlos).
+Los resultados se guardan en JSON para compararlos con una línea base.
+
+Uso:
+    python benchmark.py --ram 1024 4096 --procesos 200 1000 --salida bench.json
+    python benchmark.py --salida nuevo.json --baseline bench.json --umbral 0.15
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from asignadores import MOTORES
+from scheduler import Scheduler
+
+OPERACIONES_MEMORIA = [
+    "asignar_proceso",
+    "buscar_bloque_libre",
+    "fusionar_bloques_libres",
+    "swap_inteligente",
+    "tick_procesos",
+    "obtener_estado_memoria",
+]
+ESTRATEGIAS = ["first_fit", "best_fit", "worst_fit", "next_fit"]
+PERCENTILES = [50, 90, 99]
+
+# llegadas: "poisson", "uniforme" o "rafagas"; tamanos: fracción de la RAM
+ESCENARIOS = {
+    "mixto": {
+        "llegadas": "poisson", "tamanos": "lognormal",
+        "mezcla": {"contigua": 0.6, "segmentacion": 0.2, "paginacion": 0.2},
+    },
+    "contigua": {
+        "llegadas": "uniforme", "tamanos": "uniforme",
+        "mezcla": {"contigua": 1.0},
+    },
+    "rafagas": {
+        "llegadas": "rafagas", "tamanos": "bimodal",
+        "mezcla": {"contigua": 0.5, "segmentacion": 0.25, "paginacion": 0.25},
+    },
+    "fragmentacion": {
+        "llegadas": "uniforme", "tamanos": "fragmentacion",
+        "mezcla": {"contigua": 1.0},
+    },
+    # Misma carga que "contigua" con el sistema buddy
+    "buddy": {
+        "llegadas": "uniforme", "tamanos": "uniforme",
+        "mezcla": {"buddy": 1.0},
+    },
+    # Procesos chicos y frecuentes: slab frente a particiones variables
+    "pequenos": {
+        "llegadas": "poisson", "tamanos": "pequenos",
+        "mezcla": {"contigua": 1.0},
+    },
+    "slab": {
+        "llegadas": "poisson", "tamanos": "pequenos",
+        "mezcla": {"slab": 1.0},
+    },
+    # Misma carga que "contigua" en particiones fijas (fracciones de la RAM)
+    "fija": {
+        "llegadas": "uniforme", "tamanos": "uniforme",
+        "mezcla": {"contigua": 1.0}, "asignacion": "fija",
+        "particiones": [1 / 4, 1 / 4, 1 / 8, 1 / 8, 1 / 16, 1 / 16, 1 / 16, 1 / 16],
+    },
+}
+
+
+def _tamano(r, distribucion, ram_size, i):
+    """Tamaño de un proceso; nunca mayor que media RAM para que todos quepan alguna vez"""
+    maximo = max(1, ram_size // 2)
+    if distribucion == "uniforme":
+        size = r.randint(1, maximo // 2)
+    elif distribucion == "lognormal":
+        size = int(r.lognormvariate(0, 1) * ram_size / 32)
+    elif distribucion == "bimodal":
+        size = r.randint(1, ram_size // 64) if r.random() < 0.8 else r.randint(maximo // 4, maximo)
+    elif distribucion == "pequenos":
+        size = r.randint(1, max(1, ram_size // 16))
+    elif distribucion == "fragmentacion":
+        # Alternan chicos de vida larga y grandes de vida corta: dejan huecos
+        size = r.randint(1, ram_size // 64) if i % 2 == 0 else r.randint(maximo // 4, maximo // 2)
+    else:
+        raise ValueError(f"Distribución de tamaños desconocida: {distribucion}")
+    return min(max(size, 1), maximo)
+
+
+def _llegadas(r, distribucion, n):
+    tiempo = 0
+    for i in range(n):
+        if distribucion == "poisson":
+            tiempo += int(r.expovariate(1.0))
+        elif distribucion == "uniforme":
+            tiempo += r.randint(0, 2)
+        elif distribucion == "rafagas":
+            tiempo += r.randint(20, 40) if i % 25 == 0 else 0
+        else:
+            raise ValueError(f"Distribución de llegadas desconocida: {distribucion}")
+        yield tiempo
+
+
+def generar_procesos(n, ram_size, llegadas="poisson", tamanos="lognormal", mezcla=None, semilla=0,
+                     asignacion="variable"):
+    """Traza sintética de n procesos ordenada por tiempo_llegada"""
+    r = random.Random(semilla)
+    mezcla = mezcla or {"contigua": 1.0}
+    modos, pesos = list(mezcla), list(mezcla.values())
+    procesos = []
+    for i, llegada in enumerate(_llegadas(r, llegadas, n)):
+        size = _tamano(r, tamanos, ram_size, i)
+        mode = r.choices(modos, pesos)[0]
+        proceso = {
+            "pid": f"P{i + 1}",
+            "size": size,
+            "priority": r.randint(1, 5),
+            "mode": mode,
+            "tiempo_llegada": llegada,
+            "tiempo_ejecucion": r.randint(40, 80) if tamanos == "fragmentacion" and i % 2 == 0 else r.randint(2, 20),
+            "tiempo_cpu": r.randint(1, 5),
+        }
+        if mode == "contigua":
+            proceso["asignacion"] = asignacion
+            proceso["estrategia"] = r.choice(ESTRATEGIAS)
+        elif mode == "segmentacion":
+            partes = min(size, r.randint(2, 4))
+            cortes = sorted(r.sample(range(1, size), partes - 1)) if partes > 1 else []
+            proceso["segmentos"] = [b - a for a, b in zip([0] + cortes, cortes + [size])]
+        procesos.append(proceso)
+    return procesos
+
+
+def percentiles(muestras):
+    """Resumen de latencias en microsegundos (percentil por rango más cercano)"""
+    if not muestras:
+        return {"n": 0}
+    ordenadas = sorted(muestras)
+    resumen = {"n": len(ordenadas), "media_us": sum(ordenadas) / len(ordenadas) / 1000}
+    for p in PERCENTILES:
+        indice = min(len(ordenadas) - 1, max(0, -(-p * len(ordenadas) // 100) - 1))
+        resumen[f"p{p}_us"] = ordenadas[indice] / 1000
+    resumen["max_us"] = ordenadas[-1] / 1000
+    return resumen
+
+
+def _cronometrar(objeto, nombre, muestras):
+    """Reemplaza objeto.nombre por una versión que anota su duración en ns"""
+    original = getattr(objeto, nombre)
+
+    def medido(*args, **kwargs):
+        inicio = time.perf_counter_ns()
+        try:
+            return original(*args, **kwargs)
+        finally:
+            muestras.append(time.perf_counter_ns() - inicio)
+
+    setattr(objeto, nombre, medido)
+
+
+def _simular(scheduler, max_ticks, fragmentacion=None):
+    # Como la interfaz: un tick y una consulta de estado por paso
+    mm = scheduler.memory_manager
+    while not scheduler.finished and scheduler.current_tick < max_ticks:
+        scheduler.tick()
+        estado = mm.obtener_estado_memoria()
+        if fragmentacion is not None:
+            fragmentacion["externa"].append(estado["ram"]["fragmentacion_externa"])
+            # Interna: lo que particiones, buddy y slabs entregan de más sobre lo pedido
+            asignados = mm.buddy.kb_asignados + mm.slab.kb_asignados
+            solicitados = mm.buddy.kb_solicitados + mm.slab.kb_solicitados
+            if mm.particiones is not None:
+                asignados += mm.particiones.kb_asignados
+                solicitados += mm.particiones.kb_solicitados
+            if asignados:
+                fragmentacion["interna"].append(1 - solicitados / asignados)
+
+
+def _media(valores):
+    return sum(valores) / len(valores) if valores else None
+
+
+def ejecutar_caso(escenario, motor, ram_size, n_procesos, semilla=0, max_ticks=20000, medir_memoria=True):
+    """Corre un caso y devuelve su fila de resultados"""
+    config = ESCENARIOS[escenario]
+    procesos = generar_procesos(n_procesos, ram_size, config["llegadas"], config["tamanos"],
+                                config["mezcla"], semilla, config.get("asignacion", "variable"))
+    particiones = config.get("particiones")
+    if particiones is not None:
+        particiones = [int(fraccion * ram_size) for fraccion in particiones]
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "procesos.json")
+        with open(ruta, "w") as f:
+            json.dump(procesos, f)
+
+        def nuevo_scheduler():
+            return Scheduler(motor=motor, ruta_procesos=ruta, ram_size=ram_size,
+                             swap_size=ram_size * 2, registrar_deltas=False, particiones=particiones)
+
+        scheduler = nuevo_scheduler()
+        muestras = {nombre: [] for nombre in OPERACIONES_MEMORIA + ["tick"]}
+        for nombre in OPERACIONES_MEMORIA:
+            _cronometrar(scheduler.memory_manager, nombre, muestras[nombre])
+        _cronometrar(scheduler, "tick", muestras["tick"])
+
+        fragmentacion = {"externa": [], "interna": []}
+        inicio = time.perf_counter()
+        _simular(scheduler, max_ticks, fragmentacion)
+        duracion = time.perf_counter() - inicio
+
+        pico = None
+        if medir_memoria:
+            tracemalloc.start()
+            try:
+                _simular(nuevo_scheduler(), max_ticks)
+                pico = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+    asignaciones = scheduler.estadisticas["procesos_ejecutados"] + len(scheduler.memory_manager.procesos_activos)
+    return {
+        "escenario": escenario,
+        "motor": motor,
+        "ram_size": ram_size,
+        "procesos": n_procesos,
+        "ticks": scheduler.current_tick,
+        "terminado": scheduler.finished,
+        "duracion_s": duracion,
+        "asignaciones_por_s": asignaciones / duracion if duracion > 0 else None,
+        "pico_memoria_bytes": pico,
+        "fragmentacion_externa_media": _media(fragmentacion["externa"]),
+        "fragmentacion_interna_media": _media(fragmentacion["interna"]),
+        "operaciones": {nombre: percentiles(m) for nombre, m in muestras.items()},
+    }
+
+
+def ejecutar_benchmark(escenarios, motores, ram_sizes, n_procesos, semilla=0, max_ticks=20000, medir_memoria=True):
+    resultados = []
+    for escenario in escenarios:
+        for motor in motores:
+            for ram_size in ram_sizes:
+                for n in n_procesos:
+                    resultados.append(ejecutar_caso(escenario, motor, ram_size, n, semilla, max_ticks, medir_memoria))
+    return {
+        "meta": {
+            "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "semilla": semilla,
+        },
+        "resultados": resultados,
+    }
+
+
+def _clave(fila):
+    return fila["escenario"], fila["motor"], fila["ram_size"], fila["procesos"]
+
+
+def comparar(actual, base, umbral=0.10):
+    """
+    Compara dos ejecuciones caso por caso. Devuelve las regresiones: p50/p99
+    de una operación que empeoró más que `umbral` (proporción), throughput
+    que bajó o pico de memoria que subió en la misma proporción.
+    """
+    base_por_clave = {_clave(f): f for f in base["resultados"]}
+    regresiones = []
+    for fila in actual["resultados"]:
+        anterior = base_por_clave.get(_clave(fila))
+        if anterior is None:
+            continue
+        metricas = []
+        for nombre, resumen in fila["operaciones"].items():
+            previo = anterior["operaciones"].get(nombre, {})
+            for campo in ("p50_us", "p99_us"):
+                if resumen.get(campo) is not None and previo.get(campo):
+                    metricas.append((f"{nombre}.{campo}", previo[campo], resumen[campo], True))
+        metricas.append(("asignaciones_por_s", anterior["asignaciones_por_s"], fila["asignaciones_por_s"], False))
+        metricas.append(("pico_memoria_bytes", anterior["pico_memoria_bytes"], fila["pico_memoria_bytes"], True))
+
+        for metrica, antes, ahora, menor_es_mejor in metricas:
+            if not antes or ahora is None:
+                continue
+            cambio = (ahora - antes) / antes
+            if (cambio if menor_es_mejor else -cambio) > umbral:
+                regresiones.append({"caso": list(_clave(fila)), "metrica": metrica,
+                                    "base": antes, "actual": ahora, "cambio": cambio})
+    return regresiones
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks del simulador con cargas sintéticas")
+    parser.add_argument("--escenarios", nargs="+", default=list(ESCENARIOS), choices=list(ESCENARIOS))
+    parser.add_argument("--motores", nargs="+", default=["lista"], choices=sorted(MOTORES))
+    parser.add_argument("--ram", nargs="+", type=int, default=[1024, 4096])
+    parser.add_argument("--procesos", nargs="+", type=int, default=[200, 1000])
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--max-ticks", type=int, default=20000)
+    parser.add_argument("--sin-memoria", action="store_true", help="omitir la pasada con tracemalloc")
+    parser.add_argument("--salida", default=None, help="archivo JSON de resultados")
+    parser.add_argument("--baseline", default=None, help="JSON de una ejecución anterior para comparar")
+    parser.add_argument("--umbral", type=float, default=0.10, help="empeoramiento tolerado (0.10 = 10%%)")
+    args = parser.parse_args(argv)
+
+    resultados = ejecutar_benchmark(args.escenarios, args.motores, args.ram, args.procesos,
+                                    args.semilla, args.max_ticks, not args.sin_memoria)
+    if args.salida:
+        with open(args.salida, "w") as f:
+            json.dump(resultados, f, indent=2)
+    else:
+        json.dump(resultados, sys.stdout, indent=2)
+        print()
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            base = json.load(f)
+        regresiones = comparar(resultados, base, args.umbral)
+        for r in regresiones:
+            print(f"REGRESIÓN {'/'.join(map(str, r['caso']))} {r['metrica']}: "
+                  f"{r['base']:.4g} -> {r['actual']:.4g} ({r['cambio']:+.1%})", file=sys.stderr)
+        return 1 if regresiones else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+"""
+Sistema buddy binario para el modo de asignación "buddy".
+
+Cada arena es un bloque de 2^K KB reservado de la RAM con el motor de
+asignación. Dentro de ella todos los bloques son potencias de dos: pedir
+`size` KB toma un bloque del orden justo, partiendo uno mayor las veces
+necesarias, y liberarlo lo fusiona con su buddy mientras este esté libre.
+Las listas de libres son conjuntos de direcciones por orden, así que
+partir y fusionar cuestan O(log n) pasos. Una arena que vuelve a quedar
+libre entera se devuelve a la RAM.
+
+Buscar lugar también es logarítmico: cada orden tiene un montículo de
+direcciones libres (la menor sale primero) y, para cada orden, un
+montículo de las arenas con algún libre de ese orden, por número de
+arena. Ambos usan borrado perezoso: una entrada que ya no vale se
+descarta al llegar a la cima.
+
+Las direcciones son relativas a la arena: compactar la RAM no las cambia.
+"""
+from heapq import heappop, heappush
+
+MINIMO = 8           # KB del bloque más chico
+TAMANO_ARENA = 256   # KB de una arena nueva (más si el proceso no cabe)
+
+
+class _Arena:
+    __slots__ = ("numero", "orden", "libres", "ocupados", "_monticulos")
+
+    def __init__(self, numero, orden):
+        self.numero = numero
+        self.orden = orden
+        self.libres = {orden: {0}}       # orden -> direcciones libres
+        self.ocupados = {}               # dirección -> (pid, orden)
+        self._monticulos = {orden: [0]}  # orden -> direcciones libres (con entradas obsoletas)
+
+    def agregar_libre(self, orden, direccion):
+        """Marca libre el bloque; True si el orden no tenía otro libre"""
+        libres = self.libres.setdefault(orden, set())
+        primero = not libres
+        libres.add(direccion)
+        monticulo = self._monticulos.setdefault(orden, [])
+        heappush(monticulo, direccion)
+        if len(monticulo) > 2 * len(libres) + 16:
+            monticulo[:] = sorted(libres)
+        return primero
+
+    def sacar_menor(self, orden):
+        """Quita y devuelve la menor dirección libre del orden"""
+        libres = self.libres[orden]
+        monticulo = self._monticulos[orden]
+        while True:
+            direccion = heappop(monticulo)
+            if direccion in libres:
+                libres.discard(direccion)
+                return direccion
+
+
+class SistemaBuddy:
+    def __init__(self, minimo=MINIMO, tamano_arena=TAMANO_ARENA):
+        if minimo & (minimo - 1) or tamano_arena & (tamano_arena - 1):
+            raise ValueError("minimo y tamano_arena deben ser potencias de dos")
+        self.minimo = minimo
+        self.tamano_arena = tamano_arena
+        self.reset()
+
+    def reset(self):
+        self.arenas = {}        # marca del bloque en la RAM -> _Arena
+        self._con_libres = {}   # orden -> montículo (número, marca) de arenas con libres de ese orden
+        self._asignados = {}    # pid -> (marca, dirección, orden, size pedido)
+        self._numeradas = 0
+        self.asignaciones = 0
+        self.kb_reservados = 0
+        self.kb_asignados = 0
+        self.kb_solicitados = 0
+
+    def orden(self, size):
+        return (max(size, self.minimo) - 1).bit_length()
+
+    def tamano_nueva_arena(self, size):
+        return max(self.tamano_arena, 1 << self.orden(size))
+
+    def agregar_arena(self, tamano):
+        """Registra una arena de `tamano` KB y devuelve la marca con que se reservó en la RAM"""
+        self._numeradas += 1
+        marca = f"[buddy {self._numeradas}]"
+        arena = self.arenas[marca] = _Arena(self._numeradas, tamano.bit_length() - 1)
+        self._avisar_libre(arena.orden, marca)
+        self.kb_reservados += tamano
+        return marca
+
+    def _avisar_libre(self, orden, marca):
+        """La arena pasó a tener algún libre del orden"""
+        monticulo = self._con_libres.setdefault(orden, [])
+        heappush(monticulo, (self.arenas[marca].numero, marca))
+        if len(monticulo) > 2 * len(self.arenas) + 16:
+            monticulo[:] = sorted((arena.numero, m) for m, arena in self.arenas.items() if arena.libres.get(orden))
+
+    def _primera_arena(self, orden):
+        """Marca de la primera arena (la más antigua) con un libre de orden >= `orden`, o None"""
+        mejor = None
+        for mayor, monticulo in self._con_libres.items():
+            if mayor < orden:
+                continue
+            while monticulo:
+                arena = self.arenas.get(monticulo[0][1])
+                if arena is not None and arena.libres.get(mayor):
+                    break
+                heappop(monticulo)  # arena devuelta o sin libres de ese orden
+            if monticulo and (mejor is None or monticulo[0] < mejor):
+                mejor = monticulo[0]
+        return mejor[1] if mejor is not None else None
+
+    def cabe(self, size):
+        """True si alguna arena tiene un bloque libre suficiente"""
+        return self._primera_arena(self.orden(size)) is not None
+
+    def asignar(self, pid, size):
+        """Asigna en la primera arena con un bloque libre suficiente; False si ninguna tiene"""
+        orden = self.orden(size)
+        marca = self._primera_arena(orden)
+        if marca is None:
+            return False
+        arena = self.arenas[marca]
+        mayor = next(m for m in range(orden, arena.orden + 1) if arena.libres.get(m))
+        direccion = arena.sacar_menor(mayor)
+        # Partir: la mitad alta de cada división queda libre
+        while mayor > orden:
+            mayor -= 1
+            if arena.agregar_libre(mayor, direccion + (1 << mayor)):
+                self._avisar_libre(mayor, marca)
+        arena.ocupados[direccion] = (pid, orden)
+        self._asignados[pid] = (marca, direccion, orden, size)
+        self.asignaciones += 1
+        self.kb_asignados += 1 << orden
+        self.kb_solicitados += size
+        return True
+
+    def liberar(self, pid):
+        """Libera el bloque del proceso; devuelve la marca de su arena si quedó vacía (y la descarta)"""
+        asignado = self._asignados.pop(pid, None)
+        if asignado is None:
+            return None
+        marca, direccion, orden, size = asignado
+        arena = self.arenas[marca]
+        del arena.ocupados[direccion]
+        self.kb_asignados -= 1 << orden
+        self.kb_solicitados -= size
+        # Fusionar con el buddy mientras esté libre
+        while orden < arena.orden:
+            buddy = direccion ^ (1 << orden)
+            libres = arena.libres.get(orden)
+            if not libres or buddy not in libres:
+                break
+            libres.discard(buddy)
+            direccion = min(direccion, buddy)
+            orden += 1
+        if orden == arena.orden:
+            del self.arenas[marca]
+            self.kb_reservados -= 1 << orden
+            return marca
+        if arena.agregar_libre(orden, direccion):
+            self._avisar_libre(orden, marca)
+        return None
+
+    def tamano(self, pid):
+        """KB que ocupa el proceso (su bloque entero), o None si no está en el buddy"""
+        asignado = self._asignados.get(pid)
+        return 1 << asignado[2] if asignado is not None else None
+
+    def bloques_arena(self, marca):
+        """Bloques de la arena en orden de dirección, con el formato de la vista de RAM"""
+        arena = self.arenas[marca]
+        bloques = [(d, {"pid": pid, "size": 1 << orden, "tipo": "buddy"})
+                   for d, (pid, orden) in arena.ocupados.items()]
+        bloques.extend((d, {"pid": None, "size": 1 << orden, "tipo": "buddy_libre"})
+                       for orden, libres in arena.libres.items() for d in libres)
+        bloques.sort(key=lambda par: par[0])
+        return [bloque for _, bloque in bloques]
+
+    def estadisticas(self):
+        libres_por_orden = {}
+        for arena in self.arenas.values():
+            for orden, libres in arena.libres.items():
+                if libres:
+                    libres_por_orden[1 << orden] = libres_por_orden.get(1 << orden, 0) + len(libres)
+        return {
+            "arenas": len(self.arenas),
+            "kb_reservados": self.kb_reservados,
+            "kb_asignados": self.kb_asignados,
+            "kb_solicitados": self.kb_solicitados,
+            "fragmentacion_interna": 1 - self.kb_solicitados / self.kb_asignados if self.kb_asignados else 0.0,
+            "libres_por_tamano": dict(sorted(libres_por_orden.items())),
+        }
@@ -0,0 +1,109 @@
+"""
+Checkpoints del estado completo de una simulación.
+
+Un checkpoint es un blob binario (pickle comprimido con zlib) con el
+MemoryManager (bloques de RAM/SWAP, procesos activos, LRU, tablas de
+páginas) y las colas del Scheduler. De la traza solo se guarda cuántos
+procesos ya llegaron y, en .jsonl/.csv, los leídos por adelantado y la
+posición en bytes donde sigue el archivo: restaurar cuesta lo mismo en
+cualquier punto de la traza.
+
+Con un HistorialCheckpoints, Scheduler.ir_a_tick(t) restaura el checkpoint
+más cercano anterior a t y avanza solo desde ahí.
+"""
+import bisect
+import pickle
+import zlib
+
+from trazas import ColaLlegadas
+
+NIVEL_COMPRESION = 1  # prima la velocidad: los checkpoints se toman en caliente
+
+
+def capturar(scheduler):
+    """Serializa el estado de la simulación en un blob binario"""
+    estado = {
+        "tick": scheduler.current_tick,
+        "memory_manager": scheduler.memory_manager,
+        "llegadas": scheduler.procesos_pendientes.estado(),
+        "procesos_terminados": scheduler.procesos_terminados,
+        "procesos_en_espera": scheduler.procesos_en_espera,
+        "finished": scheduler.finished,
+        "agenda_fines": scheduler.agenda_fines,
+        "espera_estable": scheduler.espera_estable,
+        "estadisticas": scheduler.estadisticas,
+    }
+    return zlib.compress(pickle.dumps(estado, pickle.HIGHEST_PROTOCOL), NIVEL_COMPRESION)
+
+
+def restaurar(scheduler, datos):
+    """Deja `scheduler` exactamente en el estado capturado en `datos`"""
+    estado = pickle.loads(zlib.decompress(datos))
+    scheduler.current_tick = estado["tick"]
+    scheduler.memory_manager = estado["memory_manager"]
+    scheduler.memory_manager.metricas = scheduler.metricas
+    scheduler.procesos_pendientes = ColaLlegadas(scheduler.traza, estado["llegadas"])
+    scheduler.procesos_terminados = estado["procesos_terminados"]
+    scheduler.procesos_en_espera = estado["procesos_en_espera"]
+    scheduler.finished = estado["finished"]
+    scheduler.agenda_fines = estado["agenda_fines"]
+    scheduler.espera_estable = estado["espera_estable"]
+    scheduler.estadisticas = estado["estadisticas"]
+    if scheduler.deltas is not None:
+        scheduler.deltas.reset(scheduler.memory_manager)
+
+
+class HistorialCheckpoints:
+    """
+    Checkpoints tomados cada `intervalo` ticks. Con max_checkpoints se
+    descartan los intermedios de a uno sí, uno no (duplicando el intervalo)
+    para que la memoria quede acotada en simulaciones largas.
+    """
+
+    def __init__(self, intervalo=100, max_checkpoints=None):
+        self.intervalo_inicial = intervalo
+        self.intervalo = intervalo
+        self.max_checkpoints = max_checkpoints
+        self._ticks = []
+        self._datos = {}
+
+    def __len__(self):
+        return len(self._ticks)
+
+    def ticks(self):
+        return list(self._ticks)
+
+    def bytes_totales(self):
+        return sum(len(d) for d in self._datos.values())
+
+    def limpiar(self):
+        self.intervalo = self.intervalo_inicial
+        self._ticks = []
+        self._datos = {}
+
+    def pendiente(self, tick):
+        """True si desde el último checkpoint pasaron al menos `intervalo` ticks"""
+        return not self._ticks or tick - self._ticks[-1] >= self.intervalo
+
+    def guardar(self, scheduler):
+        tick = scheduler.current_tick
+        if tick not in self._datos:
+            bisect.insort(self._ticks, tick)
+        self._datos[tick] = capturar(scheduler)
+        if self.max_checkpoints is not None and len(self._ticks) > self.max_checkpoints:
+            self._ralear()
+
+    def _ralear(self):
+        # Conserva el primero y el último
+        conservar = set(self._ticks[::2]) | {self._ticks[-1]}
+        self._ticks = [t for t in self._ticks if t in conservar]
+        self._datos = {t: self._datos[t] for t in self._ticks}
+        self.intervalo *= 2
+
+    def anterior(self, tick):
+        """(tick, datos) del checkpoint más cercano en o antes de `tick`; None si no hay"""
+        i = bisect.bisect_right(self._ticks, tick)
+        if i == 0:
+            return None
+        encontrado = self._ticks[i - 1]
+        return encontrado, self._datos[encontrado]
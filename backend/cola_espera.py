@@ -0,0 +1,140 @@
+"""
+Cola de espera de admisión.
+
+Los procesos que no cupieron esperan indexados por prioridad y por los KB
+libres que necesitan como mínimo (MemoryManager.requisito_admision). En
+cada tick solo se reintentan los que ahora pueden entrar: los que tienen a
+quién expulsar con el swap inteligente, los que caben en la RAM libre y
+los que dependen del buddy, los slabs o las particiones (esos se revisan
+uno por uno con MemoryManager.admisible). Un reintento omitido habría
+fallado sin cambiar nada, así que la simulación no cambia; lo que cambia
+es el costo de la pasada, que ya no crece con el largo de la cola.
+
+Políticas (orden en que se reintentan dentro de una pasada):
+- "fifo": orden de llegada a la cola (el comportamiento original)
+- "prioridad": prioridad más alta primero (número menor)
+- "mas_corto": el de menor tamaño primero
+
+Con `envejecimiento`, cada tantos ticks de espera un proceso sube un
+nivel de prioridad ("prioridad") o cuenta como de la mitad de tamaño
+("mas_corto"), para que los de abajo no esperen para siempre. El
+envejecimiento solo cambia el orden de los reintentos, no la prioridad
+con que el proceso entra a la RAM.
+"""
+from bisect import bisect_left, bisect_right, insort
+from heapq import heappop, heappush
+
+POLITICAS = ("fifo", "prioridad", "mas_corto")
+
+
+class _Espera:
+    __slots__ = ("orden", "proceso", "requisito", "llegada")
+
+    def __init__(self, orden, proceso, requisito, llegada):
+        self.orden = orden
+        self.proceso = proceso
+        self.requisito = requisito  # KB libres mínimos, o None
+        self.llegada = llegada      # tick en que entró a la cola
+
+
+class ColaEspera:
+    def __init__(self, politica="fifo", envejecimiento=None):
+        if politica not in POLITICAS:
+            raise ValueError(f"Política de espera desconocida: {politica}")
+        if envejecimiento is not None and envejecimiento <= 0:
+            raise ValueError("envejecimiento debe ser positivo")
+        self.politica = politica
+        self.envejecimiento = envejecimiento
+        self._entradas = {}       # orden -> _Espera, en orden de llegada
+        self._por_pid = {}        # pid -> orden
+        self._por_prioridad = {}  # priority -> lista ordenada de (requisito, orden)
+        self._especiales = set()  # órdenes sin requisito
+        self._contador = 0
+        self.estadisticas = {"reintentos": 0, "omitidos": 0}
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def __bool__(self):
+        return bool(self._entradas)
+
+    def __iter__(self):
+        """Procesos en orden de llegada a la cola"""
+        return (entrada.proceso for entrada in self._entradas.values())
+
+    def agregar(self, proceso, requisito, tick):
+        self._contador += 1
+        entrada = _Espera(self._contador, proceso, requisito, tick)
+        self._entradas[entrada.orden] = entrada
+        self._por_pid[proceso["pid"]] = entrada.orden
+        if requisito is None:
+            self._especiales.add(entrada.orden)
+        else:
+            insort(self._por_prioridad.setdefault(proceso.get("priority", 1), []), (requisito, entrada.orden))
+
+    def quitar(self, proceso):
+        entrada = self._entradas.pop(self._por_pid.pop(proceso["pid"]))
+        if entrada.requisito is None:
+            self._especiales.discard(entrada.orden)
+            return
+        priority = proceso.get("priority", 1)
+        lista = self._por_prioridad[priority]
+        # La lista está ordenada: se ubica por búsqueda binaria en vez de recorrerla
+        del lista[bisect_left(lista, (entrada.requisito, entrada.orden))]
+        if not lista:
+            del self._por_prioridad[priority]
+
+    def _candidatos(self, memory_manager):
+        """Órdenes de las entradas que podrían entrar con el estado actual de la memoria"""
+        libre = memory_manager.ram_size - memory_manager.motor_ram.ocupado()
+        expulsable = memory_manager.prioridad_expulsable()
+        for priority, lista in self._por_prioridad.items():
+            if expulsable is not None and priority <= expulsable:
+                yield from (orden for _, orden in lista)
+            else:
+                yield from (orden for _, orden in lista[:bisect_right(lista, (libre, float("inf")))])
+        yield from self._especiales
+
+    def _clave(self, entrada, tick):
+        if self.politica == "fifo":
+            return entrada.orden
+        niveles = (tick - entrada.llegada) // self.envejecimiento if self.envejecimiento else 0
+        if self.politica == "prioridad":
+            return (entrada.proceso.get("priority", 1) - niveles, entrada.orden)
+        return (entrada.proceso["size"] >> niveles, entrada.orden)
+
+    def pasada(self, memory_manager, tick):
+        """
+        Genera, en el orden de la política, los procesos que vale la pena
+        reintentar ahora. El que se logre asignar debe sacarse con quitar().
+        Si un reintento cambia la memoria se buscan candidatos nuevos, pero
+        solo entre los que todavía no tuvieron su turno en esta pasada.
+        """
+        total = len(self._entradas)
+        intentados = 0
+        monticulo = []
+        vistos = set()
+        turno = None
+
+        def sumar_candidatos():
+            for orden in self._candidatos(memory_manager):
+                if orden not in vistos:
+                    clave = self._clave(self._entradas[orden], tick)
+                    if turno is None or clave > turno:
+                        vistos.add(orden)
+                        heappush(monticulo, (clave, orden))
+
+        sumar_candidatos()
+        version = memory_manager.version
+        while monticulo:
+            turno, orden = heappop(monticulo)
+            entrada = self._entradas.get(orden)
+            if entrada is None or not memory_manager.admisible(entrada.proceso):
+                continue
+            intentados += 1
+            yield entrada.proceso
+            if memory_manager.version != version:
+                version = memory_manager.version
+                sumar_candidatos()
+        self.estadisticas["reintentos"] += intentados
+        self.estadisticas["omitidos"] += total - intentados
@@ -0,0 +1,59 @@
+"""
+Compactación de la RAM contra la fragmentación externa.
+
+Compactar desliza los bloques ocupados hacia el inicio de la RAM para que
+los huecos formen uno solo (ver compactar() en asignadores.py). Políticas:
+
+- "nunca": no se compacta.
+- "al_fallar": si una asignación no cabe pero la RAM libre alcanza, se
+  compacta todo y se reintenta antes de recurrir al swap inteligente.
+- "umbral": además, al final de cada tick se compacta todo si la
+  fragmentación externa supera `umbral`.
+- "incremental": además, en cada tick se mueven como mucho
+  `bloques_por_tick` bloques, repartiendo el costo en el tiempo.
+
+Costo: cada tramo movido cuesta costo_kb por KB más costo_tramo fijo, en
+unidades arbitrarias de CPU. swaps_evitados cuenta las asignaciones que
+solo entraron gracias a compactar y que si no habrían pasado por el swap
+inteligente: contrastarlo con el costo indica si compactar compensa.
+"""
+
+POLITICAS = ("nunca", "al_fallar", "umbral", "incremental")
+
+
+class Compactador:
+    def __init__(self, politica="al_fallar", umbral=0.5, bloques_por_tick=8, costo_kb=1.0, costo_tramo=0.0):
+        """
+        umbral: fragmentación externa (0 a 1) a partir de la cual compacta "umbral"
+        bloques_por_tick: bloques movidos por tick con "incremental"
+        """
+        if politica not in POLITICAS:
+            raise ValueError(f"Política de compactación inválida: {politica}")
+        self.politica = politica
+        self.umbral = umbral
+        self.bloques_por_tick = bloques_por_tick
+        self.costo_kb = costo_kb
+        self.costo_tramo = costo_tramo
+        self.reset()
+
+    def reset(self):
+        self.pendiente = False  # "incremental": el último paso movió bloques, puede quedar trabajo
+        self.version = None     # versión de la memoria tras el último paso incremental
+        self.estadisticas = {
+            "compactaciones": 0,
+            "pasos_incrementales": 0,
+            "tramos_movidos": 0,
+            "kb_movidos": 0,
+            "costo": 0.0,
+            "swaps_evitados": 0,
+        }
+
+    def registrar(self, movimientos, incremental=False):
+        """Acumula el costo de una compactación y devuelve los KB movidos"""
+        kb = sum(size for _, _, _, size in movimientos)
+        estadisticas = self.estadisticas
+        estadisticas["pasos_incrementales" if incremental else "compactaciones"] += 1
+        estadisticas["tramos_movidos"] += len(movimientos)
+        estadisticas["kb_movidos"] += kb
+        estadisticas["costo"] += kb * self.costo_kb + len(movimientos) * self.costo_tramo
+        return kb
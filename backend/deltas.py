@@ -0,0 +1,89 @@
+"""
+Cambios incrementales de los bloques de RAM y SWAP entre ticks.
+
+Cada tick avanza la secuencia. Un cliente que conoce el estado de la
+secuencia S recibe, por región, el único tramo que cambió desde entonces
+(prefijo y sufijo comunes fuera): {"desde": i, "hasta": j, "bloques":
+[...]}, que se aplica como bloques[i:j] = nuevos. Si S no es una
+secuencia entregada hace poco ni la memoria siguió igual, recibe el
+estado completo.
+"""
+from collections import OrderedDict, deque
+
+REGIONES = ("ram", "swap")
+
+
+def tramo_cambiado(anterior, actual):
+    """(i, j, k): anterior[i:j] fue reemplazado por actual[i:k]; None si no hay cambios"""
+    limite = min(len(anterior), len(actual))
+    i = 0
+    while i < limite and anterior[i] == actual[i]:
+        i += 1
+    if i == len(anterior) == len(actual):
+        return None
+    s = 0
+    while s < limite - i and anterior[-1 - s] == actual[-1 - s]:
+        s += 1
+    return i, len(anterior) - s, len(actual) - s
+
+
+class RegistroDeltas:
+    """
+    Cada tick solo anota la versión de la memoria (O(1)): las vistas de
+    bloques se arman cuando un cliente pide cambios. Se guarda una copia de
+    las vistas de cada secuencia entregada, de modo que el próximo pedido
+    desde esa secuencia se responde con un solo tramo por región.
+    """
+
+    def __init__(self, historial=256, entregadas=8):
+        self.secuencia = 0
+        self._historial = deque(maxlen=historial)  # (secuencia, versión de la memoria)
+        self._entregadas = OrderedDict()           # secuencia -> vistas que recibió un cliente
+        self._max_entregadas = entregadas
+        self._memoria = None
+
+    def reset(self, memoria):
+        """Empieza de cero con otro MemoryManager; la secuencia sigue creciendo"""
+        self.secuencia += 1
+        self._memoria = memoria
+        self._historial.clear()
+        self._historial.append((self.secuencia, memoria.version))
+        self._entregadas.clear()
+
+    def registrar(self):
+        self.secuencia += 1
+        self._historial.append((self.secuencia, self._memoria.version))
+
+    def _version(self, secuencia):
+        """Versión de la memoria en `secuencia`, o None si ya no está en el historial"""
+        if not self._historial or not self._historial[0][0] <= secuencia <= self.secuencia:
+            return None
+        return self._historial[secuencia - self._historial[0][0]][1]
+
+    def desde(self, secuencia):
+        """Cambios que necesita un cliente que tiene el estado de `secuencia`"""
+        respuesta = {"secuencia": self.secuencia, "completo": False}
+        if self._version(secuencia) == self._memoria.version:
+            # La memoria no cambió desde entonces
+            respuesta.update(dict.fromkeys(REGIONES))
+            return respuesta
+
+        vistas = {region: [dict(b) for b in getattr(self._memoria, region)] for region in REGIONES}
+        anteriores = self._entregadas.get(secuencia) if self._version(secuencia) is not None else None
+        if anteriores is None:
+            respuesta["completo"] = True
+            respuesta.update(vistas)
+        else:
+            for region in REGIONES:
+                tramo = tramo_cambiado(anteriores[region], vistas[region])
+                if tramo is None:
+                    respuesta[region] = None
+                else:
+                    i, j, k = tramo
+                    respuesta[region] = {"desde": i, "hasta": j, "bloques": vistas[region][i:k]}
+
+        self._entregadas[self.secuencia] = vistas
+        self._entregadas.move_to_end(self.secuencia)
+        while len(self._entregadas) > self._max_entregadas:
+            self._entregadas.popitem(last=False)
+        return respuesta
@@ -0,0 +1,78 @@
+"""
+Mapa de memoria reducido a un ancho fijo para el endpoint /memory-map.
+
+En vez de mandar un elemento por bloque, el rango de direcciones [desde,
+hasta) se divide en `ancho` cubetas iguales y de cada una se informa la
+fracción ocupada y el pid que más KB ocupa en ella (con su tipo). El
+costo de dibujarlo no depende de la cantidad de bloques.
+
+IndiceBloques guarda las sumas prefijas de las direcciones de inicio y de
+los KB ocupados: la ocupación de cualquier intervalo sale de dos
+búsquedas binarias. El pid dominante se obtiene recorriendo una sola vez
+los bloques del rango, así que un mapa cuesta O(bloques en el rango +
+ancho) y no O(bloques totales x ancho).
+"""
+from bisect import bisect_right
+from itertools import accumulate
+
+
+class IndiceBloques:
+    def __init__(self, bloques):
+        # Se copian pids y tipos: con el motor "lista" los bloques son la lista viva
+        self.pids = [b["pid"] for b in bloques]
+        self.tipos = [b["tipo"] for b in bloques]
+        self.inicios = list(accumulate((b["size"] for b in bloques), initial=0))
+        self.ocupados = list(accumulate((b["size"] if b["pid"] is not None else 0 for b in bloques), initial=0))
+        self.total = self.inicios[-1]
+
+    def _bloque(self, direccion):
+        """Índice del bloque que contiene la dirección (el último si es el final)"""
+        return min(bisect_right(self.inicios, direccion) - 1, len(self.pids) - 1)
+
+    def ocupado_hasta(self, direccion):
+        """KB ocupados en [0, direccion)"""
+        if not self.pids:
+            return 0
+        i = self._bloque(direccion)
+        parcial = direccion - self.inicios[i] if self.pids[i] is not None else 0
+        return self.ocupados[i] + parcial
+
+    def mapa(self, ancho, desde=0, hasta=None):
+        """Cubetas de [desde, hasta) en columnas: ocupación (0 a 1), pid y tipo dominantes"""
+        hasta = self.total if hasta is None else hasta
+        ancho = max(1, min(ancho, hasta - desde))
+        paso = (hasta - desde) / ancho
+        ocupacion, pids, tipos = [], [], []
+        j = self._bloque(desde) if self.pids else 0
+        anterior = self.ocupado_hasta(desde)
+        for k in range(ancho):
+            inicio = desde + k * paso
+            fin = hasta if k == ancho - 1 else desde + (k + 1) * paso
+            hasta_fin = self.ocupado_hasta(fin)
+            ocupacion.append(round((hasta_fin - anterior) / (fin - inicio), 4))
+            anterior = hasta_fin
+
+            por_pid = {}  # pid -> [KB en la cubeta, tipo]
+            while j < len(self.pids) and self.inicios[j] < fin:
+                pid = self.pids[j]
+                if pid is not None:
+                    solapado = min(self.inicios[j + 1], fin) - max(self.inicios[j], inicio)
+                    por_pid.setdefault(pid, [0, self.tipos[j]])[0] += solapado
+                if self.inicios[j + 1] > fin:
+                    break  # el bloque sigue en la próxima cubeta
+                j += 1
+            if por_pid:
+                dominante = max(por_pid, key=lambda pid: por_pid[pid][0])
+                pids.append(dominante)
+                tipos.append(por_pid[dominante][1])
+            else:
+                pids.append(None)
+                tipos.append(None)
+        return {
+            "desde": desde,
+            "hasta": hasta,
+            "ancho_cubeta": paso,
+            "ocupacion": ocupacion,
+            "pid": pids,
+            "tipo": tipos,
+        }
@@ -1,24 +1,118 @@
 import copy
-from collections import deque
+import time
+from asignadores import crear_motor
+from buddy import SistemaBuddy
+from paginacion import PAGE_SIZE, TablaPaginas, paginas_para
+from particiones import TablaParticiones, tamanos_particiones
+from reemplazo import PoliticaReemplazo
+from slab import AsignadorSlab
+from zswap import MARCA as MARCA_ZSWAP
 
 class MemoryManager:
-    def __init__(self, ram_size=1024, swap_size=2048):
+    def __init__(self, ram_size=1024, swap_size=2048, motor="lista", metricas=None, swap_io=None,
+                 compactador=None, particiones=None, zswap=None):
         """
         ram_size, swap_size: tamaños totales en KB
+        motor: motor de asignación de bloques ("lista", "indexado" o "compacto")
+        metricas: instancia de metricas.Metricas para instrumentar, o None
+        swap_io: swap_io.DispositivoSwap para simular el costo de traer
+        procesos de vuelta desde SWAP, o None (salida instantánea, sin regreso)
+        compactador: compactacion.Compactador con la política de compactación
+        de la RAM, o None (no se compacta)
+        particiones: tabla de particiones fijas para asignacion "fija": una
+        cantidad de particiones iguales o una lista de tamaños (ver
+        particiones.py). Sin tabla, "fija" toma el primer hueco que alcance
+        y lo usa entero
+        zswap: zswap.PoolComprimido para guardar comprimidos en RAM a los
+        procesos expulsados antes de recurrir al SWAP, o None
         """
         self.ram_size = ram_size
         self.swap_size = swap_size
-        self.next_fit_pointer = 0  
-        self.lru_order = deque()   
+        self.motor = motor
+        self.reemplazo = PoliticaReemplazo()
         self.procesos_activos = {} 
+        self.tabla_paginas = TablaPaginas()
+        self.buddy = SistemaBuddy()
+        self.slab = AsignadorSlab()
+        self.particiones = (TablaParticiones(tamanos_particiones(particiones, ram_size))
+                            if particiones else None)
+        self.version = 0  # cambia con cada modificación de la memoria
+        self.metricas = metricas
+        self.swap_io = swap_io
+        self.compactador = compactador
+        self.zswap = zswap
         self.reset()
 
+    def __getstate__(self):
+        # Las métricas no son parte del estado de la simulación (checkpoints)
+        estado = self.__dict__.copy()
+        estado["metricas"] = None
+        return estado
+
     def reset(self):
-        self.ram = [{"pid": None, "size": self.ram_size, "tipo": "libre"}]
-        self.swap = [{"pid": None, "size": self.swap_size, "tipo": "libre"}]
-        self.next_fit_pointer = 0
-        self.lru_order.clear()
+        self.motor_ram = crear_motor(self.motor, self.ram_size)
+        self.motor_swap = crear_motor(self.motor, self.swap_size)
+        self.reemplazo.reset()
         self.procesos_activos.clear()
+        self.tabla_paginas.reset()
+        self.buddy.reset()
+        self.slab.reset()
+        if self.particiones is not None:
+            # Las particiones se reservan una tras otra desde la dirección 0
+            self.particiones.reset()
+            for marca, tamano in zip(self.particiones.marcas(), self.particiones.tamanos):
+                self.motor_ram.ocupar(self.motor_ram.buscar("first_fit", tamano), marca, tamano, "particion")
+        if self.zswap is not None:
+            self.zswap.reset()
+            idx = self.motor_ram.buscar("first_fit", self.zswap.capacidad)
+            if idx is None:
+                raise ValueError("El pool comprimido no cabe en la RAM")
+            self.motor_ram.ocupar(idx, MARCA_ZSWAP, self.zswap.capacidad, "zswap")
+        self.swaps_realizados = 0
+        self.avanzados = 0
+        self._swap_agotado = None  # (versión, prioridad) de un swap inteligente que no movió a nadie
+        if self.swap_io is not None:
+            self.swap_io.reset()
+        if self.compactador is not None:
+            self.compactador.reset()
+        self.version += 1
+
+    @property
+    def ram(self):
+        """Bloques de la RAM; particiones fijas, arenas del buddy, slabs y el pool comprimido se muestran con su contenido"""
+        bloques = self.motor_ram.bloques
+        if not self.buddy.arenas and not self.slab.slabs and self.particiones is None and self.zswap is None:
+            return bloques
+        vista = []
+        for bloque in bloques:
+            if bloque["tipo"] == "arena_buddy":
+                vista.extend(self.buddy.bloques_arena(bloque["pid"]))
+            elif bloque["tipo"] == "arena_slab":
+                vista.extend(self.slab.bloques_arena(bloque["pid"]))
+            elif bloque["tipo"] == "particion":
+                vista.append(self.particiones.bloque(bloque["pid"]))
+            elif bloque["tipo"] == "zswap":
+                vista.extend(self.zswap.bloques())
+            else:
+                vista.append(bloque)
+        return vista
+
+    @property
+    def swap(self):
+        return self.motor_swap.bloques
+
+    @property
+    def lru_order(self):
+        """PIDs del menos al más recientemente usado"""
+        return list(self.reemplazo.lru)
+
+    @property
+    def next_fit_pointer(self):
+        return self.motor_ram.next_fit_pointer
+
+    @next_fit_pointer.setter
+    def next_fit_pointer(self, valor):
+        self.motor_ram.next_fit_pointer = valor
 
     def asignar_proceso(self, proceso):
         """
@@ -29,6 +123,11 @@ class MemoryManager:
         mode = proceso.get("mode", "contigua")
         asignacion = proceso.get("asignacion", "variable")
         estrategia = proceso.get("estrategia", "first_fit")
+        metricas = self.metricas
+        if metricas is not None:
+            inicio = time.perf_counter()
+            etiqueta = estrategia if mode == "contigua" else mode
+            metricas.incrementar("simulador_asignaciones_total", estrategia=etiqueta)
         
         # Registrar proceso para tracking
         self.procesos_activos[pid] = {
@@ -37,8 +136,12 @@ class MemoryManager:
             "ubicacion": "ram",  # ram o swap
             "priority": proceso.get("priority", 1),
             "size": proceso["size"],
+            "mode": mode,
+            "asignacion": asignacion,
             "last_access": 0  # Para LRU
         }
+        if self.zswap is not None:
+            self.procesos_activos[pid]["ratio_compresion"] = proceso.get("ratio_compresion")
 
         # Intentar asignar inicialmente
         asignado = False
@@ -48,20 +151,36 @@ class MemoryManager:
             asignado = self.asignacion_segmentacion(proceso)
         elif mode == "paginacion":
             asignado = self.asignacion_paginacion(proceso)
+        elif mode == "buddy":
+            asignado = self.asignacion_buddy(proceso)
+        elif mode == "slab":
+            asignado = self.asignacion_slab(proceso)
 
-        if not asignado:
-            # Intentar swap inteligente para liberar espacio
+        puede_swap = self.swap_io is None or not self.swap_io.suspendidos
+        if not asignado and self.compactador is not None and self._compactar_para(proceso):
+            asignado = self.asignar_proceso_directo(proceso)
+            if asignado and puede_swap:
+                self.compactador.estadisticas["swaps_evitados"] += 1
+
+        if not asignado and puede_swap:
+            # Intentar swap inteligente para liberar espacio. Con E/S de swap
+            # simulada no se expulsa a nadie mientras haya procesos esperando
+            # volver de SWAP (control de carga: evita el thrashing)
             asignado = self.swap_inteligente(proceso)
 
         if not asignado:
             # Remover del tracking si no se pudo asignar
             del self.procesos_activos[pid]
+            if metricas is not None:
+                metricas.incrementar("simulador_asignaciones_fallidas_total", estrategia=etiqueta)
+                metricas.observar("simulador_asignacion_segundos", time.perf_counter() - inicio, estrategia=etiqueta)
             raise MemoryError(f"No se pudo asignar proceso {pid}: memoria llena")
 
         # Actualizar LRU
-        if pid in self.lru_order:
-            self.lru_order.remove(pid)
-        self.lru_order.append(pid)
+        self.reemplazo.tocar(pid, self.procesos_activos[pid]["priority"], self.procesos_activos[pid]["size"])
+        self.version += 1
+        if metricas is not None:
+            metricas.observar("simulador_asignacion_segundos", time.perf_counter() - inicio, estrategia=etiqueta)
 
         return True
 
@@ -69,34 +188,82 @@ class MemoryManager:
         """
         Libera toda la memoria ocupada por un proceso.
         """
-        if pid not in self.procesos_activos:
-            return False
+        return bool(self.liberar_procesos([pid]))
 
-        # Liberar de RAM
-        for bloque in self.ram:
-            if bloque["pid"] == pid:
-                bloque["pid"] = None
-                bloque["tipo"] = "libre"
-
-        # Liberar de SWAP
-        for bloque in self.swap:
-            if bloque["pid"] == pid:
-                bloque["pid"] = None
-                bloque["tipo"] = "libre"
-
-        # Fusionar bloques libres
-        self.fusionar_bloques_libres()
-        self.fusionar_bloques_libres_swap()
-        
-        # Remover del tracking
-        if pid in self.procesos_activos:
+    def liberar_procesos(self, pids):
+        """
+        Libera varios procesos a la vez: cada motor recorre sus bloques una
+        sola vez y fusiona una sola vez. Devuelve los pids liberados.
+        """
+        pids = [pid for pid in pids if pid in self.procesos_activos]
+        if not pids:
+            return []
+
+        # Liberar de RAM y SWAP (cada motor fusiona sus bloques libres)
+        if self.metricas is not None:
+            bloques = self.motor_ram.num_bloques() + self.motor_swap.num_bloques()
+        self.motor_ram.liberar_pids(pids + self._liberar_de_arenas(pids))
+        self.motor_swap.liberar_pids(pids)
+        if self.zswap is not None:
+            for pid in pids:
+                if pid in self.zswap:
+                    self.zswap.sacar(pid, descomprimir=False)
+        if self.metricas is not None:
+            # Liberar no cambia la cantidad de bloques; cada fusión la reduce en uno
+            fusiones = bloques - self.motor_ram.num_bloques() - self.motor_swap.num_bloques()
+            self.metricas.incrementar("simulador_fusiones_total", fusiones)
+        self.version += 1
+
+        for pid in pids:
+            self.tabla_paginas.liberar(pid)
+            # Remover del tracking y de LRU
             del self.procesos_activos[pid]
-        
-        # Remover de LRU
-        if pid in self.lru_order:
-            self.lru_order.remove(pid)
+            self.reemplazo.quitar(pid)
+            if self.swap_io is not None:
+                self.swap_io.olvidar(pid)
 
-        return True
+        return pids
+
+    def _liberar_de_arenas(self, pids):
+        """Libera los procesos del buddy y de los slabs; devuelve las marcas de las arenas que quedaron vacías"""
+        vacias = []
+        for pid in pids:
+            mode = self.procesos_activos[pid]["mode"]
+            if mode == "buddy":
+                marca = self.buddy.liberar(pid)
+            elif mode == "slab":
+                marca = self.slab.liberar(pid)
+            else:
+                if self.particiones is not None:
+                    self.particiones.liberar(pid)
+                continue
+            if marca is not None:
+                vacias.append(marca)
+        return vacias
+
+    def _tamano_en_ram(self, pid):
+        mode = self.procesos_activos[pid]["mode"]
+        if mode == "buddy":
+            return self.buddy.tamano(pid) or 0
+        if mode == "slab" and self.slab.tamano(pid) is not None:
+            return self.slab.tamano(pid)
+        if self.particiones is not None and self.particiones.tamano(pid) is not None:
+            return self.particiones.tamano(pid)
+        return self.motor_ram.tamano_pid(pid)
+
+    def _kb_libres_reservados(self):
+        """KB reservados para particiones, arenas buddy, slabs y el pool comprimido sin ningún proceso"""
+        libres = self.buddy.kb_reservados - self.buddy.kb_asignados
+        libres += len(self.slab.slabs) * self.slab.tamano_slab - self.slab.kb_asignados
+        if self.particiones is not None:
+            libres += self.particiones.kb_libres()
+        if self.zswap is not None:
+            libres += self.zswap.capacidad - self.zswap.ocupado
+        return libres
+
+    def bloques_proceso(self, pid):
+        """Manejadores de los bloques de un proceso en cada región"""
+        return {"ram": self.motor_ram.bloques_pid(pid), "swap": self.motor_swap.bloques_pid(pid)}
 
     def tick_procesos(self):
         """
@@ -104,15 +271,43 @@ class MemoryManager:
         Retorna lista de PIDs que terminaron.
         """
         procesos_terminados = []
+        swap_io = self.swap_io
+        self.avanzados = 0  # procesos que ejecutaron en este tick
         
-        for pid, info in list(self.procesos_activos.items()):
+        for pid, info in self.procesos_activos.items():
+            if swap_io is not None and info["ubicacion"] != "ram":
+                # Suspendido: no puede avanzar sin sus páginas
+                if info["ubicacion"] == "swap":
+                    swap_io.fallo(pid, info["size"])
+                swap_io.estadisticas["ticks_suspendidos"] += 1
+                continue
             info["tiempo_restante"] -= 1
+            self.avanzados += 1
             if info["tiempo_restante"] <= 0:
                 procesos_terminados.append(pid)
-                self.liberar_proceso(pid)
 
+        # Los que terminan juntos se liberan en un solo lote
+        self.liberar_procesos(procesos_terminados)
+
+        if swap_io is not None:
+            for pid in swap_io.avanzar():
+                self._completar_swap_in(pid)
+            for pid in self._por_urgencia(swap_io.demandados):
+                self._iniciar_swap_in(pid)
+            if self.zswap is not None and len(self.zswap):
+                # Los del pool comprimido vuelven sin E/S apenas hay lugar
+                for pid in self._por_urgencia(self.zswap.pids()):
+                    self._descomprimir(pid)
         return procesos_terminados
 
+    def avanzar_tiempo(self, ticks):
+        """
+        Descuenta `ticks` unidades a todos los procesos activos de una vez.
+        Solo es válido si ninguno termina en ese intervalo (modo por eventos).
+        """
+        for info in self.procesos_activos.values():
+            info["tiempo_restante"] -= ticks
+
     ### Asignación Contigua Mejorada ###
     def asignacion_contigua(self, proceso, asignacion, estrategia):
         size = proceso["size"]
@@ -125,121 +320,254 @@ class MemoryManager:
             return self.ocupar_bloque(idx, proceso, size, "contigua")
 
     def asignacion_fija(self, proceso, size):
-        """Asignación de bloques fijos (simulación simple)"""
-        for i, bloque in enumerate(self.ram):
-            if bloque["pid"] is None and bloque["size"] >= size:
-                # En bloques fijos, usamos todo el bloque
-                bloque["pid"] = proceso["pid"]
-                bloque["tipo"] = "contigua_fija"
-                return True
-        return False
+        """Asignación en particiones fijas (con tabla) o en el primer hueco que alcance, entero"""
+        if self.particiones is not None:
+            return self.particiones.asignar(proceso["pid"], size)
+        idx = self.motor_ram.buscar("first_fit", size)
+        if idx is None:
+            return False
+        # En bloques fijos, usamos todo el bloque
+        self.motor_ram.ocupar(idx, proceso["pid"], self.motor_ram.tamano(idx), "contigua_fija")
+        return True
 
     def buscar_bloque_libre(self, estrategia, size):
-        bloques_libres = [(i, b) for i, b in enumerate(self.ram) 
-                         if b["pid"] is None and b["size"] >= size]
-        
-        if not bloques_libres:
-            return None
-            
-        if estrategia == "first_fit":
-            return bloques_libres[0][0]
-        elif estrategia == "best_fit":
-            return min(bloques_libres, key=lambda x: x[1]["size"])[0]
-        elif estrategia == "worst_fit":
-            return max(bloques_libres, key=lambda x: x[1]["size"])[0]
-        elif estrategia == "next_fit":
-            return self.next_fit_buscar(bloques_libres, size)
-        else:
-            return bloques_libres[0][0]
-
-    def next_fit_buscar(self, bloques_libres, size):
-        """Implementación mejorada de Next Fit"""
-        # Buscar desde el puntero actual hacia adelante
-        for idx, bloque in bloques_libres:
-            if idx >= self.next_fit_pointer:
-                self.next_fit_pointer = idx
-                return idx
-        
-        # Si no encuentra, reiniciar desde el principio
-        if bloques_libres:
-            self.next_fit_pointer = bloques_libres[0][0]
-            return bloques_libres[0][0]
-        
-        return None
+        idx = self.motor_ram.buscar(estrategia, size)
+        if self.metricas is not None:
+            self.metricas.observar("simulador_bloques_examinados", self.motor_ram.examinados, estrategia=estrategia)
+        return idx
 
     def ocupar_bloque(self, idx, proceso, size, tipo):
-        bloque = self.ram[idx]
-        if bloque["size"] == size:
-            bloque["pid"] = proceso["pid"]
-            bloque["tipo"] = tipo
-        else:
-            bloque_asignado = {"pid": proceso["pid"], "size": size, "tipo": tipo}
-            bloque_libre = {"pid": None, "size": bloque["size"] - size, "tipo": "libre"}
-            self.ram[idx] = bloque_asignado
-            self.ram.insert(idx + 1, bloque_libre)
-        
-        self.fusionar_bloques_libres()
+        self.motor_ram.ocupar(idx, proceso["pid"], size, tipo)
         return True
 
     def fusionar_bloques_libres(self):
         """Fusiona bloques libres adyacentes en RAM"""
-        i = 0
-        while i < len(self.ram) - 1:
-            if self.ram[i]["pid"] is None and self.ram[i + 1]["pid"] is None:
-                self.ram[i]["size"] += self.ram[i + 1]["size"]
-                del self.ram[i + 1]
-            else:
-                i += 1
+        self.motor_ram.fusionar()
 
     def fusionar_bloques_libres_swap(self):
         """Fusiona bloques libres adyacentes en SWAP"""
-        i = 0
-        while i < len(self.swap) - 1:
-            if self.swap[i]["pid"] is None and self.swap[i + 1]["pid"] is None:
-                self.swap[i]["size"] += self.swap[i + 1]["size"]
-                del self.swap[i + 1]
-            else:
-                i += 1
+        self.motor_swap.fusionar()
+
+    ### Compactación ###
+    def _compactaria_para(self, proceso):
+        """True si _compactar_para compactaría la RAM por este proceso"""
+        if self.compactador is None or self.compactador.politica == "nunca":
+            return False
+        mode = proceso.get("mode", "contigua")
+        if mode == "contigua" and proceso.get("asignacion") == "fija" and self.particiones is not None:
+            return False  # las particiones no se mueven
+        if mode == "paginacion":
+            necesario = paginas_para(proceso["size"]) * PAGE_SIZE
+        elif mode == "buddy":
+            necesario = self.buddy.tamano_nueva_arena(proceso["size"])
+        elif mode == "slab" and self.slab.clase(proceso["size"]) is not None:
+            necesario = self.slab.tamano_slab
+        else:
+            necesario = proceso["size"]
+        ram_libre = self.ram_size - self.motor_ram.ocupado()
+        # Con un solo hueco no hay nada que juntar
+        return ram_libre >= necesario and self.motor_ram.mayor_libre() != ram_libre
+
+    def _compactar_para(self, proceso):
+        """Compacta la RAM si así entraría el proceso; False si no sirve o la política no lo permite"""
+        if not self._compactaria_para(proceso):
+            return False
+        self.compactar(motivo="fallo")
+        return True
+
+    def compactar(self, max_bloques=None, motivo="manual"):
+        """
+        Desliza los bloques ocupados de la RAM hacia el inicio (como mucho
+        max_bloques) y corrige las tablas de páginas. Devuelve los KB movidos.
+        """
+        movimientos = self.motor_ram.compactar(max_bloques)
+        if not movimientos:
+            return 0
+        for pid, origen, destino, size in movimientos:
+            self.tabla_paginas.reubicar(pid, origen, destino, size)
+        self.version += 1
+        if self.compactador is not None:
+            kb = self.compactador.registrar(movimientos, incremental=max_bloques is not None)
+        else:
+            kb = sum(size for _, _, _, size in movimientos)
+        if self.metricas is not None:
+            self.metricas.incrementar("simulador_compactaciones_total", motivo=motivo)
+            self.metricas.incrementar("simulador_compactacion_kb_total", kb)
+        return kb
+
+    def compactar_en_segundo_plano(self):
+        """Compactación de fin de tick según la política ("umbral" o "incremental"); devuelve los KB movidos"""
+        compactador = self.compactador
+        if compactador is None:
+            return 0
+        if compactador.politica == "umbral":
+            ram_libre = self.ram_size - self.motor_ram.ocupado()
+            if not ram_libre or 1 - self.motor_ram.mayor_libre() / ram_libre <= compactador.umbral:
+                return 0
+            return self.compactar(motivo="umbral")
+        if compactador.politica == "incremental":
+            # Solo si el último paso dejó trabajo o la memoria cambió desde entonces
+            if not compactador.pendiente and compactador.version == self.version:
+                return 0
+            kb = self.compactar(compactador.bloques_por_tick, motivo="incremental")
+            compactador.pendiente = kb > 0
+            compactador.version = self.version
+            return kb
+        return 0
 
     ### Asignación Segmentación ###
     def asignacion_segmentacion(self, proceso):
         segmentos = proceso.get("segmentos", [proceso["size"]])
-        segmentos_asignados = []
         
         for seg_size in segmentos:
             idx = self.buscar_bloque_libre("best_fit", seg_size)
             if idx is None:
-                # Deshacer asignaciones parciales
-                for seg_idx in segmentos_asignados:
-                    self.ram[seg_idx]["pid"] = None
-                    self.ram[seg_idx]["tipo"] = "libre"
-                self.fusionar_bloques_libres()
+                # Deshacer asignaciones parciales: el proceso es nuevo, así que
+                # sus únicos bloques en RAM son los segmentos recién ocupados
+                # (los índices guardados quedarían desfasados tras cada división)
+                self.motor_ram.liberar_pid(proceso["pid"])
                 return False
             
             self.ocupar_bloque(idx, {"pid": proceso["pid"]}, seg_size, "segmento")
-            segmentos_asignados.append(idx)
         
         return True
 
     ### Asignación Paginación ###
     def asignacion_paginacion(self, proceso):
-        PAGE_SIZE = 64
-        paginas_necesarias = (proceso["size"] + PAGE_SIZE - 1) // PAGE_SIZE
-        paginas_asignadas = []
-        
-        for _ in range(paginas_necesarias):
-            idx = self.buscar_bloque_libre("first_fit", PAGE_SIZE)
+        """Reserva todos los marcos del proceso en una sola operación"""
+        marcos = self.motor_ram.ocupar_paginas(
+            proceso["pid"], paginas_para(proceso["size"]), PAGE_SIZE, "pagina")
+        if marcos is None:
+            return False
+
+        self.tabla_paginas.registrar(proceso["pid"], marcos)
+        return True
+
+    ### Asignación Buddy y Slab ###
+    def asignacion_buddy(self, proceso):
+        pid, size = proceso["pid"], proceso["size"]
+        if self.buddy.asignar(pid, size):
+            return True
+        # Ninguna arena tiene lugar: reservar otra en la RAM
+        tamano = self.buddy.tamano_nueva_arena(size)
+        idx = self.motor_ram.buscar("first_fit", tamano)
+        if idx is None:
+            return False
+        self.motor_ram.ocupar(idx, self.buddy.agregar_arena(tamano), tamano, "arena_buddy")
+        return self.buddy.asignar(pid, size)
+
+    def asignacion_slab(self, proceso):
+        pid, size = proceso["pid"], proceso["size"]
+        clase = self.slab.clase(size)
+        if clase is None:
+            # Objeto grande: partición variable directa en la RAM
+            idx = self.buscar_bloque_libre("first_fit", size)
             if idx is None:
-                # Deshacer asignaciones parciales
-                for pag_idx in paginas_asignadas:
-                    self.ram[pag_idx]["pid"] = None
-                    self.ram[pag_idx]["tipo"] = "libre"
-                self.fusionar_bloques_libres()
                 return False
-            
-            self.ocupar_bloque(idx, {"pid": proceso["pid"]}, PAGE_SIZE, "pagina")
-            paginas_asignadas.append(idx)
-        
+            return self.ocupar_bloque(idx, proceso, size, "slab_grande")
+        if self.slab.asignar(pid, size):
+            return True
+        idx = self.motor_ram.buscar("first_fit", self.slab.tamano_slab)
+        if idx is None:
+            return False
+        self.motor_ram.ocupar(idx, self.slab.agregar_slab(clase), self.slab.tamano_slab, "arena_slab")
+        return self.slab.asignar(pid, size)
+
+    ### Admisión (cola de espera) ###
+    def requisito_admision(self, proceso):
+        """
+        KB de RAM libre sin los cuales el proceso no puede entrar sin
+        expulsar a nadie, o None si depende del estado del buddy, los slabs
+        o las particiones (no se puede indexar por tamaño).
+        """
+        mode = proceso.get("mode", "contigua")
+        size = proceso["size"]
+        if mode == "paginacion":
+            return paginas_para(size) * PAGE_SIZE
+        if mode == "segmentacion":
+            # La compactación ya se intenta con `size` libres
+            return min(size, sum(proceso.get("segmentos", [size])))
+        if mode == "buddy" or (mode == "slab" and self.slab.clase(size) is not None):
+            return None
+        if mode == "contigua" and proceso.get("asignacion") == "fija" and self.particiones is not None:
+            return None
+        return size
+
+    def kb_necesarios(self, proceso):
+        """KB de RAM que ocupará el proceso una vez ubicado (páginas enteras, todos sus segmentos, la arena o el slab nuevo)"""
+        mode = proceso.get("mode", "contigua")
+        size = proceso["size"]
+        if mode == "paginacion":
+            return paginas_para(size) * PAGE_SIZE
+        if mode == "segmentacion":
+            return sum(proceso.get("segmentos", [size]))
+        if mode == "buddy":
+            return self.buddy.tamano_nueva_arena(size)
+        if mode == "slab" and self.slab.clase(size) is not None:
+            return self.slab.tamano_slab
+        return size
+
+    def cabria_vacia(self, proceso):
+        """
+        False si el proceso no entraría ni con la RAM vacía (sin contar las
+        particiones ni el pool comprimido, que no se liberan): expulsar por
+        él no sirve de nada.
+        """
+        if (proceso.get("mode", "contigua") == "contigua" and proceso.get("asignacion") == "fija"
+                and self.particiones is not None):
+            return proceso["size"] <= self.particiones.tamanos_ordenados[-1]
+        asignable = self.ram_size
+        if self.particiones is not None:
+            asignable -= self.particiones.kb_particionados
+        if self.zswap is not None:
+            asignable -= self.zswap.capacidad
+        return self.kb_necesarios(proceso) <= asignable
+
+    def prioridad_expulsable(self):
+        """
+        Mayor prioridad (número) por la que el swap inteligente tendría a
+        quién expulsar: la del proceso de menor prioridad en RAM, o None si
+        no puede expulsar a nadie.
+        """
+        if self.swap_io is not None and self.swap_io.suspendidos:
+            return None
+        maxima = self.reemplazo.prioridad_maxima()
+        if maxima is not None and self._swap_agotado is not None and self._swap_agotado[0] == self.version:
+            maxima = min(maxima, self._swap_agotado[1] - 1)
+        return maxima
+
+    def admisible(self, proceso):
+        """
+        False solo si asignar_proceso fallaría seguro sin cambiar nada: no
+        cabría ni con la RAM vacía, o no hay a quién expulsar, no cabe en el
+        estado actual y no se compactaría.
+        """
+        if not self.cabria_vacia(proceso):
+            return False
+        expulsable = self.prioridad_expulsable()
+        if expulsable is not None and proceso.get("priority", 1) <= expulsable:
+            return True
+        if self._compactaria_para(proceso):
+            return True
+        mode = proceso.get("mode", "contigua")
+        size = proceso["size"]
+        ram_libre = self.ram_size - self.motor_ram.ocupado()
+        hueco = self.motor_ram.mayor_libre()
+        if mode == "contigua":
+            if proceso.get("asignacion") == "fija" and self.particiones is not None:
+                return self.particiones.cabe(size)
+            return size <= hueco
+        if mode == "segmentacion":
+            segmentos = proceso.get("segmentos", [size])
+            return sum(segmentos) <= ram_libre and max(segmentos, default=0) <= hueco
+        if mode == "paginacion":
+            return paginas_para(size) * PAGE_SIZE <= ram_libre
+        if mode == "buddy":
+            return self.buddy.cabe(size) or self.buddy.tamano_nueva_arena(size) <= hueco
+        if mode == "slab":
+            if self.slab.clase(size) is None:
+                return size <= hueco
+            return self.slab.cabe(size) or self.slab.tamano_slab <= hueco
         return True
 
     ### Swap Inteligente ###
@@ -252,31 +580,37 @@ class MemoryManager:
         """
         size_needed = proceso_nuevo["size"]
         priority_nuevo = proceso_nuevo.get("priority", 1)
+        if not self.cabria_vacia(proceso_nuevo):
+            return False  # no entraría ni expulsando a todos
         
-        # Encontrar candidatos para swap (menor prioridad que el nuevo)
-        candidatos = []
-        for pid, info in self.procesos_activos.items():
-            if (info["ubicacion"] == "ram" and 
-                info["priority"] >= priority_nuevo and 
-                pid != proceso_nuevo["pid"]):
-                candidatos.append((pid, info))
-        
-        if not candidatos:
-            return False
-        
-        # Ordenar por prioridad (mayor primero) y luego por LRU
-        candidatos.sort(key=lambda x: (x[1]["priority"], 
-                                     list(self.lru_order).index(x[0]) 
-                                     if x[0] in self.lru_order else 0))
+        # Candidatos en RAM con menor prioridad que el nuevo, ordenados
+        # por prioridad y luego por LRU
+        victimas = self.reemplazo.victimas(priority_nuevo, excluir=proceso_nuevo["pid"])
         
         # Intentar mover candidatos hasta liberar suficiente espacio
         espacio_liberado = 0
-        for pid, info in candidatos:
-            if self.mover_a_swap(pid):
-                espacio_liberado += info["size"]
-                if espacio_liberado >= size_needed:
-                    # Intentar asignar el nuevo proceso
-                    return self.asignar_proceso_directo(proceso_nuevo)
+        try:
+            if self.swap_io is not None:
+                # Con E/S simulada cada expulsión cuesta: contar la RAM que ya está
+                # libre y no expulsar a nadie si ni con todos los candidatos alcanza
+                # para lo que el proceso ocupa de verdad según su modo
+                espacio_liberado = self.ram_size - self.motor_ram.ocupado()
+                kb_victimas = self.reemplazo.kb_victimas(priority_nuevo, excluir=proceso_nuevo["pid"])
+                if espacio_liberado + kb_victimas < self.kb_necesarios(proceso_nuevo):
+                    return False
+            version = self.version
+            for pid in victimas:
+                if self.mover_a_swap(pid):
+                    espacio_liberado += self.procesos_activos[pid]["size"]
+                    if espacio_liberado >= size_needed:
+                        # Intentar asignar el nuevo proceso
+                        return self.asignar_proceso_directo(proceso_nuevo)
+            if self.version == version:
+                # Ningún candidato cupo en SWAP: hasta que cambie la memoria tampoco
+                # cabrá ninguno para procesos de prioridad igual o más baja
+                self._swap_agotado = (version, priority_nuevo)
+        finally:
+            victimas.close()
         
         return False
 
@@ -292,6 +626,10 @@ class MemoryManager:
             return self.asignacion_segmentacion(proceso)
         elif mode == "paginacion":
             return self.asignacion_paginacion(proceso)
+        elif mode == "buddy":
+            return self.asignacion_buddy(proceso)
+        elif mode == "slab":
+            return self.asignacion_slab(proceso)
         return False
 
     def mover_a_swap(self, pid):
@@ -299,79 +637,212 @@ class MemoryManager:
         if pid not in self.procesos_activos:
             return False
         
-        bloques_proceso = [b for b in self.ram if b["pid"] == pid]
-        total_size = sum(b["size"] for b in bloques_proceso)
-        
-        # Buscar espacio en swap
-        idx_swap = self.buscar_bloque_libre_swap(total_size)
-        if idx_swap is None:
-            return False
-        
-        # Mover a swap
-        self.ocupar_bloque_swap(idx_swap, pid, total_size)
+        total_size = self._tamano_en_ram(pid)
+
+        if self.zswap is not None and self._comprimir(pid, total_size):
+            ubicacion = "zswap"
+        else:
+            # Buscar espacio en swap
+            idx_swap = self.buscar_bloque_libre_swap(total_size)
+            if idx_swap is None:
+                return False
+
+            # Mover a swap
+            self.ocupar_bloque_swap(idx_swap, pid, total_size)
+            if self.swap_io is not None:
+                self.swap_io.escribir(pid, total_size)
+            ubicacion = "swap"
         
         # Liberar de RAM
-        for bloque in self.ram:
-            if bloque["pid"] == pid:
-                bloque["pid"] = None
-                bloque["tipo"] = "libre"
-        
-        self.fusionar_bloques_libres()
+        bloques = self.motor_ram.num_bloques()
+        self.motor_ram.liberar_pids([pid] + self._liberar_de_arenas([pid]))
+        self.tabla_paginas.liberar(pid)
         
         # Actualizar ubicación
-        self.procesos_activos[pid]["ubicacion"] = "swap"
+        self.procesos_activos[pid]["ubicacion"] = ubicacion
+        self.reemplazo.expulsar(pid)
+        self.version += 1
+        if ubicacion == "swap":
+            self.swaps_realizados += 1
+        if self.metricas is not None:
+            if ubicacion == "swap":
+                self.metricas.incrementar("simulador_swaps_salida_total")
+            self.metricas.incrementar("simulador_fusiones_total", bloques - self.motor_ram.num_bloques())
         
         return True
 
+    ### Pool comprimido (solo con zswap) ###
+    def _comprimir(self, pid, size):
+        """Guarda el proceso en el pool, desalojando a SWAP lo necesario; False si no entra"""
+        zswap = self.zswap
+        kb = zswap.comprimido(size, self.procesos_activos[pid]["ratio_compresion"])
+        if kb > zswap.capacidad:
+            return False
+        while not zswap.cabe(kb):
+            if not self._desalojar_zswap(zswap.victima()):
+                return False
+        zswap.guardar(pid, size, kb)
+        if self.metricas is not None:
+            self.metricas.incrementar("simulador_zswap_total", operacion="guardado")
+        return True
+
+    def _desalojar_zswap(self, pid):
+        """Pasa una entrada del pool a SWAP real (descomprimida); False si no cabe en SWAP"""
+        size = self.zswap.tamano(pid)
+        idx_swap = self.buscar_bloque_libre_swap(size)
+        if idx_swap is None:
+            return False
+        self.zswap.sacar(pid)
+        self.ocupar_bloque_swap(idx_swap, pid, size)
+        if self.swap_io is not None:
+            self.swap_io.escribir(pid, size)
+        self.procesos_activos[pid]["ubicacion"] = "swap"
+        self.zswap.estadisticas["desalojados"] += 1
+        self.zswap.estadisticas["kb_a_swap"] += size
+        self.swaps_realizados += 1
+        self.version += 1
+        if self.metricas is not None:
+            self.metricas.incrementar("simulador_zswap_total", operacion="desalojado")
+            self.metricas.incrementar("simulador_swaps_salida_total")
+        return True
+
+    def _descomprimir(self, pid):
+        """Trae de vuelta a RAM un proceso del pool; False si no cabe"""
+        if not self._reservar_en_ram(pid, self.zswap.tamano(pid)):
+            return False
+        self.zswap.sacar(pid)
+        self.zswap.estadisticas["recuperados"] += 1
+        info = self.procesos_activos[pid]
+        info["ubicacion"] = "ram"
+        self.reemplazo.tocar(pid, info["priority"], info["size"])
+        self.zswap.reanudados.append(pid)
+        self.version += 1
+        if self.metricas is not None:
+            self.metricas.incrementar("simulador_zswap_total", operacion="recuperado")
+        return True
+
+    ### Regreso desde SWAP (solo con swap_io) ###
+    def _por_urgencia(self, pids):
+        """Prioridad más alta (número menor) primero; entre iguales, el usado más recientemente"""
+        lru = self.reemplazo.lru
+        return sorted(pids, key=lambda pid: (self.procesos_activos[pid]["priority"], -lru.get(pid, 0)))
+
+    def _iniciar_swap_in(self, pid, prefetch=False):
+        """Reserva marcos en RAM para el proceso y encola la lectura; False si no cabe"""
+        size = self.motor_swap.tamano_pid(pid)
+        if not self._reservar_en_ram(pid, size):
+            return False
+        self.swap_io.leer(pid, size, prefetch)
+        self.version += 1
+        return True
+
+    def _reservar_en_ram(self, pid, size):
+        """Ubica en RAM a un proceso que vuelve con `size` KB; False si no cabe"""
+        info = self.procesos_activos[pid]
+        if info["mode"] == "paginacion":
+            marcos = self.motor_ram.ocupar_paginas(pid, paginas_para(size), PAGE_SIZE, "pagina")
+            if marcos is None:
+                return False
+            self.tabla_paginas.registrar(pid, marcos)
+        elif info["mode"] in ("buddy", "slab") or (info["asignacion"] == "fija" and self.particiones is not None):
+            # Se vuelve a pedir el tamaño original para no contar el redondeo dos veces
+            if not self.asignar_proceso_directo({"pid": pid, "size": info["size"], "mode": info["mode"],
+                                                 "asignacion": info["asignacion"]}):
+                return False
+        else:
+            # Los segmentos vuelven juntos en un único bloque
+            idx = self.motor_ram.buscar("first_fit", size)
+            if idx is None:
+                return False
+            self.motor_ram.ocupar(idx, pid, size, "segmento" if info["mode"] == "segmentacion" else "contigua")
+        return True
+
+    def _completar_swap_in(self, pid):
+        self.motor_swap.liberar_pid(pid)
+        info = self.procesos_activos[pid]
+        info["ubicacion"] = "ram"
+        self.reemplazo.tocar(pid, info["priority"], info["size"])
+        self.swap_io.reanudados.append(pid)
+        self.version += 1
+
+    def prefetch_swap(self):
+        """
+        Si el dispositivo está ocioso, adelanta la lectura de los procesos
+        suspendidos que quepan en RAM. Devuelve los pids adelantados.
+        """
+        swap_io = self.swap_io
+        if swap_io is None or not swap_io.prefetch or not swap_io.ocioso():
+            return []
+        suspendidos = [pid for pid, info in self.procesos_activos.items()
+                       if info["ubicacion"] == "swap"
+                       and pid not in swap_io.en_transito and pid not in swap_io.demandados]
+        return [pid for pid in self._por_urgencia(suspendidos) if self._iniciar_swap_in(pid, prefetch=True)]
+
     def buscar_bloque_libre_swap(self, size):
-        bloques_libres = [(i, b) for i, b in enumerate(self.swap) 
-                         if b["pid"] is None and b["size"] >= size]
-        if not bloques_libres:
-            return None
-        return min(bloques_libres, key=lambda x: x[1]["size"])[0]  # Best fit
+        return self.motor_swap.buscar("best_fit", size)
 
     def ocupar_bloque_swap(self, idx, pid, size):
-        bloque = self.swap[idx]
-        if bloque["size"] == size:
-            bloque["pid"] = pid
-            bloque["tipo"] = "swap"
-        else:
-            bloque_asignado = {"pid": pid, "size": size, "tipo": "swap"}
-            bloque_libre = {"pid": None, "size": bloque["size"] - size, "tipo": "libre"}
-            self.swap[idx] = bloque_asignado
-            self.swap.insert(idx + 1, bloque_libre)
-        
-        self.fusionar_bloques_libres_swap()
+        self.motor_swap.ocupar(idx, pid, size, "swap")
 
     def obtener_estadisticas(self):
-        """Obtiene estadísticas del estado actual de memoria"""
-        ram_ocupada = sum(b["size"] for b in self.ram if b["pid"] is not None)
-        swap_ocupado = sum(b["size"] for b in self.swap if b["pid"] is not None)
+        """
+        Obtiene estadísticas del estado actual de memoria. Los motores las
+        mantienen al asignar y liberar, así que esto es O(1).
+        fragmentacion_externa_ram: 1 - mayor hueco / RAM libre fuera de
+        particiones y arenas (0 = un solo hueco)
+        """
+        # Lo reservado para particiones y arenas que no aloja a ningún proceso cuenta como libre,
+        # pero solo los huecos del motor cuentan para la fragmentación externa
+        libre_motor = self.ram_size - self.motor_ram.ocupado()
+        ram_libre = libre_motor + self._kb_libres_reservados()
+        ram_ocupada = self.ram_size - ram_libre
+        swap_ocupado = self.motor_swap.ocupado()
+        mayor_libre = self.motor_ram.mayor_libre()
         
-        return {
+        estadisticas = {
             "ram_total": self.ram_size,
             "ram_ocupada": ram_ocupada,
-            "ram_libre": self.ram_size - ram_ocupada,
+            "ram_libre": ram_libre,
             "swap_total": self.swap_size,
             "swap_ocupado": swap_ocupado,
             "swap_libre": self.swap_size - swap_ocupado,
             "procesos_activos": len(self.procesos_activos),
-            "fragmentacion_ram": len([b for b in self.ram if b["pid"] is None])
+            "fragmentacion_ram": self.motor_ram.num_libres(),
+            "mayor_libre_ram": mayor_libre,
+            "fragmentacion_externa_ram": 1 - mayor_libre / libre_motor if libre_motor else 0.0
         }
-    def obtener_estado_memoria(self):
-        """Devuelve solo el estado de la memoria (RAM y SWAP)"""
+        if self.swap_io is not None:
+            estadisticas["swap_io"] = dict(self.swap_io.estadisticas)
+        if self.particiones is not None:
+            estadisticas["particiones"] = self.particiones.estadisticas()
+        if self.buddy.asignaciones:
+            estadisticas["buddy"] = self.buddy.estadisticas()
+        if self.slab.asignaciones:
+            estadisticas["slab"] = self.slab.estadisticas()
+        if self.compactador is not None:
+            estadisticas["compactacion"] = dict(self.compactador.estadisticas)
+        if self.zswap is not None:
+            estadisticas["zswap"] = self.zswap.resumen()
+        return estadisticas
+    def obtener_estado_memoria(self, incluir_bloques=True):
+        """
+        Devuelve solo el estado de la memoria (RAM y SWAP). Las listas de
+        bloques solo se construyen si incluir_bloques es True.
+        """
         stats = self.obtener_estadisticas()
         
-        return {
+        estado = {
             "ram": {
-                "bloques": self.ram,
+                "bloques": self.ram if incluir_bloques else None,
                 "total": self.ram_size,
                 "usada": stats["ram_ocupada"],
                 "libre": stats["ram_libre"],
-                "fragmentacion": stats["fragmentacion_ram"]
+                "fragmentacion": stats["fragmentacion_ram"],
+                "mayor_libre": stats["mayor_libre_ram"],
+                "fragmentacion_externa": stats["fragmentacion_externa_ram"]
             },
             "swap": {
-                "bloques": self.swap,
+                "bloques": self.swap if incluir_bloques else None,
                 "total": self.swap_size,
                 "usada": stats["swap_ocupado"],
                 "libre": stats["swap_libre"]
@@ -384,7 +855,16 @@ class MemoryManager:
                 }
                 for pid, info in self.procesos_activos.items()
             }
-    }
+        }
+        if self.zswap is not None:
+            estado["zswap"] = {
+                "total": self.zswap.capacidad,
+                "usada": self.zswap.ocupado,
+                "libre": self.zswap.capacidad - self.zswap.ocupado,
+                "procesos": self.zswap.pids(),
+            }
+        return estado
+
     def __repr__(self):
         stats = self.obtener_estadisticas()
         return f"RAM: {self.ram}\nSWAP: {self.swap}\nStats: {stats}"
\ No newline at end of file
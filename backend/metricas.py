@@ -0,0 +1,97 @@
+"""
+Instrumentación opcional del simulador: contadores e histogramas.
+
+Se activa creando el Scheduler con instrumentar=True; si no, el Scheduler
+y el MemoryManager tienen metricas=None y solo pagan esa comprobación.
+exportar_prometheus() genera el formato de texto de Prometheus que sirve
+el endpoint /metrics.
+"""
+import time
+from bisect import bisect_left
+
+BUCKETS_SEGUNDOS = (1e-6, 5e-6, 1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 5e-3, 1e-2, 5e-2, 0.1, 0.5, 1.0)
+BUCKETS_BLOQUES = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 4096, 16384)
+
+# nombre -> (tipo, ayuda, buckets)
+DEFINICIONES = {
+    "simulador_asignaciones_total": ("counter", "Intentos de asignación por estrategia (o modo)", None),
+    "simulador_asignaciones_fallidas_total": ("counter", "Asignaciones que no cupieron ni con swap", None),
+    "simulador_asignacion_segundos": ("histogram", "Duración de asignar_proceso", BUCKETS_SEGUNDOS),
+    "simulador_bloques_examinados": ("histogram", "Bloques (o nodos del índice) examinados por búsqueda", BUCKETS_BLOQUES),
+    "simulador_swaps_salida_total": ("counter", "Procesos movidos de RAM a SWAP", None),
+    "simulador_zswap_total": ("counter", "Operaciones del pool comprimido (guardado, recuperado, desalojado)", None),
+    "simulador_fusiones_total": ("counter", "Fusiones de bloques libres adyacentes", None),
+    "simulador_compactaciones_total": ("counter", "Compactaciones de la RAM por motivo", None),
+    "simulador_compactacion_kb_total": ("counter", "KB movidos al compactar la RAM", None),
+    "simulador_fase_tick_segundos": ("histogram", "Duración de cada fase de Scheduler.tick", BUCKETS_SEGUNDOS),
+    "simulador_ticks_total": ("counter", "Ticks ejecutados", None),
+}
+
+
+class Histograma:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.conteos = [0] * (len(buckets) + 1)  # el último es +Inf
+        self.suma = 0.0
+        self.n = 0
+
+    def observar(self, valor):
+        self.conteos[bisect_left(self.buckets, valor)] += 1
+        self.suma += valor
+        self.n += 1
+
+
+class Metricas:
+    def __init__(self):
+        self.contadores = {}   # (nombre, etiquetas) -> valor
+        self.histogramas = {}  # (nombre, etiquetas) -> Histograma
+
+    def incrementar(self, nombre, valor=1, **etiquetas):
+        clave = (nombre, tuple(sorted(etiquetas.items())))
+        self.contadores[clave] = self.contadores.get(clave, 0) + valor
+
+    def observar(self, nombre, valor, **etiquetas):
+        clave = (nombre, tuple(sorted(etiquetas.items())))
+        histograma = self.histogramas.get(clave)
+        if histograma is None:
+            histograma = self.histogramas[clave] = Histograma(DEFINICIONES[nombre][2])
+        histograma.observar(valor)
+
+    def fase(self, nombre, inicio):
+        """Anota la duración de una fase del tick desde `inicio` y devuelve el instante actual"""
+        ahora = time.perf_counter()
+        self.observar("simulador_fase_tick_segundos", ahora - inicio, fase=nombre)
+        return ahora
+
+
+def _etiquetas(pares):
+    if not pares:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in pares) + "}"
+
+
+def exportar_prometheus(fuentes):
+    """
+    Texto en formato Prometheus para una lista de (etiquetas, Metricas);
+    las etiquetas (p. ej. {"sesion": id}) se agregan a cada serie.
+    """
+    series = {nombre: [] for nombre in DEFINICIONES}
+    for extra, metricas in fuentes:
+        extra = tuple(sorted(extra.items()))
+        for (nombre, etiquetas), valor in metricas.contadores.items():
+            series[nombre].append(f"{nombre}{_etiquetas(extra + etiquetas)} {valor}")
+        for (nombre, etiquetas), histograma in metricas.histogramas.items():
+            base = extra + etiquetas
+            acumulado = 0
+            for limite, conteo in zip(histograma.buckets + ("+Inf",), histograma.conteos):
+                acumulado += conteo
+                series[nombre].append(f"{nombre}_bucket{_etiquetas(base + (('le', limite),))} {acumulado}")
+            series[nombre].append(f"{nombre}_sum{_etiquetas(base)} {histograma.suma}")
+            series[nombre].append(f"{nombre}_count{_etiquetas(base)} {histograma.n}")
+
+    lineas = []
+    for nombre, (tipo, ayuda, _) in DEFINICIONES.items():
+        lineas.append(f"# HELP {nombre} {ayuda}")
+        lineas.append(f"# TYPE {nombre} {tipo}")
+        lineas.extend(series[nombre])
+    return "\n".join(lineas) + "\n"
@@ -0,0 +1,197 @@
+"""
+Réplicas Monte Carlo de una traza para obtener intervalos de confianza de
+las métricas de calcular_eficiencia.
+
+Cada réplica es la traza base con perturbaciones aleatorias:
+- jitter_llegada: tiempo_llegada ± hasta tantos ticks (nunca negativo)
+- jitter_tamano: size escalado por 1 ± hasta esa fracción; en los procesos
+  con segmentos se escala cada segmento y size en la misma proporción que
+  su suma, así se mantiene la relación entre ambos de la traza original
+- jitter_tiempo: tiempo_ejecucion escalado por 1 ± hasta esa fracción
+
+La semilla de la réplica i sale solo de (semilla, i), así que el resultado
+no depende de cuántos workers se usen ni de cómo se repartan. Todas las
+estrategias comparadas ven las mismas réplicas (números aleatorios
+comunes), lo que reduce la varianza de sus diferencias.
+
+Las réplicas se reparten en lotes entre workers con el pool de barrido.py:
+cada worker lee la traza base una vez, arma cada réplica en memoria y la
+corre en el modo por eventos, que salta los ticks sin cambios.
+
+Uso:
+    python montecarlo.py data/procesos.json --replicas 200 --semilla 7 \
+        --estrategias first_fit best_fit --jitter-tiempo 0.2 --salida mc.json
+"""
+import argparse
+import json
+import math
+import os
+import random
+import statistics
+import sys
+
+from barrido import fila_resumen, repartir
+from scheduler import Scheduler
+from trazas import abrir_traza
+
+ESTRATEGIAS = ["first_fit", "best_fit", "worst_fit", "next_fit"]
+METRICAS = ["ticks_totales", "procesos_ejecutados", "procesos_fallidos",
+            "tasa_exito", "utilizacion_ram", "utilizacion_swap", "fragmentacion", "fragmentacion_externa"]
+PERCENTILES = [5, 50, 95]
+Z_95 = 1.959964  # cuantil normal del intervalo de confianza del 95%
+
+
+def semilla_replica(semilla, replica):
+    """Semilla reproducible e independiente para cada réplica"""
+    return random.Random(f"{semilla}:{replica}").getrandbits(64)
+
+
+def _escalar(valor, r, fraccion):
+    return max(1, round(valor * (1 + r.uniform(-fraccion, fraccion)))) if fraccion else valor
+
+
+def perturbar(procesos, semilla, jitter_llegada=0, jitter_tamano=0.0, jitter_tiempo=0.0):
+    """Copia de la traza con llegadas, tamaños y tiempos de ejecución perturbados"""
+    r = random.Random(semilla)
+    replica = []
+    for proceso in procesos:
+        proceso = dict(proceso)
+        if jitter_llegada:
+            llegada = proceso.get("tiempo_llegada", 0) + r.randint(-jitter_llegada, jitter_llegada)
+            proceso["tiempo_llegada"] = max(0, llegada)
+        if "segmentos" in proceso:
+            original = sum(proceso["segmentos"])
+            proceso["segmentos"] = [_escalar(s, r, jitter_tamano) for s in proceso["segmentos"]]
+            if original:
+                proceso["size"] = max(1, round(proceso["size"] * sum(proceso["segmentos"]) / original))
+        else:
+            proceso["size"] = _escalar(proceso["size"], r, jitter_tamano)
+        proceso["tiempo_ejecucion"] = _escalar(proceso.get("tiempo_ejecucion", 5), r, jitter_tiempo)
+        replica.append(proceso)
+    replica.sort(key=lambda p: p.get("tiempo_llegada", 0))
+    return replica
+
+
+def ejecutar_lote(tarea):
+    """Corre un lote de réplicas con todas las estrategias; devuelve sus filas"""
+    base = list(abrir_traza(tarea["traza"]))
+    filas = []
+    for replica in tarea["replicas"]:
+        procesos = perturbar(base, semilla_replica(tarea["semilla"], replica), **tarea["jitter"])
+        for estrategia in tarea["estrategias"]:
+            scheduler = Scheduler(procesos=procesos, estrategia=estrategia,
+                                  registrar_deltas=False, **tarea["config"])
+            resumen = scheduler.ejecutar_hasta_el_final(
+                por_eventos=True, max_ticks=tarea["max_ticks"])["resumen"]
+            filas.append({"replica": replica, "estrategia": estrategia, **fila_resumen(resumen)})
+    return filas
+
+
+def _percentil(ordenados, p):
+    """Percentil por interpolación lineal"""
+    posicion = (len(ordenados) - 1) * p / 100
+    i = math.floor(posicion)
+    j = min(i + 1, len(ordenados) - 1)
+    return ordenados[i] + (ordenados[j] - ordenados[i]) * (posicion - i)
+
+
+def distribucion(valores):
+    """Media, desvío, intervalo de confianza del 95% de la media y percentiles"""
+    ordenados = sorted(valores)
+    media = statistics.fmean(ordenados)
+    desvio = statistics.stdev(ordenados) if len(ordenados) > 1 else 0.0
+    margen = Z_95 * desvio / math.sqrt(len(ordenados))
+    return {
+        "media": media,
+        "desvio": desvio,
+        "ic95": [media - margen, media + margen],
+        "min": ordenados[0],
+        **{f"p{p}": _percentil(ordenados, p) for p in PERCENTILES},
+        "max": ordenados[-1],
+    }
+
+
+def agregar(filas):
+    """Distribución de cada métrica por estrategia ("traza": la de cada proceso)"""
+    por_estrategia = {}
+    for fila in filas:
+        por_estrategia.setdefault(fila["estrategia"] or "traza", []).append(fila)
+    return {
+        estrategia: {
+            "replicas": len(grupo),
+            **{metrica: distribucion([fila[metrica] for fila in grupo]) for metrica in METRICAS},
+        }
+        for estrategia, grupo in por_estrategia.items()
+    }
+
+
+def ejecutar_montecarlo(traza, replicas, semilla=0, estrategias=None, jitter_llegada=0, jitter_tamano=0.0,
+                        jitter_tiempo=0.0, max_ticks=None, procesos=None, lote=None, **config):
+    """
+    Corre `replicas` réplicas de la traza con cada estrategia (None: la de
+    cada proceso en la traza) repartidas en lotes entre `procesos` workers.
+    config: otros parámetros del Scheduler (ram_size, swap_size, motor...).
+    Devuelve las filas por réplica (en orden) y su agregado por estrategia.
+    """
+    estrategias = estrategias or [None]
+    procesos = procesos or os.cpu_count() or 1
+    lote = lote or max(1, math.ceil(replicas / (procesos * 4)))
+    tareas = [
+        {
+            "traza": traza,
+            "replicas": list(range(inicio, min(inicio + lote, replicas))),
+            "semilla": semilla,
+            "estrategias": estrategias,
+            "jitter": {"jitter_llegada": jitter_llegada, "jitter_tamano": jitter_tamano,
+                       "jitter_tiempo": jitter_tiempo},
+            "max_ticks": max_ticks,
+            "config": config,
+        }
+        for inicio in range(0, replicas, lote)
+    ]
+    lotes = repartir(ejecutar_lote, tareas, procesos, chunksize=1)
+    filas = [fila for filas_lote in lotes for fila in filas_lote]
+    return {
+        "meta": {"traza": traza, "replicas": replicas, "semilla": semilla,
+                 "jitter": tareas[0]["jitter"] if tareas else {}, **config},
+        "filas": filas,
+        "agregado": agregar(filas),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Réplicas Monte Carlo de una traza")
+    parser.add_argument("traza")
+    parser.add_argument("--replicas", type=int, default=100)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--estrategias", nargs="+", default=None, choices=ESTRATEGIAS,
+                        help="por defecto, la estrategia de cada proceso en la traza")
+    parser.add_argument("--jitter-llegada", type=int, default=2, help="ticks")
+    parser.add_argument("--jitter-tamano", type=float, default=0.1, help="fracción del tamaño")
+    parser.add_argument("--jitter-tiempo", type=float, default=0.2, help="fracción del tiempo de ejecución")
+    parser.add_argument("--ram", type=int, default=1024)
+    parser.add_argument("--swap", type=int, default=2048)
+    parser.add_argument("--motor", default="lista")
+    parser.add_argument("--max-ticks", type=int, default=None, help="por defecto, sin límite")
+    parser.add_argument("--procesos", type=int, default=None, help="workers (por defecto, uno por núcleo)")
+    parser.add_argument("--lote", type=int, default=None, help="réplicas por tarea de un worker")
+    parser.add_argument("--filas", action="store_true", help="incluir los resultados de cada réplica")
+    parser.add_argument("--salida", default=None, help="archivo JSON de resultados")
+    args = parser.parse_args(argv)
+
+    resultado = ejecutar_montecarlo(
+        args.traza, args.replicas, args.semilla, args.estrategias, args.jitter_llegada, args.jitter_tamano,
+        args.jitter_tiempo, args.max_ticks, args.procesos, args.lote,
+        ram_size=args.ram, swap_size=args.swap, motor=args.motor)
+    if not args.filas:
+        del resultado["filas"]
+    if args.salida:
+        with open(args.salida, "w") as f:
+            json.dump(resultado, f, indent=2)
+    else:
+        json.dump(resultado, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Subsistema de paginación: tablas de páginas por proceso.
+
+Los marcos se reservan en lote con el motor de asignación de la RAM
+(ocupar_paginas), que recorre los huecos libres una sola vez en orden de
+dirección. Cada tabla guarda, en un array compacto, la dirección física
+del marco asignado a cada página virtual del proceso.
+"""
+from array import array
+
+PAGE_SIZE = 64
+
+
+def paginas_para(size):
+    return (size + PAGE_SIZE - 1) // PAGE_SIZE
+
+
+class TablaPaginas:
+    def __init__(self):
+        self.tablas = {}
+
+    def reset(self):
+        self.tablas.clear()
+
+    def registrar(self, pid, marcos):
+        self.tablas[pid] = array("q", marcos)
+
+    def liberar(self, pid):
+        self.tablas.pop(pid, None)
+
+    def reubicar(self, pid, origen, destino, size):
+        """Corrige los marcos del tramo [origen, origen + size) que la compactación movió a destino"""
+        marcos = self.tablas.get(pid)
+        if marcos is None:
+            return
+        desplazamiento = destino - origen
+        for i, marco in enumerate(marcos):
+            if origen <= marco < origen + size:
+                marcos[i] = marco + desplazamiento
+
+    def marcos(self, pid):
+        return self.tablas.get(pid, array("q"))
+
+    def traducir(self, pid, direccion_virtual):
+        """Traduce una dirección virtual del proceso a su dirección física"""
+        pagina, desplazamiento = divmod(direccion_virtual, PAGE_SIZE)
+        return self.tablas[pid][pagina] + desplazamiento
+
+    def total_paginas(self):
+        return sum(len(marcos) for marcos in self.tablas.values())
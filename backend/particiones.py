@@ -0,0 +1,123 @@
+"""
+Particiones fijas para los procesos contiguos con asignacion "fija".
+
+La tabla de particiones se configura al crear el MemoryManager: N
+particiones iguales que cubren toda la RAM, o una lista de tamaños que se
+reservan desde la dirección 0 (lo que sobre queda para la asignación
+variable). Cada partición es un bloque permanente de la RAM y aloja un
+solo proceso, que usa la partición entera: lo que sobra es fragmentación
+interna.
+
+Buscar partición es O(log k) con k tamaños distintos: un índice ordenado
+de los tamaños que tienen alguna partición libre da la más chica que
+alcanza (best fit) y un montículo por tamaño da la de menor dirección.
+"""
+from bisect import bisect_left, insort
+from heapq import heappop, heappush
+
+
+def tamanos_particiones(config, ram_size):
+    """config: cantidad de particiones iguales (int) o lista de tamaños en KB"""
+    if isinstance(config, int):
+        if config <= 0 or config > ram_size:
+            raise ValueError(f"Cantidad de particiones inválida: {config}")
+        return [ram_size // config] * config
+    tamanos = list(config)
+    if not tamanos or any(not isinstance(t, int) or t <= 0 for t in tamanos):
+        raise ValueError("Las particiones deben ser tamaños enteros positivos")
+    if sum(tamanos) > ram_size:
+        raise ValueError("Las particiones no caben en la RAM")
+    return tamanos
+
+
+class TablaParticiones:
+    def __init__(self, tamanos):
+        self.tamanos = list(tamanos)
+        self.kb_particionados = sum(self.tamanos)
+        self.tamanos_ordenados = sorted(self.tamanos)
+        self.reset()
+
+    def reset(self):
+        self._ocupantes = [None] * len(self.tamanos)  # índice -> pid
+        self._por_pid = {}                            # pid -> (índice, size pedido)
+        self._libres = {}                             # tamaño -> montículo de índices libres
+        for i, tamano in enumerate(self.tamanos):
+            self._libres.setdefault(tamano, []).append(i)
+        self._tamanos_libres = sorted(self._libres)   # tamaños con alguna partición libre
+        self.kb_asignados = 0
+        self.kb_solicitados = 0
+        self.rechazos = 0  # pedidos más grandes que cualquier partición
+
+    @staticmethod
+    def marca(indice):
+        return f"[particion {indice + 1}]"
+
+    @staticmethod
+    def indice(marca):
+        return int(marca[11:-1]) - 1
+
+    def marcas(self):
+        return [self.marca(i) for i in range(len(self.tamanos))]
+
+    def cabe(self, size):
+        """True si hay una partición libre donde cabe `size`"""
+        return bisect_left(self._tamanos_libres, size) < len(self._tamanos_libres)
+
+    def asignar(self, pid, size):
+        """Ocupa la partición libre más chica donde cabe `size`; False si no hay"""
+        i = bisect_left(self._tamanos_libres, size)
+        if i == len(self._tamanos_libres):
+            if size > self.tamanos_ordenados[-1]:
+                self.rechazos += 1
+            return False
+        tamano = self._tamanos_libres[i]
+        libres = self._libres[tamano]
+        indice = heappop(libres)
+        if not libres:
+            del self._tamanos_libres[i]
+        self._ocupantes[indice] = pid
+        self._por_pid[pid] = (indice, size)
+        self.kb_asignados += tamano
+        self.kb_solicitados += size
+        return True
+
+    def liberar(self, pid):
+        """Libera la partición del proceso; False si no tenía ninguna"""
+        ocupada = self._por_pid.pop(pid, None)
+        if ocupada is None:
+            return False
+        indice, size = ocupada
+        tamano = self.tamanos[indice]
+        self._ocupantes[indice] = None
+        libres = self._libres[tamano]
+        if not libres:
+            insort(self._tamanos_libres, tamano)
+        heappush(libres, indice)
+        self.kb_asignados -= tamano
+        self.kb_solicitados -= size
+        return True
+
+    def tamano(self, pid):
+        """KB de la partición del proceso, o None si no ocupa ninguna"""
+        ocupada = self._por_pid.get(pid)
+        return self.tamanos[ocupada[0]] if ocupada is not None else None
+
+    def bloque(self, marca):
+        """La partición con el formato de la vista de RAM"""
+        indice = self.indice(marca)
+        pid = self._ocupantes[indice]
+        return {"pid": pid, "size": self.tamanos[indice], "tipo": "contigua_fija" if pid is not None else "particion_libre"}
+
+    def kb_libres(self):
+        return self.kb_particionados - self.kb_asignados
+
+    def estadisticas(self):
+        return {
+            "particiones": len(self.tamanos),
+            "ocupadas": len(self._por_pid),
+            "kb_particionados": self.kb_particionados,
+            "kb_asignados": self.kb_asignados,
+            "kb_solicitados": self.kb_solicitados,
+            "fragmentacion_interna": 1 - self.kb_solicitados / self.kb_asignados if self.kb_asignados else 0.0,
+            "rechazos": self.rechazos,
+        }
@@ -0,0 +1,141 @@
+"""
+Política de reemplazo para el swap inteligente.
+
+- LRU en un OrderedDict: tocar y quitar un proceso cuestan O(1).
+- Los procesos en RAM se agrupan por prioridad, cada grupo en orden LRU
+  (lista doblemente enlazada), y las prioridades presentes se guardan
+  ordenadas. Las víctimas salen recorriendo los grupos desde la prioridad
+  mínima pedida, sin tocar a los procesos de prioridad más alta.
+- Los KB en RAM de cada grupo se mantienen al tocar y expulsar, así que
+  saber cuánto liberarían todas las víctimas cuesta O(prioridades).
+"""
+from bisect import bisect_left, insort
+from collections import OrderedDict
+
+
+class GrupoLRU:
+    """Procesos de una misma prioridad, del usado hace más tiempo al más reciente"""
+
+    def __init__(self):
+        self._anterior = {}
+        self._siguiente = {}
+        self.primero = None
+        self._ultimo = None
+        self.kb = 0
+
+    def __len__(self):
+        return len(self._siguiente)
+
+    def __contains__(self, pid):
+        return pid in self._siguiente
+
+    def siguiente(self, pid):
+        return self._siguiente[pid]
+
+    def agregar(self, pid):
+        """Agrega (o mueve) el proceso al final: el usado más recientemente"""
+        if pid in self._siguiente:
+            self.quitar(pid)
+        self._anterior[pid] = self._ultimo
+        self._siguiente[pid] = None
+        if self._ultimo is None:
+            self.primero = pid
+        else:
+            self._siguiente[self._ultimo] = pid
+        self._ultimo = pid
+
+    def quitar(self, pid):
+        anterior = self._anterior.pop(pid)
+        siguiente = self._siguiente.pop(pid)
+        if anterior is None:
+            self.primero = siguiente
+        else:
+            self._siguiente[anterior] = siguiente
+        if siguiente is None:
+            self._ultimo = anterior
+        else:
+            self._anterior[siguiente] = anterior
+
+
+class PoliticaReemplazo:
+    def __init__(self):
+        self.lru = OrderedDict()  # pid -> marca del último uso
+        self._en_ram = {}         # pid -> (priority, KB) de los procesos candidatos
+        self._grupos = {}         # priority -> GrupoLRU
+        self._prioridades = []    # prioridades con procesos en RAM, ordenadas
+        self._reloj = 0
+
+    def reset(self):
+        self.lru.clear()
+        self._en_ram.clear()
+        self._grupos.clear()
+        self._prioridades = []
+        self._reloj = 0
+
+    def tocar(self, pid, priority, size=0):
+        """Marca un uso del proceso, que pasa a ser candidato mientras siga en RAM"""
+        self._reloj += 1
+        self.lru[pid] = self._reloj
+        self.lru.move_to_end(pid)
+        entrada = self._en_ram.get(pid)
+        if entrada is not None and entrada[0] != priority:
+            self._sacar_de_ram(pid)
+            entrada = None
+        grupo = self._grupos.get(priority)
+        if grupo is None:
+            grupo = self._grupos[priority] = GrupoLRU()
+            insort(self._prioridades, priority)
+        if entrada is None:
+            grupo.kb += size
+        else:
+            grupo.kb += size - entrada[1]
+        self._en_ram[pid] = (priority, size)
+        grupo.agregar(pid)
+
+    def expulsar(self, pid):
+        """El proceso salió de RAM: conserva su posición LRU pero deja de ser candidato"""
+        self._sacar_de_ram(pid)
+
+    def quitar(self, pid):
+        self.lru.pop(pid, None)
+        self._sacar_de_ram(pid)
+
+    def _sacar_de_ram(self, pid):
+        entrada = self._en_ram.pop(pid, None)
+        if entrada is not None:
+            priority, size = entrada
+            grupo = self._grupos[priority]
+            grupo.quitar(pid)
+            grupo.kb -= size
+            if not grupo:
+                del self._grupos[priority]
+                del self._prioridades[bisect_left(self._prioridades, priority)]
+
+    def prioridad_maxima(self):
+        """Mayor número de prioridad (la más baja) entre los procesos en RAM, o None"""
+        return self._prioridades[-1] if self._prioridades else None
+
+    def kb_victimas(self, priority_min, excluir=None):
+        """KB en RAM de todos los procesos que victimas() generaría"""
+        total = sum(self._grupos[p].kb for p in self._prioridades[bisect_left(self._prioridades, priority_min):])
+        entrada = self._en_ram.get(excluir)
+        if entrada is not None and entrada[0] >= priority_min:
+            total -= entrada[1]
+        return total
+
+    def victimas(self, priority_min, excluir=None):
+        """
+        Genera los procesos en RAM con priority >= priority_min en orden
+        (prioridad, LRU). Quien recibe un pid puede expulsarlo antes de
+        pedir el siguiente.
+        """
+        for priority in self._prioridades[bisect_left(self._prioridades, priority_min):]:
+            grupo = self._grupos.get(priority)
+            pid = grupo.primero if grupo is not None else None
+            while pid is not None:
+                siguiente = grupo.siguiente(pid)
+                if pid != excluir:
+                    yield pid
+                if pid in grupo:
+                    siguiente = grupo.siguiente(pid)
+                pid = siguiente
@@ -0,0 +1,162 @@
+"""
+Salida en streaming de una simulación completa.
+
+Scheduler.ejecutar_hasta_el_final(salida=ruta) escribe cada tick como una
+línea JSON (comprimida con gzip si la ruta termina en .gz) en vez de
+acumularlos en memoria, y el resumen se calcula a medida que avanzan los
+ticks. Así una traza de millones de ticks corre con memoria acotada.
+
+- muestreo: escribir como mucho un tick cada tantos ticks simulados (el
+  último siempre se escribe)
+- incluir_memoria: incluir las listas de bloques "ram" y "swap" de cada
+  tick escrito (por defecto se omiten: son lo más pesado del registro y
+  armarlas cuesta; solo se piden para los ticks que se escriben)
+
+Uso:
+    python salida.py data/traza.jsonl --salida corrida.jsonl.gz \
+        --muestreo 100 --por-eventos
+"""
+import argparse
+import gzip
+import json
+
+class EscritorTicks:
+    def __init__(self, ruta, muestreo=1, incluir_memoria=False):
+        if muestreo < 1:
+            raise ValueError("muestreo debe ser al menos 1")
+        self.ruta = ruta
+        self.muestreo = muestreo
+        self.incluir_memoria = incluir_memoria
+        self.escritos = 0
+        self._siguiente = None  # primer tick que toca escribir
+        self._pendiente = None  # último tick salteado por el muestreo: se escribe al cerrar
+        abrir = gzip.open if ruta.endswith(".gz") else open
+        self._archivo = abrir(ruta, "wt", encoding="utf-8")
+
+    def escribir(self, resultado, memoria=None):
+        """memoria: función que devuelve {"ram": [...], "swap": [...]} (con incluir_memoria)"""
+        tick = resultado["tick"]
+        if self._siguiente is not None and tick < self._siguiente and not resultado["finished"]:
+            self._pendiente = (resultado, memoria)
+            return
+        self._pendiente = None
+        self._siguiente = tick + self.muestreo
+        self._escribir(resultado, memoria)
+
+    def _escribir(self, resultado, memoria):
+        if self.incluir_memoria and memoria is not None:
+            resultado = {**resultado, **memoria()}
+        self._archivo.write(json.dumps(resultado, separators=(",", ":")))
+        self._archivo.write("\n")
+        self.escritos += 1
+
+    def cerrar(self):
+        # Si la corrida se corta sin terminar (límite de ticks o procesos que
+        # nunca entran), el último tick también queda escrito
+        if self._pendiente is not None:
+            self._escribir(*self._pendiente)
+            self._pendiente = None
+        self._archivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+def leer_ticks(ruta):
+    """Genera los ticks escritos por un EscritorTicks, uno a la vez"""
+    abrir = gzip.open if ruta.endswith(".gz") else open
+    with abrir(ruta, "rt", encoding="utf-8") as f:
+        for linea in f:
+            if linea.strip():
+                yield json.loads(linea)
+
+
+class ResumenIncremental:
+    """
+    Promedios y máximos de la ejecución ponderados por tiempo, en memoria
+    constante. Cada tick registrado vale hasta el siguiente, así que los
+    ticks que el modo por eventos saltó (sin cambios) también cuentan.
+    """
+
+    def __init__(self, tick_inicial, estadisticas, procesos_en_espera):
+        self.eventos = 0
+        self.ticks_registrados = 0
+        self._desde = tick_inicial + 1  # primer tick en que vale el estado actual
+        self._actual = self._muestra(estadisticas, procesos_en_espera)
+        self._sumas = dict.fromkeys(self._actual, 0)
+        self._maximos = dict(self._actual)
+        self._ticks = 0
+
+    @staticmethod
+    def _muestra(estadisticas, procesos_en_espera):
+        return {
+            "ram_ocupada": estadisticas["ram_ocupada"],
+            "swap_ocupado": estadisticas["swap_ocupado"],
+            "fragmentacion_externa": estadisticas["fragmentacion_externa_ram"],
+            "procesos_en_espera": procesos_en_espera,
+        }
+
+    def _acumular(self, hasta):
+        """Suma el estado actual por los ticks [_desde, hasta)"""
+        peso = hasta - self._desde
+        if peso > 0:
+            for clave, valor in self._actual.items():
+                self._sumas[clave] += valor * peso
+            self._ticks += peso
+
+    def agregar(self, resultado):
+        self._acumular(resultado["tick"])
+        self._desde = resultado["tick"]
+        self._actual = self._muestra(resultado["estadisticas"], resultado["procesos_en_espera"])
+        for clave, valor in self._actual.items():
+            if valor > self._maximos[clave]:
+                self._maximos[clave] = valor
+        self.eventos += len(resultado["eventos"])
+        self.ticks_registrados += 1
+
+    def resultado(self, tick_final, ram_total, swap_total):
+        """Resumen hasta tick_final inclusive"""
+        self._acumular(tick_final + 1)
+        self._desde = tick_final + 1
+        ticks = self._ticks or 1
+        return {
+            "ticks_registrados": self.ticks_registrados,
+            "eventos": self.eventos,
+            "utilizacion_ram_media": round(self._sumas["ram_ocupada"] / ticks / ram_total * 100, 6),
+            "utilizacion_ram_maxima": self._maximos["ram_ocupada"] / ram_total * 100,
+            "utilizacion_swap_media": round(self._sumas["swap_ocupado"] / ticks / swap_total * 100, 6),
+            "utilizacion_swap_maxima": self._maximos["swap_ocupado"] / swap_total * 100,
+            "fragmentacion_externa_media": round(self._sumas["fragmentacion_externa"] / ticks, 6),
+            "procesos_en_espera_media": round(self._sumas["procesos_en_espera"] / ticks, 6),
+            "procesos_en_espera_maxima": self._maximos["procesos_en_espera"],
+        }
+
+
+def main(argv=None):
+    from scheduler import Scheduler
+
+    parser = argparse.ArgumentParser(description="Simulación completa con salida en streaming")
+    parser.add_argument("traza")
+    parser.add_argument("--salida", required=True, help="archivo .jsonl o .jsonl.gz")
+    parser.add_argument("--muestreo", type=int, default=1, help="escribir un tick cada tantos")
+    parser.add_argument("--incluir-memoria", action="store_true", help="incluir los bloques de RAM y SWAP")
+    parser.add_argument("--por-eventos", action="store_true")
+    parser.add_argument("--max-ticks", type=int, default=None, help="por defecto, sin límite")
+    parser.add_argument("--ram", type=int, default=1024)
+    parser.add_argument("--swap", type=int, default=2048)
+    parser.add_argument("--motor", default="lista")
+    args = parser.parse_args(argv)
+
+    scheduler = Scheduler(motor=args.motor, ruta_procesos=args.traza, ram_size=args.ram,
+                          swap_size=args.swap, registrar_deltas=False)
+    resultado = scheduler.ejecutar_hasta_el_final(
+        por_eventos=args.por_eventos, max_ticks=args.max_ticks, salida=args.salida,
+        muestreo=args.muestreo, incluir_memoria=args.incluir_memoria)
+    print(json.dumps(resultado, indent=2))
+
+
+if __name__ == "__main__":
+    main()
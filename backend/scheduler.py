@@ -1,29 +1,93 @@
 from memory_manager import MemoryManager
-import json
-from collections import deque
+from trazas import ColaLlegadas, TrazaLista, abrir_traza
+
+# Ticks seguidos sin que ningún proceso ejecute, llegue, entre o termine
+# tras los cuales una corrida sin límite se da por trabada (p. ej. un
+# proceso que expulsa a otro una y otra vez sin llegar a entrar)
+MAX_TICKS_SIN_PROGRESO = 10000
+from deltas import RegistroDeltas
+from checkpoints import HistorialCheckpoints, restaurar
+from metricas import Metricas
+from swap_io import DispositivoSwap
+from compactacion import Compactador
+from zswap import PoolComprimido
+from cola_espera import ColaEspera
+from salida import EscritorTicks, ResumenIncremental
+import heapq
+import time
 
 class Scheduler:
-    def __init__(self):
-        self.memory_manager = MemoryManager()
+    def __init__(self, motor="lista", ruta_procesos="data/procesos.json",
+                 ram_size=1024, swap_size=2048, estrategia=None, registrar_deltas=True,
+                 intervalo_checkpoint=None, max_checkpoints=None, instrumentar=False,
+                 ancho_banda_swap=None, latencia_swap=1, prefetch_swap=True,
+                 compactacion=None, umbral_compactacion=0.5, bloques_compactacion=8,
+                 particiones=None, politica_espera="fifo", envejecimiento=None,
+                 zswap=None, ratio_zswap=2.0, politica_zswap="lru", procesos=None):
+        """
+        procesos: lista de procesos a simular en vez de leer ruta_procesos
+        estrategia: si se indica, reemplaza la estrategia de todos los
+        procesos contiguos de la traza (para comparar estrategias)
+        registrar_deltas: guardar los cambios de bloques de cada tick para
+        que los clientes pidan solo diferencias (ver deltas.py)
+        intervalo_checkpoint: tomar un checkpoint cada tantos ticks para
+        poder ir a cualquier tick con ir_a_tick (ver checkpoints.py)
+        instrumentar: registrar contadores e histogramas (ver metricas.py)
+        ancho_banda_swap: KB por tick del dispositivo de swap; si se indica,
+        los procesos en SWAP se suspenden y vuelven a RAM con latencia_swap
+        y ese ancho de banda (ver swap_io.py)
+        compactacion: política de compactación de la RAM ("al_fallar",
+        "umbral" o "incremental"; ver compactacion.py)
+        particiones: tabla de particiones fijas para los procesos con
+        asignacion "fija" (cantidad iguales o lista de tamaños; ver particiones.py)
+        politica_espera: orden de reintento de la cola de espera ("fifo",
+        "prioridad" o "mas_corto"), con envejecimiento opcional en ticks
+        (ver cola_espera.py)
+        zswap: KB de RAM para el pool comprimido de procesos expulsados, con
+        ratio_zswap por defecto y política de desalojo politica_zswap
+        ("lru" o "mas_grande"; ver zswap.py)
+        """
+        self.metricas = Metricas() if instrumentar else None
+        swap_io = (DispositivoSwap(ancho_banda_swap, latencia_swap, prefetch_swap)
+                   if ancho_banda_swap else None)
+        compactador = (Compactador(compactacion, umbral_compactacion, bloques_compactacion)
+                       if compactacion else None)
+        pool = PoolComprimido(zswap, ratio_zswap, politica=politica_zswap) if zswap else None
+        self.memory_manager = MemoryManager(ram_size, swap_size, motor=motor, metricas=self.metricas,
+                                            swap_io=swap_io, compactador=compactador,
+                                            particiones=particiones, zswap=pool)
+        self.ruta_procesos = ruta_procesos
+        self.procesos = procesos
+        self.estrategia = estrategia
+        self.politica_espera = politica_espera
+        self.envejecimiento = envejecimiento
+        self.deltas = RegistroDeltas() if registrar_deltas else None
+        self.checkpoints = (HistorialCheckpoints(intervalo_checkpoint, max_checkpoints)
+                            if intervalo_checkpoint else None)
         self.load_processes()
         self.current_tick = 0
         self.procesos_terminados = []
-        self.procesos_en_espera = deque()
+        self.procesos_en_espera = ColaEspera(self.politica_espera, self.envejecimiento)
         self.finished = False
+        self.agenda_fines = []  # montículo (tick de fin, pid) para el modo por eventos
+        self.espera_estable = False
+        self.ticks_sin_progreso = 0
         self.estadisticas = {
             "procesos_ejecutados": 0,
             "procesos_fallidos": 0,
             "tiempo_total": 0,
             "swaps_realizados": 0
         }
+        if self.deltas is not None:
+            self.deltas.reset(self.memory_manager)
+        if self.checkpoints is not None:
+            self.checkpoints.limpiar()
+            self.checkpoints.guardar(self)
 
     def load_processes(self):
-        with open("data/procesos.json", "r") as f:
-            self.process_list = json.load(f)
-        
-        # Ordenar por tiempo de llegada
-        self.process_list.sort(key=lambda p: p.get("tiempo_llegada", 0))
-        self.procesos_pendientes = self.process_list.copy()
+        # .json se carga y ordena entero; .jsonl y .csv se leen bajo demanda
+        self.traza = TrazaLista(self.procesos) if self.procesos is not None else abrir_traza(self.ruta_procesos)
+        self.procesos_pendientes = ColaLlegadas(self.traza)
 
     def tick(self):
         """
@@ -38,6 +102,9 @@ class Scheduler:
 
         self.current_tick += 1
         eventos = []
+        metricas = self.metricas
+        if metricas is not None:
+            instante = time.perf_counter()
 
         # 1. Actualizar procesos activos y liberar terminados
         procesos_terminados = self.memory_manager.tick_procesos()
@@ -45,39 +112,73 @@ class Scheduler:
             self.procesos_terminados.append(pid)
             eventos.append(f"Proceso {pid} terminado y liberado")
             self.estadisticas["procesos_ejecutados"] += 1
+        swap_io = self.memory_manager.swap_io
+        if swap_io is not None:
+            for pid in swap_io.reanudados:
+                self.programar_fin(pid)
+                eventos.append(f"Proceso {pid} vuelve de SWAP a RAM")
+            swap_io.reanudados.clear()
+        zswap = self.memory_manager.zswap
+        if zswap is not None:
+            for pid in zswap.reanudados:
+                self.programar_fin(pid)
+                eventos.append(f"Proceso {pid} se descomprime a RAM")
+            zswap.reanudados.clear()
+        if metricas is not None:
+            instante = metricas.fase("1_procesos", instante)
 
         # 2. Procesar llegadas de nuevos procesos
         nuevas_llegadas = []
         while (self.procesos_pendientes and 
-               self.procesos_pendientes[0].get("tiempo_llegada", 0) <= self.current_tick):
-            proceso = self.procesos_pendientes.pop(0)
+               self.procesos_pendientes.primero().get("tiempo_llegada", 0) <= self.current_tick):
+            proceso = self.procesos_pendientes.popleft()
+            if self.estrategia is not None and proceso.get("mode", "contigua") == "contigua":
+                proceso = {**proceso, "estrategia": self.estrategia}
             nuevas_llegadas.append(proceso)
             eventos.append(f"Proceso {proceso['pid']} llega al sistema")
+        if metricas is not None:
+            instante = metricas.fase("2_llegadas", instante)
 
         # 3. Intentar asignar nuevas llegadas
         for proceso in nuevas_llegadas:
             try:
                 self.memory_manager.asignar_proceso(proceso)
+                self.programar_fin(proceso["pid"])
                 eventos.append(f"Proceso {proceso['pid']} asignado exitosamente")
             except MemoryError:
                 # Si no se puede asignar, ponerlo en cola de espera
-                self.procesos_en_espera.append(proceso)
+                self.procesos_en_espera.agregar(
+                    proceso, self.memory_manager.requisito_admision(proceso), self.current_tick)
                 eventos.append(f"Proceso {proceso['pid']} en cola de espera")
+        if metricas is not None:
+            instante = metricas.fase("3_asignacion", instante)
 
-        # 4. Intentar asignar procesos en espera
+        # 4. Intentar asignar procesos en espera (solo los que ahora pueden entrar)
         procesos_asignados_desde_espera = []
-        for _ in range(len(self.procesos_en_espera)):
-            if not self.procesos_en_espera:
-                break
-            
-            proceso = self.procesos_en_espera.popleft()
+        version = self.memory_manager.version
+        for proceso in self.procesos_en_espera.pasada(self.memory_manager, self.current_tick):
             try:
                 self.memory_manager.asignar_proceso(proceso)
-                eventos.append(f"Proceso {proceso['pid']} asignado desde cola de espera")
-                procesos_asignados_desde_espera.append(proceso['pid'])
             except MemoryError:
-                # Volver a ponerlo en espera
-                self.procesos_en_espera.append(proceso)
+                continue  # sigue en espera
+            self.procesos_en_espera.quitar(proceso)
+            self.programar_fin(proceso["pid"])
+            eventos.append(f"Proceso {proceso['pid']} asignado desde cola de espera")
+            procesos_asignados_desde_espera.append(proceso['pid'])
+
+        kb = self.memory_manager.compactar_en_segundo_plano()
+        if kb:
+            eventos.append(f"RAM compactada: {kb} KB movidos")
+
+        # Si ningún reintento (ni la compactación) modificó la memoria, volverán a fallar igual
+        # hasta que termine o llegue otro proceso
+        self.espera_estable = self.memory_manager.version == version
+
+        # Con el dispositivo ocioso, adelantar el regreso de procesos en SWAP
+        for pid in self.memory_manager.prefetch_swap():
+            eventos.append(f"Proceso {pid} se trae de SWAP por adelantado")
+        if metricas is not None:
+            instante = metricas.fase("4_espera", instante)
 
         # 5. Verificar si la simulación debe terminar
         if (not self.procesos_pendientes and 
@@ -85,68 +186,236 @@ class Scheduler:
             not self.memory_manager.procesos_activos):
             self.finished = True
             eventos.append("Simulación completada - todos los procesos terminaron")
+        if metricas is not None:
+            instante = metricas.fase("5_fin", instante)
+
+        progreso = (procesos_terminados or nuevas_llegadas or procesos_asignados_desde_espera
+                    or self.memory_manager.avanzados)
+        self.ticks_sin_progreso = 0 if progreso else self.ticks_sin_progreso + 1
 
         # 6. Preparar respuesta
+        self.estadisticas["swaps_realizados"] = self.memory_manager.swaps_realizados
         estadisticas = self.memory_manager.obtener_estadisticas()
+        if self.deltas is not None:
+            self.deltas.registrar()
+        if self.checkpoints is not None and self.checkpoints.pendiente(self.current_tick):
+            self.checkpoints.guardar(self)
+        if metricas is not None:
+            metricas.fase("6_respuesta", instante)
+            metricas.incrementar("simulador_ticks_total")
         
         return {
             "tick": self.current_tick,
-            "ram": self.memory_manager.ram,
-            "swap": self.memory_manager.swap,
             "eventos": eventos,
             "procesos_terminados": procesos_terminados,
             "procesos_en_espera": len(self.procesos_en_espera),
-            "procesos_pendientes": len(self.procesos_pendientes),
+            "procesos_pendientes": self.procesos_pendientes.pendientes(),
             "estadisticas": estadisticas,
             "finished": self.finished
         }
 
-    def ejecutar_hasta_el_final(self):
+    def vistas_memoria(self):
+        """Copia de los bloques de RAM y SWAP; tick() no los arma, se piden aparte"""
+        return {
+            "ram": [dict(b) for b in self.memory_manager.ram],
+            "swap": [dict(b) for b in self.memory_manager.swap],
+        }
+
+    def _bloques_actuales(self):
+        """Bloques de RAM y SWAP sin copiar (para serializarlos en el momento)"""
+        return {"ram": self.memory_manager.ram, "swap": self.memory_manager.swap}
+
+    def programar_fin(self, pid):
+        """Registra en la agenda el tick en que terminará un proceso recién asignado"""
+        info = self.memory_manager.procesos_activos[pid]
+        heapq.heappush(self.agenda_fines, (self.current_tick + max(1, info["tiempo_restante"]), pid))
+
+    def siguiente_evento(self):
+        """
+        Tick del próximo evento: fin de un proceso, llegada de uno nuevo o un
+        reintento de la cola de espera que puede cambiar algo.
+        Devuelve None si ya no puede ocurrir nada.
         """
-        Ejecuta la simulación completa hasta que todos los procesos terminen
+        if self.procesos_en_espera and not self.espera_estable:
+            return self.current_tick + 1
+        swap_io = self.memory_manager.swap_io
+        if swap_io is not None and (swap_io.pendiente() or (self.memory_manager.zswap is not None
+                                                             and len(self.memory_manager.zswap))):
+            # Transferencias en curso o procesos suspendidos (en SWAP o comprimidos): cada tick cuenta
+            return self.current_tick + 1
+        compactador = self.memory_manager.compactador
+        if compactador is not None and compactador.pendiente:
+            # Compactación incremental a medias
+            return self.current_tick + 1
+
+        activos = self.memory_manager.procesos_activos
+        candidatos = []
+        while self.agenda_fines:
+            fin, pid = self.agenda_fines[0]
+            info = activos.get(pid)
+            if info is not None and self.current_tick + max(1, info["tiempo_restante"]) == fin:
+                candidatos.append(fin)
+                break
+            heapq.heappop(self.agenda_fines)  # entrada obsoleta
+
+        if self.procesos_pendientes:
+            llegada = self.procesos_pendientes.primero().get("tiempo_llegada", 0)
+            candidatos.append(max(self.current_tick + 1, llegada))
+
+        return min(candidatos) if candidatos else None
+
+    def saltar_ticks(self, ticks):
+        """Avanza `ticks` ticks ociosos sin ejecutarlos uno a uno"""
+        if ticks > 0:
+            self.memory_manager.avanzar_tiempo(ticks)
+            self.current_tick += ticks
+
+    def ir_a_tick(self, tick):
+        """
+        Lleva la simulación al tick indicado, hacia atrás o hacia adelante:
+        restaura el checkpoint más cercano anterior (o reinicia si no hay) y
+        avanza por eventos desde ahí. Devuelve el tick alcanzado, que es
+        menor si la simulación termina antes.
+        """
+        encontrado = self.checkpoints.anterior(tick) if self.checkpoints is not None else None
+        if tick < self.current_tick or (encontrado is not None and encontrado[0] > self.current_tick):
+            if encontrado is None:
+                self.reset()
+            else:
+                restaurar(self, encontrado[1])
+
+        while not self.finished and self.current_tick < tick:
+            siguiente = self.siguiente_evento()
+            if siguiente is None or siguiente > tick:
+                self.saltar_ticks(tick - self.current_tick)
+                break
+            self.saltar_ticks(siguiente - self.current_tick - 1)
+            self.tick()
+        return self.current_tick
+
+    def iterar_ticks(self, por_eventos=False, max_ticks=None, max_sin_progreso=MAX_TICKS_SIN_PROGRESO):
         """
+        Genera el resultado de cada tick hasta que la simulación termine,
+        pasen max_ticks ticks, (sin límite) ya no pueda ocurrir nada o pasen
+        max_sin_progreso ticks seguidos sin progreso (None: sin ese corte).
+        Con por_eventos=True salta los ticks en que no ocurre nada.
+        El motivo queda en self.motivo_fin: "terminada", "max_ticks",
+        "sin_eventos", "sin_progreso" o "error".
+        """
+        limite = None if max_ticks is None else self.current_tick + max_ticks
+        self.ticks_sin_progreso = 0
+        self.motivo_fin = "terminada" if self.finished else "max_ticks"
+        while not self.finished and (limite is None or self.current_tick < limite):
+            if por_eventos or limite is None:
+                siguiente = self.siguiente_evento()
+                if siguiente is None or (limite is not None and siguiente > limite):
+                    # Sin límite y sin eventos posibles la simulación no terminaría nunca
+                    if limite is not None:
+                        self.saltar_ticks(limite - self.current_tick)
+                    else:
+                        self.motivo_fin = "sin_eventos"
+                    break
+                if por_eventos:
+                    self.saltar_ticks(siguiente - self.current_tick - 1)
+
+            tick_result = self.tick()
+            yield tick_result
+
+            # Si hay un error crítico
+            if tick_result.get("error"):
+                self.motivo_fin = "error"
+                break
+            if max_sin_progreso is not None and self.ticks_sin_progreso >= max_sin_progreso:
+                self.motivo_fin = "sin_progreso"
+                break
+        if self.finished:
+            self.motivo_fin = "terminada"
+
+    def ejecutar_hasta_el_final(self, por_eventos=False, max_ticks=None, salida=None, muestreo=1,
+                                incluir_memoria=False):
+        """
+        Ejecuta la simulación completa hasta que todos los procesos terminen.
+        Con por_eventos=True salta directamente de un evento al siguiente;
+        el estado final y los eventos son los mismos que tick a tick, pero
+        "ticks" solo incluye los ticks en que ocurrió algo.
+        Si el Scheduler tiene intervalo_checkpoint, va tomando checkpoints.
+        max_ticks: límite de ticks (por defecto, sin límite: termina cuando
+        ya no puede ocurrir nada o tras MAX_TICKS_SIN_PROGRESO ticks sin
+        progreso). Si se corta por el límite o por falta de progreso,
+        "exitoso" es False; "motivo_fin" dice por qué terminó (ver iterar_ticks)
+        salida: escribir los ticks en ese archivo .jsonl(.gz) en vez de
+        devolverlos, con muestreo (ver salida.py)
+        incluir_memoria: agregar a cada tick los bloques "ram" y "swap"
+        """
+        escritor = EscritorTicks(salida, muestreo, incluir_memoria) if salida else None
         resultado_completo = {
             "ticks": [],
             "resumen": {},
             "exitoso": True
         }
-        
-        tick_count = 0
-        max_ticks = 1000  # Prevenir bucles infinitos
-        
-        while not self.finished and tick_count < max_ticks:
-            tick_result = self.tick()
-            resultado_completo["ticks"].append(tick_result)
-            tick_count += 1
-            
-            # Si hay un error crítico
-            if tick_result.get("error"):
-                resultado_completo["exitoso"] = False
-                break
+        if escritor is not None:
+            del resultado_completo["ticks"]
+
+        tick_inicial = self.current_tick
+        evolucion = ResumenIncremental(tick_inicial, self.memory_manager.obtener_estadisticas(),
+                                       len(self.procesos_en_espera))
+        try:
+            for tick_result in self.iterar_ticks(por_eventos, max_ticks):
+                evolucion.agregar(tick_result)
+                if escritor is not None:
+                    # Los bloques se leen solo para los ticks que el muestreo escribe
+                    escritor.escribir(tick_result, self._bloques_actuales)
+                else:
+                    if incluir_memoria:
+                        tick_result.update(self.vistas_memoria())
+                    resultado_completo["ticks"].append(tick_result)
+                if tick_result.get("error"):
+                    resultado_completo["exitoso"] = False
+        finally:
+            if escritor is not None:
+                escritor.cerrar()
+        # Cortada por el límite o por quedar trabada: no terminó
+        resultado_completo["motivo_fin"] = self.motivo_fin
+        if self.motivo_fin in ("max_ticks", "sin_progreso"):
+            resultado_completo["exitoso"] = False
 
         # Generar resumen final
         resultado_completo["resumen"] = {
-            "ticks_totales": tick_count,
+            "ticks_totales": self.current_tick - tick_inicial,
             "procesos_ejecutados": len(self.procesos_terminados),
             "procesos_fallidos": len(self.procesos_en_espera),
             "eficiencia_memoria": self.calcular_eficiencia(),
-            "procesos_terminados": self.procesos_terminados
+            "evolucion": evolucion.resultado(self.current_tick, self.memory_manager.ram_size,
+                                             self.memory_manager.swap_size),
         }
-        
+        if escritor is None:
+            # Con salida a archivo los pids ya están en cada tick escrito
+            resultado_completo["resumen"]["procesos_terminados"] = self.procesos_terminados
+        else:
+            resultado_completo["salida"] = {"ruta": salida, "ticks_escritos": escritor.escritos}
+        if self.memory_manager.swap_io is not None:
+            resultado_completo["resumen"]["swap_io"] = dict(self.memory_manager.swap_io.estadisticas)
+        if self.memory_manager.compactador is not None:
+            resultado_completo["resumen"]["compactacion"] = dict(self.memory_manager.compactador.estadisticas)
+        if self.memory_manager.zswap is not None:
+            resultado_completo["resumen"]["zswap"] = self.memory_manager.zswap.resumen()
+        resultado_completo["resumen"]["cola_espera"] = dict(self.procesos_en_espera.estadisticas)
+
         return resultado_completo
 
     def calcular_eficiencia(self):
         """Calcula métricas de eficiencia del gestor"""
         stats = self.memory_manager.obtener_estadisticas()
         
-        total_procesos = len(self.process_list)
+        total_procesos = self.procesos_pendientes.total_procesos()
         procesos_exitosos = len(self.procesos_terminados)
         
         return {
             "tasa_exito": (procesos_exitosos / total_procesos) * 100 if total_procesos > 0 else 0,
             "utilizacion_ram": (stats["ram_ocupada"] / stats["ram_total"]) * 100,
             "utilizacion_swap": (stats["swap_ocupado"] / stats["swap_total"]) * 100,
-            "fragmentacion": stats["fragmentacion_ram"]
+            "fragmentacion": stats["fragmentacion_ram"],
+            "fragmentacion_externa": stats["fragmentacion_externa_ram"]
         }
 
     def obtener_proceso_info(self, pid):
@@ -156,26 +425,38 @@ class Scheduler:
         return None
 
     def reset(self):
-        """Reinicia completamente la simulación"""
+        """Reinicia completamente la simulación (sin volver a leer la traza .json)"""
         self.memory_manager.reset()
-        self.load_processes()
+        self.procesos_pendientes = ColaLlegadas(self.traza)
         self.current_tick = 0
         self.procesos_terminados = []
-        self.procesos_en_espera = deque()
+        self.procesos_en_espera = ColaEspera(self.politica_espera, self.envejecimiento)
         self.finished = False
+        self.agenda_fines = []  # montículo (tick de fin, pid) para el modo por eventos
+        self.espera_estable = False
+        self.ticks_sin_progreso = 0
         self.estadisticas = {
             "procesos_ejecutados": 0,
             "procesos_fallidos": 0,
             "tiempo_total": 0,
             "swaps_realizados": 0
         }
+        if self.deltas is not None:
+            self.deltas.reset(self.memory_manager)
+        if self.checkpoints is not None:
+            self.checkpoints.limpiar()
+            self.checkpoints.guardar(self)
 
-    def obtener_estado_completo(self):
-        """Obtiene el estado completo del sistema"""
-        estado_memoria = self.memory_manager.obtener_estado_memoria()
+    def obtener_estado_completo(self, incluir_bloques=True):
+        """
+        Obtiene el estado completo del sistema. Con incluir_bloques=False se
+        omiten las listas de bloques (el cliente las mantiene con deltas).
+        """
+        estado_memoria = self.memory_manager.obtener_estado_memoria(incluir_bloques)
         
         return {
             "tick_actual": self.current_tick,
+            "secuencia": self.deltas.secuencia if self.deltas is not None else None,
             "memoria": estado_memoria,
             "procesos": {
                 "activos": estado_memoria["procesos_activos"],
@@ -197,7 +478,9 @@ class Scheduler:
                         "tiempo_llegada": p.get("tiempo_llegada", 0)
                     }
                     for p in self.procesos_pendientes
-                ]
+                ],
+                # En .jsonl/.csv "pendientes" son solo los ya leídos y el total es None
+                "pendientes_total": self.procesos_pendientes.pendientes()
             },
             "metricas": {
                 "uso_ram": (estado_memoria["ram"]["usada"] / estado_memoria["ram"]["total"]) * 100,
@@ -0,0 +1,118 @@
+"""
+Registro de simulaciones por sesión.
+
+Cada sesión tiene su propio Scheduler y su propio lock; quien la use debe
+tomar `sesion.lock` mientras toca el scheduler y, si lo cambió, llamar a
+`sesion.actualizar_memoria()` antes de soltarlo. El registro está acotado
+por número de sesiones, tiempo de inactividad y memoria estimada, y
+expulsa primero las sesiones usadas hace más tiempo (LRU). Para eso lee
+la última estimación guardada, sin tomar el lock de cada sesión.
+
+Las sesiones viven en la memoria del proceso: con un servidor de varios
+workers, cada worker tiene su propio registro y el balanceador debe
+mantener a cada cliente en el mismo worker.
+"""
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from scheduler import Scheduler
+
+SESION_POR_DEFECTO = "default"
+# Estimación gruesa del costo en memoria de una simulación
+BYTES_POR_BLOQUE = 200
+BYTES_POR_PROCESO = 600
+# Checkpoints de cada sesión, para poder ir a cualquier tick (ver checkpoints.py)
+INTERVALO_CHECKPOINT = 50
+MAX_CHECKPOINTS = 64
+
+
+class Sesion:
+    def __init__(self, id_sesion, scheduler):
+        self.id = id_sesion
+        self.scheduler = scheduler
+        self.lock = threading.RLock()
+        self.ultimo_acceso = time.monotonic()
+        self.mapas = {}  # región -> (memory_manager, versión, IndiceBloques) para /memory-map
+        self.memoria = self.memoria_estimada()  # última estimación, leída sin el lock
+
+    def memoria_estimada(self):
+        """Recorre el scheduler: hay que tener sesion.lock"""
+        mm = self.scheduler.memory_manager
+        bloques = mm.motor_ram.num_bloques() + mm.motor_swap.num_bloques()
+        procesos = (len(mm.procesos_activos) + len(self.scheduler.procesos_en_espera)
+                    + len(self.scheduler.procesos_terminados))
+        checkpoints = self.scheduler.checkpoints
+        return (bloques * BYTES_POR_BLOQUE + procesos * BYTES_POR_PROCESO
+                + (checkpoints.bytes_totales() if checkpoints is not None else 0))
+
+    def actualizar_memoria(self):
+        self.memoria = self.memoria_estimada()
+
+    def resumen(self):
+        return {
+            "id": self.id,
+            "tick_actual": self.scheduler.current_tick,
+            "finished": self.scheduler.finished,
+            "inactiva_s": round(time.monotonic() - self.ultimo_acceso, 1),
+            "memoria_estimada": self.memoria
+        }
+
+
+class RegistroSesiones:
+    def __init__(self, max_sesiones=64, inactividad_max_s=1800, memoria_max=256 * 1024 * 1024):
+        self.max_sesiones = max_sesiones
+        self.inactividad_max_s = inactividad_max_s
+        self.memoria_max = memoria_max
+        self._sesiones = OrderedDict()  # de la menos a la más recientemente usada
+        self._lock = threading.Lock()
+
+    def crear(self, id_sesion=None, **config):
+        """Crea una sesión con su propio Scheduler(**config) y devuelve la sesión"""
+        config.setdefault("intervalo_checkpoint", INTERVALO_CHECKPOINT)
+        config.setdefault("max_checkpoints", MAX_CHECKPOINTS)
+        sesion = Sesion(id_sesion or uuid.uuid4().hex, Scheduler(**config))
+        with self._lock:
+            self._sesiones[sesion.id] = sesion
+            self._expulsar(proteger=sesion.id)
+        return sesion
+
+    def obtener(self, id_sesion):
+        """Devuelve la sesión (marcándola como usada) o None si no existe o fue expulsada"""
+        with self._lock:
+            self._expulsar(proteger=id_sesion)
+            sesion = self._sesiones.get(id_sesion)
+            if sesion is not None:
+                sesion.ultimo_acceso = time.monotonic()
+                self._sesiones.move_to_end(id_sesion)
+            return sesion
+
+    def eliminar(self, id_sesion):
+        with self._lock:
+            return self._sesiones.pop(id_sesion, None) is not None
+
+    def sesiones(self):
+        """Sesiones vivas, sin marcarlas como usadas"""
+        with self._lock:
+            return list(self._sesiones.values())
+
+    def listar(self):
+        return [s.resumen() for s in self.sesiones()]
+
+    def _expulsar(self, proteger=None):
+        """Aplica los límites; la sesión por defecto y `proteger` nunca se expulsan"""
+        ahora = time.monotonic()
+        candidatas = [s for s in self._sesiones.values()
+                      if s.id not in (SESION_POR_DEFECTO, proteger)]
+
+        for sesion in candidatas:
+            if ahora - sesion.ultimo_acceso > self.inactividad_max_s:
+                del self._sesiones[sesion.id]
+        candidatas = [s for s in candidatas if s.id in self._sesiones]
+
+        memoria = sum(s.memoria for s in self._sesiones.values())
+        while candidatas and (len(self._sesiones) > self.max_sesiones or memoria > self.memoria_max):
+            sesion = candidatas.pop(0)
+            memoria -= sesion.memoria
+            del self._sesiones[sesion.id]
@@ -0,0 +1,136 @@
+"""
+Asignador slab por clases de tamaño para el modo "slab".
+
+Pensado para procesos chicos y frecuentes: cada tamaño se redondea a la
+menor clase que lo contiene y se sirve desde un slab de esa clase, un
+bloque de `tamano_slab` KB reservado de la RAM y dividido en objetos
+iguales. Asignar y liberar un objeto no toca el motor de la RAM salvo
+para reservar un slab nuevo o devolver uno que quedó vacío.
+
+Los tamaños mayores que la clase más grande no pasan por los slabs: el
+MemoryManager los asigna como una partición variable (tipo "slab_grande").
+"""
+from bisect import bisect_left, insort
+from heapq import heappop, heappush
+
+CLASES = (8, 16, 32, 64, 128)  # KB
+TAMANO_SLAB = 256              # KB
+
+
+class _Slab:
+    __slots__ = ("clase", "libres", "ocupados")
+
+    def __init__(self, clase, objetos):
+        self.clase = clase
+        self.libres = list(range(objetos))  # montículo de índices libres
+        self.ocupados = {}                  # índice -> pid
+
+
+class AsignadorSlab:
+    def __init__(self, clases=CLASES, tamano_slab=TAMANO_SLAB):
+        if max(clases) > tamano_slab:
+            raise ValueError("Cada clase debe caber en un slab")
+        self.clases = tuple(sorted(clases))
+        self.tamano_slab = tamano_slab
+        self.reset()
+
+    def reset(self):
+        self.slabs = {}       # número -> _Slab
+        self._parciales = {clase: [] for clase in self.clases}  # números de slabs con lugar, en orden
+        self._asignados = {}  # pid -> (número, índice, size pedido)
+        self._numerados = 0
+        self.asignaciones = 0
+        self.kb_asignados = 0
+        self.kb_solicitados = 0
+
+    @staticmethod
+    def marca(numero):
+        return f"[slab {numero}]"
+
+    @staticmethod
+    def numero(marca):
+        return int(marca[6:-1])
+
+    def clase(self, size):
+        """Menor clase que contiene `size`, o None si es un objeto grande"""
+        i = bisect_left(self.clases, size)
+        return self.clases[i] if i < len(self.clases) else None
+
+    def agregar_slab(self, clase):
+        """Registra un slab de la clase y devuelve la marca con que se reservó en la RAM"""
+        self._numerados += 1
+        self.slabs[self._numerados] = _Slab(clase, self.tamano_slab // clase)
+        self._parciales[clase].append(self._numerados)
+        return self.marca(self._numerados)
+
+    def cabe(self, size):
+        """True si algún slab de la clase de `size` tiene lugar"""
+        return bool(self._parciales[self.clase(size)])
+
+    def asignar(self, pid, size):
+        """Toma el objeto libre más bajo del primer slab con lugar; False si no hay ninguno"""
+        clase = self.clase(size)
+        parciales = self._parciales[clase]
+        if not parciales:
+            return False
+        numero = parciales[0]
+        slab = self.slabs[numero]
+        indice = heappop(slab.libres)
+        if not slab.libres:
+            parciales.pop(0)
+        slab.ocupados[indice] = pid
+        self._asignados[pid] = (numero, indice, size)
+        self.asignaciones += 1
+        self.kb_asignados += clase
+        self.kb_solicitados += size
+        return True
+
+    def liberar(self, pid):
+        """Libera el objeto del proceso; devuelve la marca de su slab si quedó vacío (y lo descarta)"""
+        asignado = self._asignados.pop(pid, None)
+        if asignado is None:
+            return None
+        numero, indice, size = asignado
+        slab = self.slabs[numero]
+        del slab.ocupados[indice]
+        self.kb_asignados -= slab.clase
+        self.kb_solicitados -= size
+        parciales = self._parciales[slab.clase]
+        if not slab.libres:
+            insort(parciales, numero)
+        if not slab.ocupados:
+            del self.slabs[numero]
+            del parciales[bisect_left(parciales, numero)]
+            return self.marca(numero)
+        heappush(slab.libres, indice)
+        return None
+
+    def tamano(self, pid):
+        """KB que ocupa el proceso (su clase), o None si no está en un slab"""
+        asignado = self._asignados.get(pid)
+        return self.slabs[asignado[0]].clase if asignado is not None else None
+
+    def bloques_arena(self, marca):
+        """Objetos del slab en orden de dirección, con el formato de la vista de RAM"""
+        slab = self.slabs[self.numero(marca)]
+        objetos = self.tamano_slab // slab.clase
+        bloques = [{"pid": slab.ocupados[i], "size": slab.clase, "tipo": "slab"} if i in slab.ocupados
+                   else {"pid": None, "size": slab.clase, "tipo": "slab_libre"}
+                   for i in range(objetos)]
+        resto = self.tamano_slab - objetos * slab.clase
+        if resto:
+            bloques.append({"pid": None, "size": resto, "tipo": "slab_libre"})
+        return bloques
+
+    def estadisticas(self):
+        por_clase = {}
+        for slab in self.slabs.values():
+            por_clase[slab.clase] = por_clase.get(slab.clase, 0) + 1
+        return {
+            "slabs": len(self.slabs),
+            "slabs_por_clase": dict(sorted(por_clase.items())),
+            "kb_reservados": len(self.slabs) * self.tamano_slab,
+            "kb_asignados": self.kb_asignados,
+            "kb_solicitados": self.kb_solicitados,
+            "fragmentacion_interna": 1 - self.kb_solicitados / self.kb_asignados if self.kb_asignados else 0.0,
+        }
@@ -0,0 +1,125 @@
+"""
+Simulación de E/S de swap: traer procesos de vuelta a RAM con costo.
+
+Con un DispositivoSwap configurado, un proceso en SWAP queda suspendido
+(no avanza su tiempo_restante) hasta volver a RAM:
+
+- Fallo de página: una vez escrito en SWAP, en cada tick el proceso pide
+  sus páginas. Si cabe, se le reservan marcos en RAM y se encola la lectura.
+- Prefetch: al final de cada tick, si el dispositivo está ocioso y hay RAM
+  libre, se adelanta la lectura de procesos suspendidos (prioridad más alta
+  primero y, entre iguales, el usado más recientemente), evitando su fallo.
+- Las transferencias se atienden en orden, una a la vez: cada una espera
+  `latencia` ticks y luego avanza `ancho_banda` KB por tick (el presupuesto
+  sobrante pasa a la siguiente). Las escrituras de mover_a_swap comparten
+  la cola con las lecturas, así que un swap-out retrasa los swap-ins.
+- Control de carga: mientras haya procesos suspendidos, el swap inteligente
+  no expulsa a nadie más (los nuevos solo usan RAM libre). Sin esto, un
+  proceso que vuelve a RAM puede ser expulsado de nuevo antes de avanzar.
+
+Sin dispositivo (por defecto) la simulación se comporta como siempre: la
+salida a SWAP es instantánea y el proceso sigue ejecutándose desde allí.
+"""
+from collections import deque
+
+from paginacion import paginas_para
+
+
+class _Transferencia:
+    __slots__ = ("pid", "entrada", "restante", "espera")
+
+    def __init__(self, pid, entrada, size, latencia):
+        self.pid = pid
+        self.entrada = entrada  # True: SWAP -> RAM
+        self.restante = size
+        self.espera = latencia
+
+
+class DispositivoSwap:
+    def __init__(self, ancho_banda=256, latencia=1, prefetch=True):
+        """
+        ancho_banda: KB transferidos por tick
+        latencia: ticks de espera antes de empezar cada transferencia
+        """
+        if ancho_banda <= 0:
+            raise ValueError("ancho_banda debe ser positivo")
+        self.ancho_banda = ancho_banda
+        self.latencia = latencia
+        self.prefetch = prefetch
+        self.reset()
+
+    def reset(self):
+        self._cola = deque()
+        self.suspendidos = set()   # pids en SWAP que todavía no volvieron a RAM
+        self.escribiendo = set()   # pids cuya escritura a SWAP no terminó
+        self.en_transito = set()   # pids con lectura encolada (marcos ya reservados)
+        self.demandados = set()    # pids que fallaron y esperan RAM para su lectura
+        self.reanudados = []       # pids que volvieron a RAM (el Scheduler los reprograma)
+        self.estadisticas = {
+            "fallos_pagina": 0,
+            "swap_ins": 0,
+            "prefetches": 0,
+            "kb_leidos": 0,
+            "kb_escritos": 0,
+            "ticks_ocupado": 0,
+            "ticks_suspendidos": 0,
+        }
+
+    def ocioso(self):
+        return not self._cola
+
+    def pendiente(self):
+        """True si hay transferencias o procesos esperando para volver a RAM"""
+        return bool(self._cola or self.suspendidos)
+
+    def escribir(self, pid, size):
+        self.suspendidos.add(pid)
+        self.escribiendo.add(pid)
+        self._cola.append(_Transferencia(pid, False, size, self.latencia))
+        self.estadisticas["kb_escritos"] += size
+
+    def leer(self, pid, size, prefetch=False):
+        self._cola.append(_Transferencia(pid, True, size, self.latencia))
+        self.en_transito.add(pid)
+        self.demandados.discard(pid)
+        self.estadisticas["kb_leidos"] += size
+        self.estadisticas["prefetches" if prefetch else "swap_ins"] += 1
+
+    def fallo(self, pid, size):
+        """Un proceso suspendido necesita sus páginas; cuenta el fallo una sola vez"""
+        if pid not in self.demandados and pid not in self.en_transito and pid not in self.escribiendo:
+            self.demandados.add(pid)
+            self.estadisticas["fallos_pagina"] += paginas_para(size)
+
+    def avanzar(self):
+        """Avanza un tick de transferencias; devuelve los pids cuya lectura terminó"""
+        terminados = []
+        if self._cola:
+            self.estadisticas["ticks_ocupado"] += 1
+        presupuesto = self.ancho_banda
+        while self._cola and presupuesto > 0:
+            transferencia = self._cola[0]
+            if transferencia.espera > 0:
+                transferencia.espera -= 1
+                break
+            movido = min(presupuesto, transferencia.restante)
+            transferencia.restante -= movido
+            presupuesto -= movido
+            if transferencia.restante == 0:
+                self._cola.popleft()
+                if transferencia.entrada:
+                    self.en_transito.discard(transferencia.pid)
+                    self.suspendidos.discard(transferencia.pid)
+                    terminados.append(transferencia.pid)
+                else:
+                    self.escribiendo.discard(transferencia.pid)
+        return terminados
+
+    def olvidar(self, pid):
+        """El proceso terminó o se liberó: descarta su lectura pendiente"""
+        self.suspendidos.discard(pid)
+        self.escribiendo.discard(pid)
+        self.demandados.discard(pid)
+        if pid in self.en_transito:
+            self.en_transito.discard(pid)
+            self._cola = deque(t for t in self._cola if not (t.entrada and t.pid == pid))
@@ -0,0 +1,217 @@
+"""
+Fuentes de trazas de procesos.
+
+- .json: lista completa (formato original); se carga y ordena por llegada.
+  Una lista de procesos ya en memoria se usa igual (TrazaLista).
+- .jsonl: un proceso JSON por línea, leído bajo demanda.
+- .csv: cabecera con los campos del proceso; "segmentos" separados por ";".
+
+Las trazas .jsonl y .csv se leen con generadores y deben venir ordenadas
+por tiempo_llegada, de modo que una traza de millones de procesos se
+reproduce con memoria acotada y sin esperar a parsearla entera. Cada
+proceso leído viene con la posición en bytes donde sigue la lectura, para
+retomarla desde un checkpoint sin releer el archivo.
+"""
+import csv
+import json
+import os
+from collections import deque
+
+CAMPOS_ENTEROS = {"size", "priority", "tiempo_llegada", "tiempo_ejecucion", "tiempo_cpu"}
+CAMPOS_REALES = {"ratio_compresion"}
+
+
+class TrazaLista:
+    """Procesos ya en memoria (p. ej. las réplicas de montecarlo.py)"""
+
+    def __init__(self, procesos):
+        # Ordenar por tiempo de llegada
+        self.procesos = sorted(procesos, key=lambda p: p.get("tiempo_llegada", 0))
+        self.total = len(self.procesos)
+
+    def __iter__(self):
+        return iter(self.procesos)
+
+
+class TrazaJSON(TrazaLista):
+    def __init__(self, ruta):
+        with open(ruta, "r") as f:
+            super().__init__(json.load(f))
+
+
+class TrazaJSONL:
+    total = None  # desconocido hasta terminar de leer
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+
+    def __iter__(self):
+        return (proceso for proceso, _ in self.leer())
+
+    def leer(self, posicion=None):
+        """Genera (proceso, posición tras leerlo); se retoma desde una posición sin releer lo anterior"""
+        offset, leidos, anterior = posicion or (0, 0, None)
+        with open(self.ruta, "rb") as f:
+            lineas = _Lineas(f, offset)
+            for linea in lineas:
+                if linea.strip():
+                    proceso = json.loads(linea)
+                    leidos, anterior = _verificar_orden(proceso, leidos, anterior, self.ruta)
+                    yield proceso, (lineas.offset, leidos, anterior)
+
+
+class TrazaCSV:
+    total = None
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+
+    def __iter__(self):
+        return (proceso for proceso, _ in self.leer())
+
+    def leer(self, posicion=None):
+        """Como TrazaJSONL.leer; la cabecera se vuelve a leer al retomar"""
+        with open(self.ruta, "rb") as f:
+            lineas = _Lineas(f, 0)
+            campos = next(csv.reader(lineas), None)
+            if campos is None:
+                return
+            offset, leidos, anterior = posicion or (lineas.offset, 0, None)
+            lineas.ir_a(offset)
+            # csv.reader toma de `lineas` solo las líneas de cada fila, así que
+            # lineas.offset queda justo después de la fila recién leída
+            for fila in csv.reader(lineas):
+                if not fila:
+                    continue
+                proceso = _proceso_csv(dict(zip(campos, fila)))
+                leidos, anterior = _verificar_orden(proceso, leidos, anterior, self.ruta)
+                yield proceso, (lineas.offset, leidos, anterior)
+
+
+class _Lineas:
+    """Líneas de un archivo abierto en binario, con el offset en bytes tras la última leída"""
+
+    def __init__(self, f, offset):
+        self._f = f
+        self.ir_a(offset)
+
+    def ir_a(self, offset):
+        self._f.seek(offset)
+        self.offset = offset
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        linea = self._f.readline()
+        if not linea:
+            raise StopIteration
+        self.offset += len(linea)
+        return linea.decode("utf-8")
+
+
+def _proceso_csv(fila):
+    proceso = {}
+    for campo, valor in fila.items():
+        if valor is None or valor == "":
+            continue
+        if campo in CAMPOS_ENTEROS:
+            proceso[campo] = int(valor)
+        elif campo in CAMPOS_REALES:
+            proceso[campo] = float(valor)
+        elif campo == "segmentos":
+            proceso[campo] = [int(s) for s in valor.split(";")]
+        else:
+            proceso[campo] = valor
+    return proceso
+
+
+def _verificar_orden(proceso, leidos, anterior, ruta):
+    """Devuelve (leídos, llegada) tras el proceso; error si llega antes que el anterior"""
+    llegada = proceso.get("tiempo_llegada", 0)
+    if anterior is not None and llegada < anterior:
+        raise ValueError(f"La traza {ruta} no está ordenada por tiempo_llegada (proceso #{leidos + 1})")
+    return leidos + 1, llegada
+
+
+FORMATOS = {
+    ".json": TrazaJSON,
+    ".jsonl": TrazaJSONL,
+    ".csv": TrazaCSV,
+}
+
+
+def abrir_traza(ruta):
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension not in FORMATOS:
+        raise ValueError(f"Formato de traza no soportado: {ruta}")
+    return FORMATOS[extension](ruta)
+
+
+class ColaLlegadas:
+    """
+    Procesos pendientes de llegar, en orden de llegada. Una traza .json ya
+    está en memoria y se recorre con un índice; de las demás solo se lee lo
+    necesario para saber cuál es el siguiente.
+    estado: lo que devolvió estado() en un checkpoint, para retomar sin
+    volver a leer ni copiar la traza desde el principio.
+    """
+
+    def __init__(self, fuente, estado=None):
+        self.total = fuente.total
+        self.consumidos = estado["consumidos"] if estado else 0
+        if self.total is not None:
+            self._procesos = fuente.procesos
+        else:
+            self._procesos = None
+            self._buffer = deque(estado["leidos"]) if estado else deque()
+            self._posicion = estado["posicion"] if estado else None  # en la fuente, tras el último leído
+            self._fuente = fuente.leer(self._posicion)
+
+    def _llenar(self):
+        if not self._buffer:
+            siguiente = next(self._fuente, None)
+            if siguiente is not None:
+                proceso, self._posicion = siguiente
+                self._buffer.append(proceso)
+        return bool(self._buffer)
+
+    def __bool__(self):
+        if self._procesos is not None:
+            return self.consumidos < self.total
+        return self._llenar()
+
+    def pendientes(self):
+        """Procesos que faltan llegar, o None si la fuente no sabe su total (.jsonl/.csv)"""
+        if self.total is not None:
+            return self.total - self.consumidos
+        return None
+
+    def __iter__(self):
+        if self._procesos is not None:
+            return (self._procesos[i] for i in range(self.consumidos, self.total))
+        return iter(self._buffer)
+
+    def primero(self):
+        if self._procesos is not None:
+            return self._procesos[self.consumidos] if self else None
+        return self._buffer[0] if self._llenar() else None
+
+    def popleft(self):
+        self.consumidos += 1
+        if self._procesos is not None:
+            return self._procesos[self.consumidos - 1]
+        self._llenar()
+        return self._buffer.popleft()
+
+    def total_procesos(self):
+        """Total de la traza si se conoce; si no, los procesos leídos hasta ahora"""
+        if self.total is not None:
+            return self.total
+        return self.consumidos + len(self._buffer)
+
+    def estado(self):
+        """Posición en la traza para un checkpoint (los leídos por adelantado y dónde seguir)"""
+        if self._procesos is not None:
+            return {"consumidos": self.consumidos}
+        return {"consumidos": self.consumidos, "leidos": list(self._buffer), "posicion": self._posicion}
@@ -0,0 +1,135 @@
+"""
+Nivel de memoria comprimida (estilo zswap) entre la RAM y el SWAP.
+
+Con un PoolComprimido, el MemoryManager reserva `capacidad` KB de la RAM
+para el pool y mover_a_swap guarda ahí al proceso expulsado en lugar de
+escribirlo en SWAP: ocupa size / ratio KB, con el ratio_compresion del
+proceso en la traza (o `ratio` por defecto), y no genera E/S de swap.
+
+Si el pool no tiene lugar, se desalojan entradas a SWAP real (ya
+descomprimidas, con su escritura en el dispositivo si hay swap_io) según
+la política:
+- "lru": la que lleva más tiempo en el pool (un proceso que se usa sale
+  del pool, así que es la menos usada recientemente)
+- "mas_grande": la que más KB comprimidos ocupa (menos desalojos)
+
+Costo de CPU: comprimir y descomprimir cuestan costo_compresion y
+costo_descompresion unidades por KB sin comprimir (costo_cpu en las
+estadísticas), para contrastarlo con la E/S de swap que se evita.
+
+Un proceso en el pool tiene ubicacion "zswap". Con swap_io queda
+suspendido igual que en SWAP, pero vuelve a RAM en cuanto hay lugar, sin
+pasar por el dispositivo. Sin swap_io sigue ejecutándose desde el pool,
+como los procesos en SWAP.
+"""
+import math
+from collections import OrderedDict
+from heapq import heapify, heappop, heappush
+
+POLITICAS = ("lru", "mas_grande")
+MARCA = "[zswap]"  # pid del bloque reservado en la RAM
+
+
+class PoolComprimido:
+    def __init__(self, capacidad, ratio=2.0, costo_compresion=0.02, costo_descompresion=0.01, politica="lru"):
+        if capacidad <= 0:
+            raise ValueError("La capacidad del pool comprimido debe ser positiva")
+        if ratio < 1:
+            raise ValueError("El ratio de compresión debe ser al menos 1")
+        if politica not in POLITICAS:
+            raise ValueError(f"Política de desalojo inválida: {politica}")
+        self.capacidad = capacidad
+        self.ratio = ratio
+        self.costo_compresion = costo_compresion
+        self.costo_descompresion = costo_descompresion
+        self.politica = politica
+        self.reset()
+
+    def reset(self):
+        self._entradas = OrderedDict()  # pid -> (KB originales, KB comprimidos), en orden de entrada
+        self._por_tamano = []           # montículo (-KB comprimidos, orden, pid) para "mas_grande"
+        self._orden = 0
+        self.ocupado = 0
+        self.originales = 0             # KB sin comprimir de lo que hay en el pool
+        self.reanudados = []            # pids descomprimidos a RAM (el Scheduler los reprograma)
+        self.estadisticas = {
+            "guardados": 0,
+            "recuperados": 0,
+            "desalojados": 0,
+            "kb_comprimidos": 0,
+            "kb_a_swap": 0,
+            "costo_cpu": 0.0,
+        }
+
+    def __contains__(self, pid):
+        return pid in self._entradas
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def comprimido(self, size, ratio=None):
+        """KB que ocuparía en el pool un proceso de `size` KB"""
+        return max(1, math.ceil(size / max(1.0, ratio or self.ratio)))
+
+    def cabe(self, kb):
+        return self.ocupado + kb <= self.capacidad
+
+    def tamano(self, pid):
+        """KB sin comprimir del proceso, o None si no está en el pool"""
+        entrada = self._entradas.get(pid)
+        return entrada[0] if entrada is not None else None
+
+    def pids(self):
+        return list(self._entradas)
+
+    def guardar(self, pid, size, kb):
+        self._orden += 1
+        self._entradas[pid] = (size, kb)
+        if self.politica == "mas_grande":
+            heappush(self._por_tamano, (-kb, self._orden, pid))
+            if len(self._por_tamano) > 2 * len(self._entradas) + 16:
+                self._por_tamano = [(-k, i, p) for i, (p, (_, k)) in enumerate(self._entradas.items())]
+                heapify(self._por_tamano)
+        self.ocupado += kb
+        self.originales += size
+        self.estadisticas["guardados"] += 1
+        self.estadisticas["kb_comprimidos"] += kb
+        self.estadisticas["costo_cpu"] += size * self.costo_compresion
+
+    def sacar(self, pid, descomprimir=True):
+        """Quita al proceso del pool; descomprimir cuenta el costo de CPU. Devuelve sus KB originales"""
+        size, kb = self._entradas.pop(pid)
+        self.ocupado -= kb
+        self.originales -= size
+        if descomprimir:
+            self.estadisticas["costo_cpu"] += size * self.costo_descompresion
+        return size
+
+    def victima(self):
+        """Próxima entrada a desalojar a SWAP según la política, o None si el pool está vacío"""
+        if self.politica == "lru":
+            return next(iter(self._entradas), None)
+        while self._por_tamano:
+            kb, _, pid = self._por_tamano[0]
+            if self._entradas.get(pid, (None, None))[1] == -kb:
+                return pid
+            heappop(self._por_tamano)  # entrada obsoleta
+        return None
+
+    def bloques(self):
+        """El bloque reservado con el formato de la vista de RAM"""
+        bloques = []
+        if self.ocupado:
+            bloques.append({"pid": MARCA, "size": self.ocupado, "tipo": "zswap"})
+        if self.ocupado < self.capacidad:
+            bloques.append({"pid": None, "size": self.capacidad - self.ocupado, "tipo": "zswap_libre"})
+        return bloques
+
+    def resumen(self):
+        return {
+            "capacidad": self.capacidad,
+            "ocupado": self.ocupado,
+            "procesos": len(self._entradas),
+            "ratio_efectivo": self.originales / self.ocupado if self.ocupado else 0.0,
+            **self.estadisticas,
+        }
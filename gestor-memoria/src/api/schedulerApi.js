@@ -2,7 +2,36 @@ import axios from 'axios';
 
 const BASE_URL = "http://localhost:5000"; // o tu host de Flask
 
-export const iniciarSimulacion = () => axios.get(`${BASE_URL}/iniciar`);
-export const siguienteTick = () => axios.get(`${BASE_URL}/tick`);
-export const resetSimulacion = () => axios.get(`${BASE_URL}/reset`);
-export const obtenerEstado = () => axios.get(`${BASE_URL}/estado`);
+// Cada pestaña usa su propia simulación en el backend
+let sesion = null;
+
+export const crearSesion = async () => {
+  const res = await axios.post(`${BASE_URL}/sesiones`, {});
+  sesion = res.data.data.id;
+  return sesion;
+};
+
+// GET con ?sesion=<id>; si el backend expulsó la sesión, crea otra y reintenta una vez
+const get = async (ruta, params = {}) => {
+  if (!sesion) await crearSesion();
+  try {
+    return await axios.get(`${BASE_URL}${ruta}`, { params: { ...params, sesion } });
+  } catch (error) {
+    if (error.response?.status !== 404) throw error;
+    await crearSesion();
+    return axios.get(`${BASE_URL}${ruta}`, { params: { ...params, sesion } });
+  }
+};
+
+export const iniciarSimulacion = () => get("/iniciar");
+export const siguienteTick = () => get("/tick");
+export const resetSimulacion = () => get("/reset");
+// bloques=false: sin las listas de bloques (la vista de memoria usa /memory-map)
+export const obtenerEstado = (bloques = true) => get("/estado", bloques ? {} : { bloques: 0 });
+export const avanzarTicks = (n = 1, desde = -1) => get("/ticks", { n, desde });
+export const irATick = (tick, desde = -1) => get("/ir", { tick, desde });
+// tasa: ticks por segundo (0 = lo más rápido posible)
+export const abrirStream = (tasa, desde) => new EventSource(`${BASE_URL}/stream?tasa=${tasa}&desde=${desde}&sesion=${sesion}`);
+// Mapa de la región reducido a `ancho` cubetas; rango: [desde, hasta) en KB o null (toda la región)
+export const obtenerMapaMemoria = (region, ancho, rango = null) =>
+  get("/memory-map", { region, width: ancho, ...(rango ? { range: `${rango[0]}:${rango[1]}` } : {}) });
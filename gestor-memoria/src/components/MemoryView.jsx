@@ -1,61 +1,127 @@
-import React from 'react';
+import React, { useEffect, useRef, useState } from 'react';
+import { obtenerMapaMemoria } from "../api/schedulerApi";
 
-export default function MemoryView({ ram, swap, cargando }) { 
-  // Función para renderizar los bloques de memoria
-  console.log("RAM data:", ram);
-  console.log("SWAP data:", swap);
+// Colores por tipo de bloque (los mismos tonos de Tailwind de la vista anterior)
+const COLORES = {
+  contigua: "#3b82f6", // Contigua
+  contigua_fija: "#3b82f6",
+  pagina: "#a855f7", // Paginación
+  segmento: "#22c55e", // Segmentación
+  buddy: "#06b6d4", // Sistema buddy
+  slab: "#ec4899", // Slab
+  slab_grande: "#ec4899",
+  zswap: "#4338ca", // Pool comprimido (zswap)
+};
+const COLOR_OTRO = "#78350f"; // Otros tipos (como swap)
+const COLOR_LIBRE = "#6b7280";
+const ALTO = 48;
+const RANGO_MINIMO = 16; // KB visibles con el zoom máximo
 
-  const renderBloques = (memoria, label) => (
+// Una región dibujada en un canvas: el backend la reduce a una cubeta por
+// pixel (/memory-map), así que el costo no depende de la cantidad de bloques
+function MapaRegion({ region, label, version }) {
+  const canvas = useRef(null);
+  const [rango, setRango] = useState(null); // [desde, hasta) en KB; null = toda la región
+  const [mapa, setMapa] = useState(null);
+  const [detalle, setDetalle] = useState("");
+
+  useEffect(() => {
+    let vigente = true;
+    const ancho = Math.max(1, Math.round(canvas.current?.clientWidth || 512));
+    obtenerMapaMemoria(region, ancho, rango)
+      .then(res => { if (vigente && res.data.success) setMapa(res.data.data); })
+      .catch(error => console.error(`Error al cargar el mapa de ${label}:`, error));
+    return () => { vigente = false; };
+  }, [region, label, version, rango]);
+
+  // Cada cubeta es una columna: la parte ocupada con el color del tipo dominante
+  useEffect(() => {
+    const c = canvas.current;
+    if (!c || !mapa) return;
+    const ancho = c.clientWidth;
+    c.width = ancho;
+    c.height = ALTO;
+    const ctx = c.getContext("2d");
+    ctx.fillStyle = COLOR_LIBRE;
+    ctx.fillRect(0, 0, ancho, ALTO);
+    const columna = ancho / mapa.ocupacion.length;
+    mapa.ocupacion.forEach((ocupacion, i) => {
+      if (!ocupacion) return;
+      const alto = ocupacion * ALTO;
+      ctx.fillStyle = COLORES[mapa.tipo[i]] || COLOR_OTRO;
+      ctx.fillRect(i * columna, ALTO - alto, Math.ceil(columna), alto);
+    });
+  }, [mapa]);
+
+  const cubeta = (e) => {
+    const caja = canvas.current.getBoundingClientRect();
+    const i = Math.floor((e.clientX - caja.left) / caja.width * mapa.ocupacion.length);
+    return Math.min(Math.max(i, 0), mapa.ocupacion.length - 1);
+  };
+
+  // Acerca (factor < 1) o aleja el rango visible alrededor de `centro`
+  const zoom = (factor, centro) => {
+    if (!mapa) return;
+    const [desde, hasta] = rango || [0, mapa.total];
+    const largo = Math.min(mapa.total, Math.max(RANGO_MINIMO, Math.round((hasta - desde) * factor)));
+    const medio = centro ?? (desde + hasta) / 2;
+    const inicio = Math.min(Math.max(0, Math.round(medio - largo / 2)), mapa.total - largo);
+    setRango(largo >= mapa.total ? null : [inicio, inicio + largo]);
+  };
+
+  // La rueda acerca o aleja alrededor del puntero (sin desplazar la página)
+  useEffect(() => {
+    const c = canvas.current;
+    const alGirar = (e) => {
+      if (!mapa) return;
+      e.preventDefault();
+      zoom(e.deltaY < 0 ? 0.5 : 2, mapa.desde + (cubeta(e) + 0.5) * mapa.ancho_cubeta);
+    };
+    c.addEventListener("wheel", alGirar, { passive: false });
+    return () => c.removeEventListener("wheel", alGirar);
+  });
+
+  const alMover = (e) => {
+    if (!mapa) return;
+    const i = cubeta(e);
+    const inicio = Math.floor(mapa.desde + i * mapa.ancho_cubeta);
+    const fin = Math.ceil(mapa.desde + (i + 1) * mapa.ancho_cubeta);
+    const ocupado = Math.round(mapa.ocupacion[i] * 100);
+    setDetalle(mapa.pid[i]
+      ? `${inicio}-${fin} KB: ${ocupado}% ocupado, PID ${mapa.pid[i]} (${mapa.tipo[i]})`
+      : `${inicio}-${fin} KB: libre`);
+  };
+
+  return (
     <div>
-      <h3 className="text-lg font-semibold mb-1">{label}</h3>
-      <div className="flex gap-1 flex-wrap">
-        {/* Verificamos si hay bloques en memoria y los renderizamos */}
-        {memoria?.bloques && memoria.bloques.length > 0 ? memoria.bloques.map((bloque, i) => {
-          let estiloBloque = "w-8 h-8 rounded m-1"; // Tamaño de cada bloque
-          let title = "Libre";
-          let color = "bg-gray-700"; // Libre por defecto
-
-          // Si el bloque tiene un PID, se ajustan los estilos según el tipo de memoria
-          if (bloque.pid) {
-            title = `PID: ${bloque.pid}, Tamaño: ${bloque.size}, Tipo: ${bloque.tipo}`;
-            if (bloque.tipo === "contigua") {
-              color = "bg-blue-500"; // Contigua
-            } else if (bloque.tipo === "pagina") {
-              color = "bg-purple-500"; // Paginación
-              estiloBloque = "w-8 h-8 rounded m-1 bg-opacity-75"; // Sombra para paginación
-            } else if (bloque.tipo === "segmento") {
-              color = "bg-green-500"; // Segmentación
-              estiloBloque = "w-8 h-8 rounded m-1 border-2 border-green-700"; // Borde para segmentación
-            } else {
-              color = "bg-amber-900"; // Default color for other types (like swap)
-            }
-          } else {
-            // Si no tiene un PID, se podría considerar un bloque libre
-            color = "bg-gray-500"; // No asignado o libre
-          }
-
-          return (
-            <div
-              key={i}
-              className={`${estiloBloque} ${color}`}
-              title={title}
-            ></div>
-          );
-        }) : <p>No hay bloques en la memoria.</p>}
+      <div className="flex items-center gap-2 mb-1">
+        <h3 className="text-lg font-semibold">{label}</h3>
+        <span className="text-sm text-gray-400">
+          {mapa ? `${mapa.desde}-${mapa.hasta} de ${mapa.total} KB` : ""}
+        </span>
+        <button className="btn btn-secondary px-2" onClick={() => zoom(0.5)}>+</button>
+        <button className="btn btn-secondary px-2" onClick={() => zoom(2)}>−</button>
+        <button className="btn btn-secondary px-2" onClick={() => setRango(null)} disabled={!rango}>Todo</button>
       </div>
+      <canvas
+        ref={canvas}
+        className="w-full rounded"
+        style={{ height: ALTO }}
+        onMouseMove={alMover}
+        onMouseLeave={() => setDetalle("")}
+      />
+      <p className="text-sm text-gray-400 h-5">{detalle}</p>
     </div>
   );
+}
 
+export default function MemoryView({ version, cargando }) {
   return (
     <div className="space-y-4 mb-4">
-      {cargando ? (
-        <p>Cargando...</p>
-      ) : (
-        <>
-          {renderBloques(ram, "RAM")}
-          {renderBloques(swap, "SWAP")}
-        </>
-      )}
+      {/* Los mapas quedan montados mientras carga para no perder el zoom */}
+      {cargando && <p>Cargando...</p>}
+      <MapaRegion region="ram" label="RAM" version={version} />
+      <MapaRegion region="swap" label="SWAP" version={version} />
     </div>
   );
 }
@@ -9,6 +9,8 @@ export default function ProcessList({ estado }) {
   const procesosEnEspera = estado?.procesos?.en_espera || [];
   const procesosTerminados = estado?.procesos?.terminados || [];
   const procesosPendientes = estado?.procesos?.pendientes || [];
+  // null en trazas leídas bajo demanda: solo se conocen los ya leídos
+  const totalPendientes = estado?.procesos?.pendientes_total;
 
   return (
     <div className="space-y-4">
@@ -42,7 +44,9 @@ export default function ProcessList({ estado }) {
       </div>
 
       <div className="bg-gray-500 p-3 rounded">
-        <h4 className="font-medium">Pendientes: {procesosPendientes.length}</h4>
+        <h4 className="font-medium">
+          Pendientes: {totalPendientes ?? `${procesosPendientes.length} leídos (total desconocido)`}
+        </h4>
         {procesosPendientes.length > 0 && (
           <div className="text-sm">
             {procesosPendientes.map(p => p.pid).join(", ")}
@@ -1,5 +1,5 @@
-import React, { useState, useEffect } from 'react';
-import { iniciarSimulacion, siguienteTick, resetSimulacion, obtenerEstado } from "../api/schedulerApi";
+import React, { useState, useEffect, useRef } from 'react';
+import { iniciarSimulacion, avanzarTicks, resetSimulacion, obtenerEstado, abrirStream } from "../api/schedulerApi";
 import MemoryView from "../components/MemoryView";
 import ProcessList from "../components/ProcessList";
 import StatsPanel from "../components/StatsPanel";
@@ -8,17 +8,21 @@ export default function Home() {
   const [estado, setEstado] = useState(null);
   const [eventos, setEventos] = useState([]);
   const [cargando, setCargando] = useState(false);
+  // Secuencia de cambios conocida por el cliente: con ella /ticks y /stream
+  // responden solo tramos chicos (los bloques los dibuja MemoryView desde /memory-map)
+  const secuencia = useRef(-1);
+  const stream = useRef(null);
+  const [reproduciendo, setReproduciendo] = useState(false);
 
   // Función para cargar el estado actualizado
   const cargarEstado = async () => {
     setCargando(true);
     try {
-      const res = await obtenerEstado();
+      const res = await obtenerEstado(false);
       if (res.data.success) {
         console.log("🔥 Estado completo:", res.data.data);
+        secuencia.current = res.data.data.secuencia;
         setEstado(res.data.data);
-        console.log("Contenido RAM:", res.data.data.memoria?.ram?.contenido);
-        console.log("Contenido SWAP:", res.data.data.memoria?.swap?.contenido);
         if (res.data.data.eventos) {
           setEventos(prev => [...res.data.data.eventos.slice(0, 5), ...prev.slice(0, 15)]);
         }
@@ -35,12 +39,46 @@ export default function Home() {
     await cargarEstado();
   };
 
+  // Aplica una respuesta de /ticks o un mensaje de /stream
+  const aplicarAvance = ({ deltas, eventos: nuevosEventos, estado: nuevoEstado }) => {
+    secuencia.current = deltas.secuencia;
+    setEstado(nuevoEstado);
+    setEventos(prev => [...nuevosEventos.slice(-5).reverse(), ...prev.slice(0, 15)]);
+  };
+
+  const detenerStream = () => {
+    stream.current?.close();
+    stream.current = null;
+    setReproduciendo(false);
+  };
+
+  // El backend ejecuta los ticks y los envía por SSE; si el navegador va
+  // lento, cada mensaje agrupa varios ticks
+  const handleReproducir = () => {
+    if (stream.current) return detenerStream();
+    const fuente = abrirStream(5, secuencia.current);
+    fuente.addEventListener("tick", (e) => aplicarAvance(JSON.parse(e.data)));
+    fuente.addEventListener("fin", detenerStream);
+    fuente.onerror = detenerStream;
+    stream.current = fuente;
+    setReproduciendo(true);
+  };
+
+  // Un solo request por tick: el backend devuelve solo los bloques que cambiaron
   const handleTick = async () => {
-    await siguienteTick();
-    await cargarEstado();
+    setCargando(true);
+    try {
+      const res = await avanzarTicks(1, secuencia.current);
+      if (res.data.success) aplicarAvance(res.data.data);
+    } catch (error) {
+      console.error("Error al avanzar tick:", error);
+    } finally {
+      setCargando(false);
+    }
   };
 
   const handleReset = async () => {
+    detenerStream();
     await resetSimulacion();
     setEstado(null);
     setEventos([]);
@@ -49,6 +87,7 @@ export default function Home() {
   // Cargar estado inicial al montar el componente
   useEffect(() => {
     cargarEstado();
+    return () => stream.current?.close();
   }, []);
 
   return (
@@ -57,8 +96,7 @@ export default function Home() {
       {/* Panel principal */}
       <div className="lg:col-span-2 space-y-4">
         <MemoryView 
-            ram={estado?.memoria?.ram} 
-            swap={estado?.memoria?.swap} 
+            version={estado?.secuencia ?? estado?.tick_actual}
             cargando={cargando}
         />
         <ProcessList estado={estado} cargando={cargando} />
@@ -87,6 +125,13 @@ export default function Home() {
           >
             {estado?.finished ? 'Completado' : 'Siguiente Tick'}
           </button>
+          <button 
+            className="btn btn-secondary flex-1" 
+            onClick={handleReproducir}
+            disabled={cargando || (!reproduciendo && estado?.finished)}
+          >
+            {reproduciendo ? 'Pausar' : 'Reproducir'}
+          </button>
           <button 
             className="btn btn-accent flex-1" 
             onClick={handleReset}